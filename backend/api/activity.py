@@ -0,0 +1,102 @@
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from .models import UserActivityStats
+from .response_cache import bump_version
+
+STAT_FIELDS = ('startups_created', 'applications_submitted', 'collaborations')
+
+
+def adjust_user_stats(user_id, create_missing=True, **deltas):
+	"""Add `deltas` to a user's counters with a single UPDATE.
+
+	A user without a counter row gets one counted from scratch, unless
+	`create_missing` is False (deletes, which may be part of deleting the user).
+	"""
+	changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+	if not changes:
+		return
+	# update() skips auto_now; updated_at feeds the ETags of responses showing the counters
+	changes['updated_at'] = timezone.now()
+	if not UserActivityStats.objects.filter(user_id=user_id).update(**changes) and create_missing:
+		recount_user_stats([user_id])
+	# Cached listings embed the owner's counters
+	bump_version('user')
+
+
+def count_user_stats(user_ids, apps=global_apps):
+	"""Current counts for the given users, as {user_id: {field: count}}
+
+	`apps` is the model registry to count with; migrations pass their own
+	so the historical models are used.
+	"""
+	Startup = apps.get_model('api', 'Startup')
+	Application = apps.get_model('api', 'Application')
+	stats = {user_id: dict.fromkeys(STAT_FIELDS, 0) for user_id in user_ids}
+	startups = (
+		Startup.objects.filter(owner_id__in=user_ids)
+		.values('owner_id').annotate(total=Count('pk')).order_by()
+	)
+	for row in startups:
+		stats[row['owner_id']]['startups_created'] = row['total']
+	applications = (
+		Application.objects.filter(applicant_id__in=user_ids)
+		.values('applicant_id')
+		.annotate(total=Count('pk'), approved=Count('pk', filter=Q(status='approved')))
+		.order_by()
+	)
+	for row in applications:
+		stats[row['applicant_id']]['applications_submitted'] = row['total']
+		stats[row['applicant_id']]['collaborations'] = row['approved']
+	return stats
+
+
+def recount_user_stats(user_ids, apps=global_apps):
+	"""Recount counters for a batch of users; returns (created, repaired)"""
+	UserActivityStats = apps.get_model('api', 'UserActivityStats')
+	created = repaired = 0
+	with transaction.atomic():
+		counts = count_user_stats(user_ids, apps)
+		existing = {
+			row.user_id: row
+			for row in UserActivityStats.objects.select_for_update().filter(user_id__in=user_ids)
+		}
+		missing = [
+			UserActivityStats(user_id=user_id, **values)
+			for user_id, values in counts.items() if user_id not in existing
+		]
+		drifted = []
+		for user_id, row in existing.items():
+			values = counts[user_id]
+			if any(getattr(row, field) != values[field] for field in STAT_FIELDS):
+				for field in STAT_FIELDS:
+					setattr(row, field, values[field])
+				row.updated_at = timezone.now()
+				drifted.append(row)
+		UserActivityStats.objects.bulk_create(missing, ignore_conflicts=True)
+		UserActivityStats.objects.bulk_update(drifted, [*STAT_FIELDS, 'updated_at'])
+		created, repaired = len(missing), len(drifted)
+	if created or repaired:
+		bump_version('user')
+	return created, repaired
+
+
+def reconcile_user_stats(batch_size=500, apps=global_apps):
+	"""Repair every user's counters, one primary-key ordered batch at a time"""
+	User = apps.get_model(settings.AUTH_USER_MODEL)
+	users = User.objects.order_by('pk').values_list('pk', flat=True)
+	checked = created = repaired = 0
+	last_pk = None
+	while True:
+		batch = users if last_pk is None else users.filter(pk__gt=last_pk)
+		user_ids = list(batch[:batch_size])
+		if not user_ids:
+			break
+		batch_created, batch_repaired = recount_user_stats(user_ids, apps)
+		checked += len(user_ids)
+		created += batch_created
+		repaired += batch_repaired
+		last_pk = user_ids[-1]
+	return {'checked': checked, 'created': created, 'repaired': repaired}
@@ -1,16 +1,111 @@
 import jwt
 import hashlib
 import random
+import secrets
+import threading
+import time
 from datetime import datetime, timedelta
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
 from django.utils import timezone
 from django.core.mail import send_mail
-from rest_framework.authentication import BaseAuthentication
+from rest_framework.authentication import BaseAuthentication, SessionAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from .models import UserSession
+from .tracing import get_tracer
 
 User = get_user_model()
+trace = get_tracer('api.auth')
+
+_UNRESOLVED = object()
+
+# UserSession token types that are signed JWTs, valid until revoked or expired
+JWT_TOKEN_TYPES = ('access', 'refresh')
+
+
+class TokenRevocationSet:
+	"""In-process set of revoked token hashes, each kept until the token expires.
+	
+	Revocations are also written to the default cache so that other workers see
+	them (stateless mode refuses to start unless that cache is shared, see
+	api.caches); the local set answers repeat lookups without a cache round trip.
+	"""
+	cache_prefix = 'jwt-revoked:'
+	
+	prune_interval = 60
+	
+	def __init__(self):
+		self._expiries = {}
+		self._lock = threading.Lock()
+		self._last_prune = time.time()
+	
+	def revoke(self, token_hash, expires_at):
+		ttl = int(expires_at.timestamp() - time.time())
+		if ttl <= 0:
+			return
+		with self._lock:
+			self._expiries[token_hash] = expires_at.timestamp()
+		cache.set(self.cache_prefix + token_hash, True, ttl)
+		if time.time() - self._last_prune > self.prune_interval:
+			self.prune()
+	
+	def revoke_many(self, tokens):
+		"""Revoke (token_hash, expires_at) pairs with one cache write.
+		
+		Entries share the longest remaining lifetime; outliving a token is
+		harmless, since an expired token is rejected anyway.
+		"""
+		now = time.time()
+		expiries = {token_hash: expires_at.timestamp() for token_hash, expires_at in tokens}
+		expiries = {token_hash: expiry for token_hash, expiry in expiries.items() if expiry > now}
+		if not expiries:
+			return
+		with self._lock:
+			self._expiries.update(expiries)
+		cache.set_many(
+			{self.cache_prefix + token_hash: True for token_hash in expiries},
+			int(max(expiries.values()) - now) + 1
+		)
+	
+	def is_revoked(self, token_hash):
+		expiry = self._expiries.get(token_hash)
+		if expiry is not None:
+			if expiry > time.time():
+				return True
+			with self._lock:
+				self._expiries.pop(token_hash, None)
+			return False
+		return cache.get(self.cache_prefix + token_hash, False)
+	
+	def prune(self):
+		"""Drop entries for tokens that have expired on their own"""
+		now = time.time()
+		with self._lock:
+			self._expiries = {h: exp for h, exp in self._expiries.items() if exp > now}
+			self._last_prune = now
+	
+	def __len__(self):
+		return len(self._expiries)
+
+
+revoked_tokens = TokenRevocationSet()
+
+
+def get_cached_user(user_id):
+	"""Return an active user, cached for JWT_USER_CACHE_TTL seconds"""
+	cache_key = f'jwt-user:{user_id}'
+	user = cache.get(cache_key)
+	if user is None:
+		user = User.objects.get(id=user_id, is_active=True)
+		cache.set(cache_key, user, settings.JWT_USER_CACHE_TTL)
+	return user
+
+
+def forget_cached_user(user_id):
+	"""Drop a user from the JWT user cache"""
+	cache.delete(f'jwt-user:{user_id}')
 
 
 class JWTAuthentication(BaseAuthentication):
@@ -19,11 +114,9 @@ class JWTAuthentication(BaseAuthentication):
 	def authenticate(self, request):
 		token = self.get_token_from_request(request)
 		if not token:
-			print("❌ No token provided, returning None (unauthenticated)")
+			trace("jwt.authenticate path=%s result=no_token", request.path)
 			return None
 		
-		print(f"🔐 Attempting to authenticate token: {token[:20]}...")
-		
 		try:
 			payload = jwt.decode(
 				token, 
@@ -39,21 +132,22 @@ class JWTAuthentication(BaseAuthentication):
 			if not user_id:
 				raise AuthenticationFailed('Invalid token payload')
 			
-			user = User.objects.get(id=user_id, is_active=True)
-			
-			# Check if session exists and is not expired
 			token_hash = hashlib.sha256(token.encode()).hexdigest()
-			session = UserSession.objects.filter(
-				user=user,
-				token_hash=token_hash,
-				token_type='access',
-				expires_at__gt=timezone.now()
-			).first()
 			
+			if settings.JWT_STATELESS:
+				# Trust the verified signature; only revoked tokens are rejected
+				if revoked_tokens.is_revoked(token_hash):
+					raise AuthenticationFailed('Session expired or invalid')
+				user = get_cached_user(user_id)
+				if payload.get('gen', 0) != user.session_generation:
+					raise AuthenticationFailed('Session expired or invalid')
+				return (user, token)
+			
+			session = get_live_session(token_hash, 'access', user_id=user_id)
 			if not session:
 				raise AuthenticationFailed('Session expired or invalid')
 			
-			return (user, token)
+			return (session.user, token)
 			
 		except jwt.ExpiredSignatureError:
 			raise AuthenticationFailed('Token has expired')
@@ -64,26 +158,98 @@ class JWTAuthentication(BaseAuthentication):
 	
 	def get_token_from_request(self, request):
 		"""Extract JWT token from cookie or Authorization header"""
-		print(f"🔍 Looking for JWT token in request to {request.path}")
-		print(f"Available cookies: {list(request.COOKIES.keys())}")
-		
 		# First try to get from cookie
 		token = request.COOKIES.get(settings.JWT_COOKIE_NAME)
 		if token:
-			print(f"✅ Found token in cookie '{settings.JWT_COOKIE_NAME}': {token[:20]}...")
+			trace("jwt.token path=%s source=cookie", request.path)
 			return token
 		
 		# Fallback to Authorization header
 		auth_header = request.META.get('HTTP_AUTHORIZATION')
 		if auth_header and auth_header.startswith('Bearer '):
 			token = auth_header.split(' ')[1]
-			print(f"✅ Found token in Authorization header: {token[:20]}...")
+			trace("jwt.token path=%s source=header", request.path)
 			return token
 		
-		print("❌ No JWT token found in cookies or Authorization header")
 		return None
 
 
+def get_live_session(token_hash, token_type, **filters):
+	"""Fetch a current session and its user with one probe of the token index.
+	
+	Sessions issued before the user's last session_generation bump are dead.
+	"""
+	return UserSession.objects.select_related('user').filter(
+		token_hash=token_hash,
+		token_type=token_type,
+		expires_at__gt=timezone.now(),
+		user__is_active=True,
+		generation=F('user__session_generation'),
+		**filters
+	).first()
+
+
+def get_session_user(request):
+	"""Get authenticated user from session or auth token, resolved once per request"""
+	http_request = getattr(request, '_request', request)
+	user = getattr(http_request, '_session_user', _UNRESOLVED)
+	if user is _UNRESOLVED:
+		user = _resolve_session_user(http_request)
+		http_request._session_user = user
+	return user
+
+
+def _resolve_session_user(request):
+	"""Look up the user for a Django request: auth token first, then session"""
+	# First, check for auth token in Authorization header
+	auth_header = request.META.get('HTTP_AUTHORIZATION')
+	if auth_header and auth_header.startswith('Bearer '):
+		auth_token = auth_header.split(' ')[1]
+		
+		# Validate token against the token store (single indexed lookup)
+		user = get_auth_token_user(auth_token)
+		if user:
+			trace("session_user path=%s source=auth_token user_id=%s", request.path, user.id)
+			return user
+		
+		trace("session_user path=%s source=auth_token result=invalid", request.path)
+	
+	# Check if user is authenticated via Django auth middleware
+	if hasattr(request, 'user') and request.user.is_authenticated and hasattr(request.user, 'id'):
+		trace("session_user path=%s source=django_auth user_id=%s", request.path, request.user.id)
+		return request.user
+	
+	# Check session data (fallback)
+	if hasattr(request, 'session'):
+		# Check if session has authentication flag and user_id
+		if request.session.get('is_authenticated') and 'user_id' in request.session:
+			try:
+				user_id = request.session['user_id']
+				user = User.objects.get(id=user_id, is_active=True)
+				trace("session_user path=%s source=session user_id=%s", request.path, user.id)
+				return user
+			except (User.DoesNotExist, ValueError) as e:
+				trace("session_user path=%s source=session error=%r", request.path, e)
+	
+	trace("session_user path=%s result=anonymous", request.path)
+	return None
+
+
+class SessionUserAuthentication(SessionAuthentication):
+	"""DRF authentication backed by get_session_user, so request.user is populated"""
+	
+	def authenticate(self, request):
+		user = get_session_user(request._request)
+		if user is None:
+			return None
+		
+		# Cookie-based sessions still need CSRF protection; bearer tokens do not
+		auth_header = request.META.get('HTTP_AUTHORIZATION', '')
+		if not auth_header.startswith('Bearer '):
+			self.enforce_csrf(request)
+		return (user, None)
+
+
 def create_jwt_token(user):
 	"""Create JWT access token for user"""
 	now = timezone.now()
@@ -94,6 +260,7 @@ def create_jwt_token(user):
 		'username': user.username,
 		'email': user.email,
 		'token_type': 'access',
+		'gen': user.session_generation,
 		'exp': int(expiration.timestamp()),
 		'iat': int(now.timestamp())
 	}
@@ -107,7 +274,8 @@ def create_jwt_token(user):
 		user=user,
 		token_hash=token_hash,
 		token_type='access',
-		expires_at=expiration
+		expires_at=expiration,
+		generation=user.session_generation
 	)
 	
 	return token
@@ -121,6 +289,7 @@ def create_refresh_token(user):
 	payload = {
 		'user_id': str(user.id),
 		'token_type': 'refresh',
+		'gen': user.session_generation,
 		'exp': int(expiration.timestamp()),
 		'iat': int(now.timestamp())
 	}
@@ -134,7 +303,8 @@ def create_refresh_token(user):
 		user=user,
 		token_hash=token_hash,
 		expires_at=expiration,
-		token_type='refresh'
+		token_type='refresh',
+		generation=user.session_generation
 	)
 	
 	return refresh_token
@@ -169,43 +339,32 @@ def verify_refresh_token(refresh_token):
 		if not user_id:
 			raise AuthenticationFailed('Invalid token payload')
 		
-		user = User.objects.get(id=user_id, is_active=True)
-		print(f"✅ JWT: Found user - {user.username} (ID: {user.id})")
-		print(f"- Role: {user.role}")
-		print(f"- Email Verified: {user.email_verified}")
-		
 		# Check if refresh token session exists and is not expired
 		token_hash = hashlib.sha256(refresh_token.encode()).hexdigest()
-		session = UserSession.objects.filter(
-			user=user,
-			token_hash=token_hash,
-			token_type='refresh',
-			expires_at__gt=timezone.now()
-		).first()
+		session = get_live_session(token_hash, 'refresh', user_id=user_id)
 		
 		if not session:
-			print(f"❌ JWT: No valid refresh session found for token")
+			trace("jwt.refresh user_id=%s result=no_session", user_id)
 			raise AuthenticationFailed('Session expired or invalid')
 		
-		print(f"✅ JWT: Refresh token validation successful for {user.username}")
-		return user
+		trace("jwt.refresh user_id=%s result=ok", user_id)
+		return session.user
 		
 	except jwt.ExpiredSignatureError:
 		raise AuthenticationFailed('Refresh token has expired')
 	except jwt.InvalidTokenError:
 		raise AuthenticationFailed('Invalid refresh token')
-	except User.DoesNotExist:
-		raise AuthenticationFailed('User not found')
 
 
 def refresh_access_token(refresh_token):
 	"""Generate new access token using refresh token"""
 	user = verify_refresh_token(refresh_token)
 	
-	# Invalidate old access tokens for this user
+	# Invalidate the user's live access tokens; expired ones are left to the reaper
 	UserSession.objects.filter(
 		user=user,
-		token_type='access'
+		token_type='access',
+		expires_at__gt=timezone.now()
 	).delete()
 	
 	# Create new access token
@@ -218,14 +377,47 @@ def refresh_access_token(refresh_token):
 	}
 
 
-def invalidate_user_sessions(user):
-	"""Invalidate all user sessions"""
-	UserSession.objects.filter(user=user).delete()
+def create_auth_token(user):
+	"""Create an opaque auth token and record it in the token store"""
+	auth_token = secrets.token_hex(16)
+	UserSession.objects.create(
+		user=user,
+		token_hash=hashlib.sha256(auth_token.encode()).hexdigest(),
+		token_type='auth',
+		expires_at=timezone.now() + timedelta(seconds=settings.AUTH_TOKEN_AGE),
+		generation=user.session_generation
+	)
+	return auth_token
+
+
+def get_auth_token_user(auth_token):
+	"""Resolve an auth token to its user with a single indexed lookup"""
+	token_hash = hashlib.sha256(auth_token.encode()).hexdigest()
+	session = get_live_session(token_hash, 'auth')
+	return session.user if session else None
+
 
+def revoke_auth_token(auth_token):
+	"""Remove an auth token from the token store"""
+	token_hash = hashlib.sha256(auth_token.encode()).hexdigest()
+	UserSession.objects.filter(token_hash=token_hash, token_type='auth').delete()
 
-def cleanup_expired_sessions():
-	"""Clean up expired sessions"""
-	UserSession.objects.filter(expires_at__lt=timezone.now()).delete()
+
+def invalidate_user_sessions(user):
+	"""Invalidate all user sessions with a single write.
+	
+	Bumping the user's session generation makes every token issued so far fail
+	validation; the dead rows are removed later by the reaper.
+	"""
+	User.objects.filter(pk=user.pk).update(session_generation=F('session_generation') + 1)
+	user.refresh_from_db(fields=['session_generation'])
+	forget_cached_user(user.pk)
+
+
+def cleanup_expired_sessions(batch_size=1000):
+	"""Clean up expired sessions, auth tokens and verification codes"""
+	from .reaper import reap_expired_credentials
+	return reap_expired_credentials(batch_size=batch_size)
 
 
 def create_email_verification_token(user):
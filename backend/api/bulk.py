@@ -0,0 +1,247 @@
+import csv
+import json
+from collections import Counter
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Prefetch, Q
+from .activity import adjust_user_stats
+from .models import Position, Startup, StartupTag
+from .money import fill_amounts
+from .response_cache import bump_version
+from .serializers import PositionSerializer, StartupCreateSerializer, StartupTagSerializer
+from .tracing import get_tracer
+
+User = get_user_model()
+trace = get_tracer('api.bulk')
+
+# Columns of an exported startup; imports read the StartupCreateSerializer
+# fields, owner, status, tags and positions and ignore the rest
+EXPORT_FIELDS = (
+	'id', 'owner', *StartupCreateSerializer.Meta.fields,
+	'status', 'views', 'created_at', 'tags', 'positions',
+)
+POSITION_FIELDS = ('title', 'description', 'requirements', 'is_active')
+# List columns are joined with this in CSV files; positions are a JSON array
+CSV_LIST_SEPARATOR = '|'
+CSV_LIST_FIELDS = ('stages', 'tags')
+
+
+def detect_format(path, fmt=None):
+	"""'csv' or 'jsonl', from `fmt` or the file extension"""
+	if fmt:
+		return fmt
+	return 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+
+
+def read_records(stream, fmt):
+	"""Yield (line number, record or None, error) for each row of a CSV/JSONL stream"""
+	if fmt == 'csv':
+		reader = csv.DictReader(stream)
+		for row in reader:
+			try:
+				yield reader.line_num, _from_csv(row), None
+			except ValueError as exc:
+				yield reader.line_num, None, f'invalid positions column: {exc}'
+		return
+	for line_number, line in enumerate(stream, 1):
+		if not line.strip():
+			continue
+		try:
+			record = json.loads(line)
+		except ValueError as exc:
+			yield line_number, None, f'invalid JSON: {exc}'
+			continue
+		if not isinstance(record, dict):
+			yield line_number, None, 'expected a JSON object'
+			continue
+		yield line_number, record, None
+
+
+def _from_csv(row):
+	record = {name: value for name, value in row.items() if name and value not in (None, '')}
+	for name in CSV_LIST_FIELDS:
+		if name in record:
+			record[name] = [item.strip() for item in record[name].split(CSV_LIST_SEPARATOR) if item.strip()]
+	if 'positions' in record:
+		record['positions'] = json.loads(record['positions'])
+	return record
+
+
+def _validate(record):
+	"""(startup fields, tags, positions) for a record, or raise ValueError"""
+	serializer = StartupCreateSerializer(data=record)
+	if not serializer.is_valid():
+		raise ValueError(json.dumps(serializer.errors))
+	fields = dict(serializer.validated_data)
+	status = record.get('status') or 'active'
+	# A list or object is unhashable, so check the type before the lookup
+	if not isinstance(status, str) or status not in dict(Startup.STATUS_CHOICES):
+		raise ValueError(f'invalid status {status!r}')
+	fields['status'] = status
+
+	tags = record.get('tags') or []
+	if not isinstance(tags, list):
+		raise ValueError('tags must be a list')
+	tags = list(dict.fromkeys(str(tag).strip() for tag in tags if str(tag).strip()))
+	for tag in tags:
+		tag_serializer = StartupTagSerializer(data={'tag': tag})
+		if not tag_serializer.is_valid():
+			raise ValueError(json.dumps({'tags': tag_serializer.errors}))
+	if not tags:
+		# Same default as StartupCreateView
+		tags = ['Fund Raising' if fields.get('type', 'marketplace') == 'marketplace' else 'Open to Collaborate']
+
+	positions = record.get('positions') or []
+	if not isinstance(positions, list):
+		raise ValueError('positions must be a list')
+	validated_positions = []
+	for position in positions:
+		position_serializer = PositionSerializer(data=position)
+		if not position_serializer.is_valid():
+			raise ValueError(json.dumps({'positions': position_serializer.errors}))
+		values = position_serializer.validated_data
+		validated_positions.append({name: values[name] for name in POSITION_FIELDS if name in values})
+	return fields, tags, validated_positions
+
+
+class StartupImporter:
+	"""Validate startup records and write them in batched bulk_create transactions.
+
+	bulk_create skips Startup.save() and the model signals, so the importer
+	fills the amount columns, adjusts the owners' activity counters and bumps
+	the listing cache versions itself. New startups get their trending rank on
+	the next refresh_trending run.
+	"""
+
+	def __init__(self, default_owner=None, batch_size=1000, dry_run=False, max_errors=20):
+		self.default_owner = default_owner
+		self.batch_size = batch_size
+		self.dry_run = dry_run
+		self.report = {'read': 0, 'created': 0, 'tags': 0, 'positions': 0, 'errors': 0}
+		# Only the first `max_errors` are kept, so a broken file cannot grow memory
+		self.max_errors = max_errors
+		self.errors = []
+		self._owners = {}
+		self._batch = []
+
+	def error(self, line_number, message):
+		self.report['errors'] += 1
+		if len(self.errors) < self.max_errors:
+			self.errors.append((line_number, message))
+
+	def add(self, line_number, record):
+		self.report['read'] += 1
+		try:
+			fields, tags, positions = _validate(record)
+		except ValueError as exc:
+			self.error(line_number, str(exc))
+			return
+		owner = str(record.get('owner') or '').strip() or self.default_owner
+		if not owner:
+			self.error(line_number, 'owner is required')
+			return
+		self._batch.append((line_number, owner, fields, tags, positions))
+		if len(self._batch) >= self.batch_size:
+			self.flush()
+
+	def _resolve_owners(self, identifiers):
+		missing = {identifier for identifier in identifiers if identifier not in self._owners}
+		if missing:
+			users = User.objects.filter(Q(email__in=missing) | Q(username__in=missing))
+			for user_id, email, username in users.values_list('pk', 'email', 'username'):
+				self._owners.setdefault(email, user_id)
+				self._owners.setdefault(username, user_id)
+
+	def flush(self):
+		batch, self._batch = self._batch, []
+		if not batch:
+			return
+		self._resolve_owners({owner for _, owner, _, _, _ in batch})
+		startups, tags, positions = [], [], []
+		for line_number, owner, fields, tag_names, position_fields in batch:
+			owner_id = self._owners.get(owner)
+			if owner_id is None:
+				self.error(line_number, f'unknown owner {owner!r}')
+				continue
+			startup = Startup(owner_id=owner_id, **fields)
+			fill_amounts(startup)
+			startups.append(startup)
+			tags.extend(StartupTag(startup=startup, tag=tag) for tag in tag_names)
+			positions.extend(Position(startup=startup, **values) for values in position_fields)
+		if not startups:
+			return
+		if not self.dry_run:
+			with transaction.atomic():
+				Startup.objects.bulk_create(startups)
+				StartupTag.objects.bulk_create(tags)
+				Position.objects.bulk_create(positions)
+				for owner_id, created in Counter(startup.owner_id for startup in startups).items():
+					adjust_user_stats(owner_id, startups_created=created)
+		self.report['created'] += len(startups)
+		self.report['tags'] += len(tags)
+		self.report['positions'] += len(positions)
+		trace("bulk.import_batch startups=%d tags=%d positions=%d", len(startups), len(tags), len(positions))
+
+	def run(self, records):
+		"""Import (line number, record, error) tuples from read_records; returns the report"""
+		for line_number, record, error in records:
+			if error:
+				self.report['read'] += 1
+				self.error(line_number, error)
+			else:
+				self.add(line_number, record)
+		self.flush()
+		if self.report['created'] and not self.dry_run:
+			for label in ('startup', 'startuptag', 'position'):
+				bump_version(label)
+		return self.report
+
+
+def export_queryset(queryset=None):
+	"""Startups in primary-key order with everything an export row needs"""
+	queryset = Startup.objects.all() if queryset is None else queryset
+	return queryset.select_related('owner').prefetch_related(
+		Prefetch('tags', queryset=StartupTag.objects.order_by('pk')),
+		Prefetch('positions', queryset=Position.objects.order_by('created_at', 'pk')),
+	).order_by('pk')
+
+
+def export_record(startup):
+	record = {}
+	for name in EXPORT_FIELDS:
+		if name == 'owner':
+			record[name] = startup.owner.email
+		elif name == 'tags':
+			record[name] = [tag.tag for tag in startup.tags.all()]
+		elif name == 'positions':
+			record[name] = [{field: getattr(position, field) for field in POSITION_FIELDS} for position in startup.positions.all()]
+		else:
+			record[name] = getattr(startup, name)
+	record['id'] = str(startup.id)
+	record['created_at'] = startup.created_at.isoformat()
+	return record
+
+
+def export_startups(stream, fmt, queryset=None, chunk_size=2000):
+	"""Write startups to a CSV/JSONL stream; returns the number written.
+
+	Rows are read with a chunked iterator (a server-side cursor where the
+	database has them) and prefetched per chunk, so memory does not grow
+	with the number of startups.
+	"""
+	writer = None
+	if fmt == 'csv':
+		writer = csv.DictWriter(stream, fieldnames=EXPORT_FIELDS)
+		writer.writeheader()
+	written = 0
+	for startup in export_queryset(queryset).iterator(chunk_size=chunk_size):
+		record = export_record(startup)
+		if writer is None:
+			stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+		else:
+			for name in CSV_LIST_FIELDS:
+				record[name] = CSV_LIST_SEPARATOR.join(record[name])
+			record['positions'] = json.dumps(record['positions'], ensure_ascii=False)
+			writer.writerow(record)
+		written += 1
+	return written
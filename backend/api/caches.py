@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+# Backends whose data is private to one process: every worker gets its own copy
+PROCESS_LOCAL_BACKENDS = (
+	'django.core.cache.backends.locmem.LocMemCache',
+	'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def is_shared_cache(alias='default'):
+	"""Whether every worker process reads and writes the same data in cache `alias`"""
+	return settings.CACHES[alias]['BACKEND'] not in PROCESS_LOCAL_BACKENDS
+
+
+def require_shared_cache(alias, feature):
+	if not is_shared_cache(alias):
+		raise ImproperlyConfigured(
+			f"{feature} needs a cache shared by all workers, but the '{alias}' cache is "
+			f"{settings.CACHES[alias]['BACKEND']}. Set CACHE_URL to a Redis server."
+		)
+
+
+def check_cache_settings():
+	"""Refuse to start when a feature that must agree across workers sits on a per-process cache"""
+	if settings.JWT_STATELESS:
+		# Revocations and invalidated users would only be seen by the worker that recorded them
+		require_shared_cache('default', 'JWT_STATELESS')
+	if settings.RATELIMIT_ENABLE and settings.RATELIMIT_BACKEND == 'cache':
+		# Each worker would count on its own, allowing the limit once per worker
+		require_shared_cache(settings.RATELIMIT_USE_CACHE, "RATELIMIT_BACKEND='cache'")
+	if settings.LISTING_CACHE_ENABLED:
+		# A write would only bump the versions seen by the worker that made it
+		require_shared_cache(settings.LISTING_CACHE_ALIAS, 'LISTING_CACHE_ENABLED')
@@ -0,0 +1,191 @@
+import gzip
+import io
+import secrets
+import string
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+	import brotli
+except ImportError:  # optional; responses are gzipped only
+	brotli = None
+
+
+class GzipEncoder:
+	"""gzip with a random-length file name in the header, as GZipMiddleware does.
+
+	The padding keeps the response length from telling an attacker how well
+	their reflected input compressed against a secret in the body (BREACH).
+	"""
+	name = 'gzip'
+	max_random_bytes = 100
+
+	def __init__(self, level=None):
+		self.level = settings.COMPRESSION_GZIP_LEVEL if level is None else level
+
+	def _file(self, buffer):
+		length = secrets.randbelow(self.max_random_bytes) + 1
+		filename = ''.join(secrets.choice(string.ascii_letters) for _ in range(length))
+		return gzip.GzipFile(filename=filename, mode='wb', compresslevel=self.level, fileobj=buffer, mtime=0)
+
+	def compress(self, data):
+		buffer = io.BytesIO()
+		with self._file(buffer) as zfile:
+			zfile.write(data)
+		return buffer.getvalue()
+
+	def compressor(self):
+		buffer = io.BytesIO()
+		zfile = self._file(buffer)
+
+		def drain():
+			data = buffer.getvalue()
+			buffer.seek(0)
+			buffer.truncate()
+			return data
+
+		def compress(chunk):
+			zfile.write(chunk)
+			return drain()
+
+		def finish():
+			zfile.close()
+			return drain()
+
+		return compress, finish
+
+
+class BrotliEncoder:
+	name = 'br'
+
+	def __init__(self, quality=None):
+		self.quality = settings.COMPRESSION_BROTLI_QUALITY if quality is None else quality
+
+	def compress(self, data):
+		return brotli.compress(data, quality=self.quality)
+
+	def compressor(self):
+		compressor = brotli.Compressor(quality=self.quality)
+		return compressor.process, compressor.finish
+
+
+def available_encoders():
+	"""Encoders this server can use, most preferred first"""
+	encoders = [GzipEncoder()]
+	if brotli is not None:
+		encoders.insert(0, BrotliEncoder())
+	return encoders
+
+
+def accepted_encodings(header):
+	"""{coding: q} from an Accept-Encoding header"""
+	accepted = {}
+	for part in header.split(','):
+		name, *params = part.split(';')
+		name = name.strip().lower()
+		if not name:
+			continue
+		q = 1.0
+		for param in params:
+			key, _, value = param.partition('=')
+			if key.strip().lower() == 'q':
+				try:
+					q = float(value)
+				except ValueError:
+					q = 0.0
+		accepted[name] = q
+	return accepted
+
+
+def negotiate(header, encoders):
+	"""The encoder the client accepts with the highest q; ties go to the earlier encoder"""
+	accepted = accepted_encodings(header)
+	chosen, best = None, 0.0
+	for encoder in encoders:
+		q = accepted.get(encoder.name, accepted.get('*', 0.0))
+		if q > best:
+			chosen, best = encoder, q
+	return chosen
+
+
+def compress_stream(encoder, chunks):
+	compress, finish = encoder.compressor()
+	for chunk in chunks:
+		data = compress(chunk)
+		if data:
+			yield data
+	yield finish()
+
+
+async def acompress_stream(encoder, chunks):
+	compress, finish = encoder.compressor()
+	async for chunk in chunks:
+		data = compress(chunk)
+		if data:
+			yield data
+	yield finish()
+
+
+def is_compressible(content_type):
+	media_type = content_type.split(';')[0].strip().lower()
+	return any(
+		media_type.startswith(allowed) if allowed.endswith('/') else media_type == allowed
+		for allowed in settings.COMPRESSION_CONTENT_TYPES
+	)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+	"""Compress responses with brotli or gzip, whichever the client prefers.
+
+	Only COMPRESSION_CONTENT_TYPES responses are compressed, and only from
+	COMPRESSION_MIN_SIZE bytes up; smaller bodies cost more CPU than they save
+	in bandwidth. Streaming responses are compressed chunk by chunk as they
+	are sent, whatever their size. Files under MEDIA_URL (images, PDFs) are
+	left alone, as are responses that already have a Content-Encoding or ask
+	for no-transform.
+
+	Responses that carry credentials are never compressed, so a BREACH attack
+	cannot guess them from compressed lengths: COMPRESSION_EXCLUDED_PATHS
+	(the auth endpoints) and any response that sets a cookie. Brotli has no
+	equivalent of the gzip padding, so this is what protects it.
+	"""
+
+	def process_response(self, request, response):
+		if not settings.COMPRESSION_ENABLED or response.has_header('Content-Encoding'):
+			return response
+		if response.status_code in (204, 206, 304) or request.path.startswith(settings.MEDIA_URL):
+			return response
+		if response.cookies or request.path.startswith(tuple(settings.COMPRESSION_EXCLUDED_PATHS)):
+			return response
+		if 'no-transform' in response.get('Cache-Control', '') or not is_compressible(response.get('Content-Type', '')):
+			return response
+		if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+			return response
+
+		patch_vary_headers(response, ('Accept-Encoding',))
+		encoder = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''), available_encoders())
+		if encoder is None:
+			return response
+
+		if response.streaming:
+			if response.is_async:
+				response.streaming_content = acompress_stream(encoder, response.streaming_content)
+			else:
+				response.streaming_content = compress_stream(encoder, response.streaming_content)
+			# The compressed size is not known until the stream ends
+			del response.headers['Content-Length']
+		else:
+			compressed = encoder.compress(response.content)
+			if len(compressed) >= len(response.content):
+				return response
+			response.content = compressed
+			response.headers['Content-Length'] = str(len(compressed))
+
+		# A strong ETag names exact bytes; the compressed body is a different
+		# representation of the same content (RFC 9110 8.8.1)
+		etag = response.get('ETag')
+		if etag and etag.startswith('"'):
+			response.headers['ETag'] = 'W/' + etag
+		response.headers['Content-Encoding'] = encoder.name
+		return response
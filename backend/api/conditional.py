@@ -0,0 +1,79 @@
+import hashlib
+from django.conf import settings
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from .caches import is_shared_cache
+from .response_cache import get_versions
+
+
+def aggregate_validators(queryset, *modified_fields, **aggregates):
+	"""Validators for a response from one aggregate query.
+
+	Returns the newest value of `modified_fields` (e.g. 'updated_at',
+	'positions__updated_at') and the values of the extra `aggregates`
+	(row counts and the like), in the form get_validators() returns.
+	"""
+	stamps = {f'modified_{i}': Max(field) for i, field in enumerate(modified_fields)}
+	values = queryset.aggregate(**stamps, **aggregates)
+	modified = [values.pop(name) for name in stamps]
+	modified = [stamp for stamp in modified if stamp is not None]
+	return (max(modified) if modified else None), tuple(sorted(values.items()))
+
+
+def version_validators(labels):
+	"""Validators from the listing cache versions of `labels`, without a query.
+
+	For listings too large to aggregate on every page: the versions move on
+	every write that CachedListMixin would invalidate for. Returns None (no
+	revalidation) when the versions live in a per-process cache, where a
+	write made by another worker would never change them.
+	"""
+	if not is_shared_cache(settings.LISTING_CACHE_ALIAS):
+		return None
+	return None, tuple(get_versions(labels))
+
+
+class ConditionalGetMixin:
+	"""Answer If-None-Match before any serializer work.
+
+	Views implement get_validators(), which returns the newest modification
+	time of what the response renders and any extra state (row counts and
+	so on) that changes with it, usually from a single aggregate query. A
+	matching request gets a 304 without the body being built.
+
+	Only an ETag is sent, never Last-Modified: the newest timestamp does not
+	move when a row is deleted or leaves the filter, which the counts in the
+	ETag do catch.
+
+	get_validators() returns None when there is nothing to validate against
+	(a detail view whose object does not exist, or cache versions that are
+	not shared); the request then goes straight to the view, so
+	`If-None-Match: *` cannot get a 304 for a missing resource.
+	"""
+
+	def get_validators(self, request, *args, **kwargs):
+		"""Return (last_modified datetime or None, hashable state), or None"""
+		raise NotImplementedError
+
+	def not_modified(self, request, *args, **kwargs):
+		"""Hook for side effects that must happen even when a 304 is sent"""
+
+	def get(self, request, *args, **kwargs):
+		validators = self.get_validators(request, *args, **kwargs)
+		if validators is None:
+			return super().get(request, *args, **kwargs)
+		last_modified, state = validators
+		params = sorted((name, request.query_params.getlist(name)) for name in request.query_params)
+		user_id = request.user.pk if request.user.is_authenticated else None
+		digest = hashlib.sha1(repr((request.path, params, user_id, last_modified, state)).encode()).hexdigest()
+		etag = f'W/"{digest}"'
+
+		response = get_conditional_response(request, etag=etag)
+		if response is not None:
+			self.not_modified(request, *args, **kwargs)
+			return response
+
+		response = super().get(request, *args, **kwargs)
+		if response.status_code == 200:
+			response['ETag'] = etag
+		return response
@@ -0,0 +1,42 @@
+from collections import Counter
+from django.db.models import Count
+
+# Query parameter for each facet and the Startup column it counts
+FACETS = {
+	'category': 'category',
+	'type': 'type',
+	'phase': 'phase',
+	'earnthrough': 'earn_through',
+	'teamSize': 'team_size',
+}
+
+
+def facet_counts(queryset, params):
+	"""Per-value counts of every facet under the facet filters in `params`.
+
+	Each facet is counted with every selected filter except its own, so a panel
+	can still offer the alternatives to its selected value. Everything comes
+	from one query grouped by all facet columns, summed up here.
+	"""
+	selected = {field: params.get(param) for param, field in FACETS.items() if params.get(param)}
+	fields = list(FACETS.values())
+	counts = {field: Counter() for field in fields}
+	total = 0
+	for row in queryset.order_by().values(*fields).annotate(row_count=Count('pk')):
+		mismatched = [field for field, value in selected.items() if row[field] != value]
+		if not mismatched:
+			total += row['row_count']
+		for field in fields:
+			if not mismatched or mismatched == [field]:
+				counts[field][row[field]] += row['row_count']
+	return {
+		'total': total,
+		'facets': {
+			param: [
+				{'value': value, 'count': count}
+				for value, count in sorted(counts[field].items(), key=lambda item: (-item[1], item[0]))
+				if value
+			]
+			for param, field in FACETS.items()
+		},
+	}
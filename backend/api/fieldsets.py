@@ -0,0 +1,105 @@
+from django.db import models
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+def _names(value):
+	return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def sparse_field_names(params, available):
+	"""Names in `available` kept by ?fields=a,b and ?exclude=c, or None for all.
+
+	Asking for a field the serializer does not have is a 400, so a typo does
+	not silently return empty objects.
+	"""
+	fields, exclude = _names(params.get(FIELDS_PARAM)), _names(params.get(EXCLUDE_PARAM))
+	if not fields and not exclude:
+		return None
+	unknown = [name for name in fields + exclude if name not in available]
+	if unknown:
+		raise ValidationError({
+			FIELDS_PARAM if fields else EXCLUDE_PARAM: f"Unknown field(s): {', '.join(unknown)}"
+		})
+	return [name for name in available if (not fields or name in fields) and name not in exclude]
+
+
+class SparseFieldsMixin:
+	"""Let the top-level serializer of a request drop fields (?fields= / ?exclude=).
+
+	Nested serializers are built without the request and always render in full.
+	`sparse_sources` lists the model attributes each SerializerMethodField
+	reads, so sparse_queryset() knows what a kept field still needs.
+	"""
+	sparse_sources = {}
+
+	def __init__(self, *args, **kwargs):
+		super().__init__(*args, **kwargs)
+		request = self.context.get('request')
+		if request is None:
+			return
+		kept = sparse_field_names(request.query_params, self.fields)
+		if kept is not None:
+			for name in [name for name in self.fields if name not in kept]:
+				self.fields.pop(name)
+
+	@classmethod
+	def sparse_needs(cls, kept):
+		"""Model attributes (first lookup segment) that the `kept` fields read"""
+		fields = cls().fields
+		needs = set()
+		for name in kept:
+			sources = cls.sparse_sources.get(name) or (fields[name].source,)
+			needs.update(source.split('.')[0] for source in sources if source != '*')
+		return needs
+
+
+def _text_fields(model, prefix=''):
+	return [
+		f'{prefix}{field.name}' for field in model._meta.concrete_fields
+		if isinstance(field, models.TextField)
+	]
+
+
+def sparse_queryset(queryset, serializer_class, params):
+	"""Trim a queryset to the fields a sparse request renders.
+
+	TextFields no kept field reads are deferred, on the model and on
+	select_related models that are not rendered, and prefetches for relations
+	that are not rendered are dropped.
+	"""
+	if not issubclass(serializer_class, SparseFieldsMixin):
+		return queryset
+	kept = sparse_field_names(params, serializer_class().fields)
+	if kept is None:
+		return queryset
+	needs = serializer_class.sparse_needs(kept)
+
+	deferred = [name for name in _text_fields(queryset.model) if name not in needs]
+	if isinstance(queryset.query.select_related, dict):
+		for relation in queryset.query.select_related:
+			if relation not in needs:
+				related_model = queryset.model._meta.get_field(relation).related_model
+				deferred.extend(_text_fields(related_model, f'{relation}__'))
+	if deferred:
+		queryset = queryset.defer(*deferred)
+
+	lookups = queryset._prefetch_related_lookups
+	kept_lookups = [
+		lookup for lookup in lookups
+		if (lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup).split('__')[0] in needs
+	]
+	if len(kept_lookups) != len(lookups):
+		queryset = queryset.prefetch_related(None).prefetch_related(*kept_lookups)
+	return queryset
+
+
+class SparseQuerysetMixin:
+	"""List views whose queryset follows ?fields= / ?exclude= (see sparse_queryset)"""
+
+	def filter_queryset(self, queryset):
+		queryset = super().filter_queryset(queryset)
+		return sparse_queryset(queryset, self.get_serializer_class(), self.request.query_params)
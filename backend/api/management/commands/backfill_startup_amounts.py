@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from api.models import Startup
+from api.money import backfill_amounts
+
+
+class Command(BaseCommand):
+    help = 'Recompute the numeric amount columns of every startup from its financial fields'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Startups updated per batch (default: 500)')
+
+    def handle(self, *args, **options):
+        updated = backfill_amounts(Startup, batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully recomputed amounts for {updated} startups')
+        )
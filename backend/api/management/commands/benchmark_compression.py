@@ -0,0 +1,62 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from api.compression import BrotliEncoder, GzipEncoder, brotli
+from api.models import Startup, StartupTag, User
+from api.read_serializers import StartupListValuesSerializer
+from api.renderers import ORJSONRenderer
+
+
+class Command(BaseCommand):
+    help = 'Measure bytes saved vs CPU spent compressing listing JSON at each gzip level / brotli quality'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Listings in the response')
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        # Everything runs in a rolled-back transaction so the benchmark leaves no rows behind
+        with transaction.atomic():
+            self.create_rows(rows)
+            queryset = Startup.objects.filter(title__startswith='Benchmark').order_by('-created_at', '-id')
+            serializer = StartupListValuesSerializer()
+            body = ORJSONRenderer().render({'startups': serializer.serialize(serializer.prepare(queryset))})
+            transaction.set_rollback(True)
+
+        encoders = [GzipEncoder(level) for level in (1, 6, 9)]
+        if brotli is not None:
+            encoders += [BrotliEncoder(quality) for quality in (1, 5, 11)]
+        else:
+            self.stdout.write(self.style.WARNING('brotli is not installed; measuring gzip only'))
+
+        self.stdout.write(f'{rows} listings, {len(body):,} bytes of JSON')
+        self.stdout.write(f'{"encoding":<12} {"bytes":>10} {"ratio":>7} {"ms/response":>12} {"MB/s":>8}')
+        for encoder in encoders:
+            level = getattr(encoder, 'level', None) or getattr(encoder, 'quality', None)
+            compressed = encoder.compress(body)
+            started = time.perf_counter()
+            for _ in range(repeat):
+                encoder.compress(body)
+            elapsed = (time.perf_counter() - started) / repeat
+            self.stdout.write(
+                f'{encoder.name + " " + str(level):<12} {len(compressed):>10,} '
+                f'{len(body) / len(compressed):>6.1f}x {elapsed * 1000:>12.2f} {len(body) / elapsed / 1e6:>8.1f}'
+            )
+
+    def create_rows(self, rows):
+        owners = [
+            User.objects.create(
+                username=f'compression-benchmark-{i}', email=f'compression-benchmark-{i}@example.com', password='!'
+            )
+            for i in range(max(1, rows // 10))
+        ]
+        startups = Startup.objects.bulk_create([
+            Startup(
+                owner=owners[i % len(owners)], title=f'Benchmark startup {i}', type='marketplace',
+                description=f'Startup {i} builds tools for small teams in its market.', field='Technology',
+                revenue=f'${i}k', profit=f'${i // 2}k', asking_price=f'${i * 3}k',
+            )
+            for i in range(rows)
+        ])
+        StartupTag.objects.bulk_create([StartupTag(startup=startup, tag='Fund Raising') for startup in startups])
@@ -0,0 +1,67 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from api.models import Startup, StartupTag, User
+from api.querysets import startup_list_prefetches
+from api.read_serializers import StartupListValuesSerializer
+from api.renderers import ORJSONRenderer
+from api.serializers import StartupListSerializer
+
+
+class Command(BaseCommand):
+    help = 'Measure rows/sec of the marketplace list serialization, DRF serializers vs .values() + orjson'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        # Everything runs in a rolled-back transaction so the benchmark leaves no rows behind
+        with transaction.atomic():
+            self.create_rows(rows)
+            queryset = (
+                Startup.objects.filter(type='marketplace', status='active', title__startswith='Benchmark')
+                .order_by('-created_at', '-id')
+            )
+            modes = [
+                ('DRF serializer + JSONRenderer', lambda: JSONRenderer().render(
+                    StartupListSerializer(queryset.prefetch_related(*startup_list_prefetches()), many=True).data
+                )),
+                ('.values() + ORJSONRenderer', lambda: ORJSONRenderer().render(
+                    StartupListValuesSerializer().serialize(StartupListValuesSerializer().prepare(queryset))
+                )),
+            ]
+            outputs = []
+            rates = []
+            for label, render in modes:
+                outputs.append(render())
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    render()
+                rate = rows * repeat / (time.perf_counter() - started)
+                rates.append(rate)
+                self.stdout.write(f'{label:<32} {rate:>10,.0f} rows/sec')
+            transaction.set_rollback(True)
+
+        self.stdout.write(f'Speedup: {rates[1] / rates[0]:.1f}x')
+        if outputs[0] == outputs[1]:
+            self.stdout.write(self.style.SUCCESS('Output is byte-identical'))
+        else:
+            self.stdout.write(self.style.ERROR('Output differs between the two modes'))
+
+    def create_rows(self, rows):
+        owners = [
+            User.objects.create(username=f'list-benchmark-{i}', email=f'list-benchmark-{i}@example.com', password='!')
+            for i in range(max(1, rows // 20))
+        ]
+        startups = Startup.objects.bulk_create([
+            Startup(
+                owner=owners[i % len(owners)], title=f'Benchmark startup {i}', type='marketplace',
+                description='A startup listed for the serializer benchmark. ' * 4, field='Technology',
+                revenue='$10k', profit='$2k', asking_price=f'${i}k',
+            )
+            for i in range(rows)
+        ])
+        StartupTag.objects.bulk_create([StartupTag(startup=startup, tag='Fund Raising') for startup in startups])
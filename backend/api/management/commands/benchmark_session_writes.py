@@ -0,0 +1,52 @@
+import bcrypt
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from api.models import User
+
+
+class Command(BaseCommand):
+    help = 'Measure django_session writes per 1,000 authenticated requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        requests = options['requests']
+        middleware = list(settings.MIDDLEWARE)
+        without_refresh = [m for m in middleware if m != 'api.middleware.SessionRefreshMiddleware']
+        modes = [
+            ('save every request', {'SESSION_SAVE_EVERY_REQUEST': True, 'MIDDLEWARE': without_refresh}),
+            ('write-avoiding', {'SESSION_SAVE_EVERY_REQUEST': False, 'MIDDLEWARE': middleware}),
+        ]
+        for label, overrides in modes:
+            writes = self.measure(requests, overrides)
+            self.stdout.write(
+                f'{label:<20} {writes} session writes / {requests} requests '
+                f'({writes * 1000 / requests:.1f} per 1,000)'
+            )
+
+    def measure(self, requests, overrides):
+        # Everything runs in a rolled-back transaction so the benchmark leaves no rows behind
+        with transaction.atomic(), override_settings(ALLOWED_HOSTS=['testserver'], RATELIMIT_ENABLE=False, **overrides):
+            password = 'benchmark-password'
+            user = User.objects.create(
+                username='session-benchmark',
+                email='session-benchmark@example.com',
+                password=bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(4)).decode('utf-8'),
+            )
+            client = Client()
+            client.post(reverse('login'), {'email': user.email, 'password': password},
+                        content_type='application/json')
+            url = reverse('user_profile')
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(requests):
+                    client.get(url)
+            transaction.set_rollback(True)
+        return sum(
+            1 for query in queries.captured_queries
+            if 'django_session' in query['sql'] and query['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE'))
+        )
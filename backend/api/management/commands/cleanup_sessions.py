@@ -1,12 +1,33 @@
+import time
 from django.core.management.base import BaseCommand
 from api.authentication import cleanup_expired_sessions
 
 
 class Command(BaseCommand):
-    help = 'Clean up expired user sessions'
-    
+    help = 'Clean up expired user sessions, Django sessions and verification codes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows deleted per primary-key range (default: 1000)')
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running, reaping every --interval seconds')
+        parser.add_argument('--interval', type=int, default=300,
+                            help='Seconds between passes with --loop (default: 300)')
+
     def handle(self, *args, **options):
-        cleanup_expired_sessions()
+        while True:
+            report = cleanup_expired_sessions(batch_size=options['batch_size'])
+            for label, stats in report.items():
+                self.stdout.write(
+                    f"{label}: deleted {stats['deleted']} rows in {stats['seconds']:.2f}s "
+                    f"({stats['rows_per_second']:.0f} rows/s), backlog {stats['backlog']}"
+                )
+            if not options['loop']:
+                break
+            try:
+                time.sleep(options['interval'])
+            except KeyboardInterrupt:
+                break
         self.stdout.write(
             self.style.SUCCESS('Successfully cleaned up expired sessions')
         )
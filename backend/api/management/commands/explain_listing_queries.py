@@ -0,0 +1,90 @@
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from api.views import AllPositionsView, CollaborationListView, MarketplaceListView, SearchView
+
+# Canonical listing requests: (label, view, query params)
+LISTING_QUERIES = [
+    ('marketplace', MarketplaceListView, {}),
+    ('marketplace category', MarketplaceListView, {'category': 'saas'}),
+    ('marketplace price sort', MarketplaceListView, {'sortBy': 'price', 'order': 'asc'}),
+    ('marketplace price range', MarketplaceListView, {'minPrice': '10k', 'maxPrice': '1M'}),
+    ('collaborations', CollaborationListView, {}),
+    ('collaborations phase', CollaborationListView, {'phase': 'mvp'}),
+    ('collaborations earn through', CollaborationListView, {'earnthrough': 'equity'}),
+    ('collaborations team sort', CollaborationListView, {'sortBy': 'team', 'order': 'asc'}),
+    ('search', SearchView, {}),
+    ('search type', SearchView, {'type': 'marketplace'}),
+    ('positions', AllPositionsView, {}),
+]
+
+# Plan lines that mean a table is read in full, per database vendor
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (?!.*\bUSING (?:COVERING )?INDEX\b)'),
+    'postgresql': re.compile(r'\bSeq Scan on\b'),
+    'mysql': re.compile(r'\btype\W+ALL\b|\bTable scan\b'),
+}
+
+# Plan lines for a separate sort step, i.e. no index matches the ORDER BY
+SORT_PATTERNS = {
+    'sqlite': re.compile(r'\bUSE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY\b'),
+    'postgresql': re.compile(r'->\s+Sort\b|^\s*Sort\b'),
+    'mysql': re.compile(r'\bUsing filesort\b|\bSort:'),
+}
+
+
+def listing_queryset(view_class, params):
+    """The queryset a listing view builds for the given query params"""
+    view = view_class()
+    view.request = Request(APIRequestFactory().get('/', params))
+    view.kwargs = {}
+    view.format_kwarg = None
+    queryset = view.get_queryset()
+    # Explain one page, as the paginated views would fetch it
+    return queryset if queryset.query.is_sliced else queryset[:20]
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the canonical listing queries against the configured database and flag '
+        'any that scan a whole table (or sort outside an index). Run ANALYZE first on '
+        'small databases: planners may prefer scans on tables with few rows.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true',
+                            help='Print every plan, not only the flagged ones')
+        parser.add_argument('--strict', action='store_true',
+                            help='Exit with an error when any query falls back to a full scan')
+
+    def handle(self, *args, **options):
+        pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f'No plan checks for database vendor {connection.vendor!r}')
+
+        sort_pattern = SORT_PATTERNS[connection.vendor]
+        flagged = []
+        for label, view_class, params in LISTING_QUERIES:
+            plan = listing_queryset(view_class, params).explain()
+            scans = [line.strip() for line in plan.splitlines() if pattern.search(line)]
+            sorts = [line.strip() for line in plan.splitlines() if sort_pattern.search(line)]
+            if scans:
+                flagged.append(label)
+                self.stdout.write(self.style.WARNING(f'FULL SCAN  {label}: ' + '; '.join(scans)))
+            elif sorts:
+                self.stdout.write(self.style.NOTICE(f'sort       {label}: ' + '; '.join(sorts)))
+            else:
+                self.stdout.write(f'ok         {label}')
+            if options['verbose_plans'] or scans:
+                for line in plan.splitlines():
+                    self.stdout.write(f'             {line}')
+
+        if flagged:
+            message = f'{len(flagged)} of {len(LISTING_QUERIES)} listing queries fall back to full scans'
+            if options['strict']:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS('All listing queries use indexes'))
@@ -0,0 +1,36 @@
+import sys
+from django.core.management.base import BaseCommand
+from api.bulk import detect_format, export_startups
+from api.models import Startup
+
+
+class Command(BaseCommand):
+    help = 'Export startups with their tags and positions to a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to write, or '-' for stdout")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Output format (default: from the file extension, else jsonl)')
+        parser.add_argument('--type', choices=[choice for choice, _ in Startup.TYPE_CHOICES],
+                            help='Only export startups of this type')
+        parser.add_argument('--status', choices=[choice for choice, _ in Startup.STATUS_CHOICES],
+                            help='Only export startups with this status')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched per database round trip (default: 2000)')
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options['path'], options['format'])
+        queryset = Startup.objects.all()
+        if options['type']:
+            queryset = queryset.filter(type=options['type'])
+        if options['status']:
+            queryset = queryset.filter(status=options['status'])
+
+        if options['path'] == '-':
+            export_startups(sys.stdout, fmt, queryset, chunk_size=options['chunk_size'])
+            return
+        with open(options['path'], 'w', newline='', encoding='utf-8') as stream:
+            written = export_startups(stream, fmt, queryset, chunk_size=options['chunk_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Successfully exported {written} startups to {options["path"]}')
+        )
@@ -0,0 +1,44 @@
+import sys
+from django.core.management.base import BaseCommand
+from api.bulk import StartupImporter, detect_format, read_records
+
+
+class Command(BaseCommand):
+    help = 'Import startups with their tags and positions from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to read, or '-' for stdin")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='Input format (default: from the file extension, else jsonl)')
+        parser.add_argument('--owner',
+                            help='Email or username of the owner for records without an owner column')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Startups written per transaction (default: 1000)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate the file without writing anything')
+        parser.add_argument('--max-errors', type=int, default=20,
+                            help='Invalid records to list in the output (default: 20)')
+
+    def handle(self, *args, **options):
+        fmt = detect_format(options['path'], options['format'])
+        importer = StartupImporter(
+            default_owner=options['owner'], batch_size=options['batch_size'], dry_run=options['dry_run'],
+            max_errors=options['max_errors'],
+        )
+        if options['path'] == '-':
+            report = importer.run(read_records(sys.stdin, fmt))
+        else:
+            with open(options['path'], newline='', encoding='utf-8') as stream:
+                report = importer.run(read_records(stream, fmt))
+
+        for line_number, message in importer.errors:
+            self.stderr.write(f"Line {line_number}: {message}")
+        verb = 'would create' if options['dry_run'] else 'created'
+        self.stdout.write(
+            f"Read {report['read']} records: {verb} {report['created']} startups, "
+            f"{report['tags']} tags and {report['positions']} positions; {report['errors']} invalid"
+        )
+        if report['errors']:
+            self.stdout.write(self.style.WARNING('Import finished with invalid records skipped'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Successfully imported startups'))
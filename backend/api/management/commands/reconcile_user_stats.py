@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from api.activity import reconcile_user_stats
+
+
+class Command(BaseCommand):
+    help = 'Recount per-user activity counters and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Users recounted per transaction (default: 500)')
+
+    def handle(self, *args, **options):
+        report = reconcile_user_stats(batch_size=options['batch_size'])
+        self.stdout.write(
+            f"Checked {report['checked']} users: created {report['created']} counter rows, "
+            f"repaired {report['repaired']}"
+        )
+        self.stdout.write(
+            self.style.SUCCESS('Successfully reconciled user activity counters')
+        )
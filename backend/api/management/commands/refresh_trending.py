@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from api.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = 'Rescore startups with new views, favorites or interests in the trending ranking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rescore every startup, not only those with new activity')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Startups rescored per transaction (default: 500)')
+
+    def handle(self, *args, **options):
+        refreshed = refresh_trending(full=options['full'], batch_size=options['batch_size'])
+        self.stdout.write(f"Rescored {refreshed} startups")
+        self.stdout.write(
+            self.style.SUCCESS('Successfully refreshed the trending ranking')
+        )
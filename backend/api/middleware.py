@@ -1,3 +1,5 @@
+import time
+from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
 from .authentication import JWTAuthentication
 
@@ -17,3 +19,29 @@ class JWTAuthenticationMiddleware(MiddlewareMixin):
             pass
         
         return None
+
+
+class SessionRefreshMiddleware(MiddlewareMixin):
+    """Save sessions only when their data changed or they are close to expiring.
+
+    Replaces SESSION_SAVE_EVERY_REQUEST: read-only requests leave the session
+    store alone until less than SESSION_REFRESH_WINDOW seconds of the session's
+    lifetime remain, at which point one save slides the expiry forward. Must be
+    listed after SessionMiddleware so it runs before the session is persisted.
+    """
+    refreshed_key = '_refreshed_at'
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is None or settings.SESSION_SAVE_EVERY_REQUEST:
+            return response
+
+        now = int(time.time())
+        if session.modified:
+            session[self.refreshed_key] = now
+        elif session.session_key:
+            refreshed_at = session.get(self.refreshed_key, 0)
+            # Loading clears the key when the cookie points at a missing session
+            if session.session_key and now - refreshed_at > settings.SESSION_COOKIE_AGE - settings.SESSION_REFRESH_WINDOW:
+                session[self.refreshed_key] = now
+        return response
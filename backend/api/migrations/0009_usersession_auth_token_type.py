@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_alter_notification_type'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='usersession',
+            name='token_type',
+            field=models.CharField(choices=[('access', 'Access Token'), ('refresh', 'Refresh Token'), ('auth', 'Auth Token')], default='access', max_length=10),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_usersession_auth_token_type'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='user_sessio_user_id_eb20aa_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='usersession',
+            name='user_sessio_token_h_e8cef0_idx',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='session_generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='usersession',
+            name='generation',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['user', 'token_type'], name='user_sessio_user_id_f933c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usersession',
+            index=models.Index(fields=['token_hash', 'token_type', 'expires_at'], name='user_sessio_token_h_18b615_idx'),
+        ),
+    ]
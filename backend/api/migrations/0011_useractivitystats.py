@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_session_generation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserActivityStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='activity_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('startups_created', models.IntegerField(default=0)),
+                ('applications_submitted', models.IntegerField(default=0)),
+                ('collaborations', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_activity_stats',
+            },
+        ),
+    ]
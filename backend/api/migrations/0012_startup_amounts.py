@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:19
+
+from django.db import migrations, models
+
+
+def backfill_startup_amounts(apps, schema_editor):
+    from api.money import backfill_amounts
+    backfill_amounts(apps.get_model('api', 'Startup'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_useractivitystats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='asking_price_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='last_month_profit_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='last_month_revenue_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='profit_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='revenue_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='ttm_profit_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='startup',
+            name='ttm_revenue_amount',
+            field=models.BigIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['type', 'status', 'asking_price_amount'], name='startups_type_24d518_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['type', 'status', 'revenue_amount'], name='startups_type_db5001_idx'),
+        ),
+        migrations.RunPython(backfill_startup_amounts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_startup_amounts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='startup',
+            name='startups_type_f2c554_idx',
+        ),
+        migrations.AddIndex(
+            model_name='position',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='position_active_created'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(fields=['type', 'status', 'created_at', 'id'], name='startup_type_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['created_at', 'id'], name='startup_active_created'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['type', 'category', 'created_at', 'id'], name='startup_active_category'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['type', 'phase', 'created_at', 'id'], name='startup_active_phase'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['type', 'earn_through', 'created_at', 'id'], name='startup_active_earn'),
+        ),
+        migrations.AddIndex(
+            model_name='startup',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['type', 'team_size', 'created_at', 'id'], name='startup_active_team'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='position',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
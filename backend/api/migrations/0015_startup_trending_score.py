@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_position_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StartupTrendingScore',
+            fields=[
+                ('startup', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='api.startup')),
+                ('score', models.FloatField(blank=True, null=True)),
+                ('view_score', models.FloatField(blank=True, null=True)),
+                ('views_seen', models.IntegerField(default=0)),
+                ('favorites', models.IntegerField(default=0)),
+                ('interests', models.IntegerField(default=0)),
+                ('dirty', models.BooleanField(default=False)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'startup_trending_scores',
+                'indexes': [models.Index(fields=['-score'], name='trending_score'), models.Index(condition=models.Q(('dirty', True)), fields=['dirty'], name='trending_dirty')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def backfill_user_activity_stats(apps, schema_editor):
+    # 0011 only created the table; count every existing user's activity
+    from api.activity import reconcile_user_stats
+    reconcile_user_stats(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_startup_trending_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_user_activity_stats, migrations.RunPython.noop),
+    ]
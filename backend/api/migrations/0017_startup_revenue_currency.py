@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:40
+
+from django.db import migrations, models
+
+
+def backfill_revenue_currency(apps, schema_editor):
+    from api.money import backfill_amounts
+    backfill_amounts(apps.get_model('api', 'Startup'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_backfill_user_activity_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='startup',
+            name='revenue_currency',
+            field=models.CharField(blank=True, editable=False, max_length=3),
+        ),
+        migrations.RunPython(backfill_revenue_currency, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,10 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinLengthValidator, URLValidator
 from django.utils import timezone
+from .money import AMOUNT_FIELDS, SHADOW_FIELDS, fill_amounts
 
 
 class User(AbstractUser):
@@ -21,6 +23,8 @@ class User(AbstractUser):
 	]
 	role = models.CharField(max_length=32, choices=ROLE_CHOICES, default='entrepreneur')
 	phone_number = models.CharField(max_length=20, blank=True)
+	# Bumped to revoke every credential issued to the user in one write
+	session_generation = models.PositiveIntegerField(default=0)
 	
 	# Fix related_name conflicts with default User model
 	groups = models.ManyToManyField(
@@ -88,6 +92,17 @@ class Startup(models.Model):
 	ttm_profit = models.CharField(max_length=50, blank=True)
 	last_month_revenue = models.CharField(max_length=50, blank=True)
 	last_month_profit = models.CharField(max_length=50, blank=True)
+	# Parsed copies of the financial fields above, in minor units (see api.money)
+	revenue_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	profit_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	asking_price_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	ttm_revenue_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	ttm_profit_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	last_month_revenue_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	last_month_profit_amount = models.BigIntegerField(null=True, blank=True, editable=False)
+	currency = models.CharField(max_length=3, blank=True, editable=False)
+	# Revenue may be quoted in another currency than the asking price
+	revenue_currency = models.CharField(max_length=3, blank=True, editable=False)
 	earn_through = models.CharField(max_length=50, blank=True)  # For collaborations
 	phase = models.CharField(max_length=50, blank=True)  # For collaborations
 	team_size = models.CharField(max_length=50, blank=True)  # For collaborations
@@ -103,14 +118,33 @@ class Startup(models.Model):
 		db_table = 'startups'
 		indexes = [
 			models.Index(fields=['owner']),
-			models.Index(fields=['type']),
 			models.Index(fields=['category']),
 			models.Index(fields=['status']),
 			models.Index(fields=['created_at']),
+			models.Index(fields=['type', 'status', 'asking_price_amount']),
+			models.Index(fields=['type', 'status', 'revenue_amount']),
+			# Listing shapes: type + status filter, newest first (see explain_listing_queries)
+			models.Index(fields=['type', 'status', 'created_at', 'id'], name='startup_type_status_created'),
+			# Active-only partial indexes; MySQL does not support them and skips them
+			models.Index(fields=['created_at', 'id'], condition=Q(status='active'), name='startup_active_created'),
+			models.Index(fields=['type', 'category', 'created_at', 'id'], condition=Q(status='active'), name='startup_active_category'),
+			models.Index(fields=['type', 'phase', 'created_at', 'id'], condition=Q(status='active'), name='startup_active_phase'),
+			models.Index(fields=['type', 'earn_through', 'created_at', 'id'], condition=Q(status='active'), name='startup_active_earn'),
+			models.Index(fields=['type', 'team_size', 'created_at', 'id'], condition=Q(status='active'), name='startup_active_team'),
 		]
 	
 	def __str__(self):
 		return self.title
+	
+	def save(self, *args, **kwargs):
+		update_fields = kwargs.get('update_fields')
+		if update_fields is None or set(update_fields) & set(AMOUNT_FIELDS):
+			fill_amounts(self)
+			if update_fields is not None:
+				kwargs['update_fields'] = {*update_fields, *SHADOW_FIELDS}
+		# The owner's activity counters are updated by post_save in the same transaction
+		with transaction.atomic():
+			super().save(*args, **kwargs)
 
 
 class StartupTag(models.Model):
@@ -139,11 +173,13 @@ class Position(models.Model):
 	requirements = models.TextField(blank=True)
 	is_active = models.BooleanField(default=True)
 	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
 	
 	class Meta:
 		db_table = 'positions'
 		indexes = [
 			models.Index(fields=['startup']),
+			models.Index(fields=['created_at'], condition=Q(is_active=True), name='position_active_created'),
 		]
 	
 	def __str__(self):
@@ -182,6 +218,81 @@ class Application(models.Model):
 	
 	def __str__(self):
 		return f"{self.applicant.username} - {self.startup.title} - {self.position.title}"
+	
+	def save(self, *args, **kwargs):
+		# The applicant's activity counters are updated by post_save in the same transaction
+		with transaction.atomic():
+			super().save(*args, **kwargs)
+
+
+class UserSession(models.Model):
+	"""Issued credentials, stored by token hash for indexed lookup"""
+	TOKEN_TYPE_CHOICES = [
+		('access', 'Access Token'),
+		('refresh', 'Refresh Token'),
+		('auth', 'Auth Token'),
+	]
+
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sessions')
+	token_hash = models.CharField(max_length=255)
+	token_type = models.CharField(max_length=10, choices=TOKEN_TYPE_CHOICES, default='access')
+	expires_at = models.DateTimeField()
+	# The user's session_generation when the token was issued
+	generation = models.PositiveIntegerField(default=0)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		db_table = 'user_sessions'
+		indexes = [
+			models.Index(fields=['user', 'token_type']),
+			models.Index(fields=['token_hash', 'token_type', 'expires_at']),
+			models.Index(fields=['expires_at']),
+		]
+
+	def __str__(self):
+		return f"{self.user.username} - {self.token_type}"
+
+
+class EmailVerificationCode(models.Model):
+	"""Short-lived email verification codes"""
+	id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+	user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='verification_codes')
+	code = models.CharField(max_length=6)
+	expires_at = models.DateTimeField()
+	is_used = models.BooleanField(default=False)
+	created_at = models.DateTimeField(auto_now_add=True)
+
+	class Meta:
+		db_table = 'email_verification_codes'
+		indexes = [
+			models.Index(fields=['user']),
+			models.Index(fields=['code']),
+			models.Index(fields=['expires_at']),
+			models.Index(fields=['is_used']),
+		]
+
+	def __str__(self):
+		return f"{self.user.username} - {self.code}"
+
+
+class UserActivityStats(models.Model):
+	"""Per-user activity counters behind UserSerializer.get_stats.
+	
+	Kept current by signals on Startup and Application (see api.activity);
+	the reconcile_user_stats command repairs any drift.
+	"""
+	user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='activity_stats')
+	startups_created = models.IntegerField(default=0)
+	applications_submitted = models.IntegerField(default=0)
+	collaborations = models.IntegerField(default=0)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		db_table = 'user_activity_stats'
+
+	def __str__(self):
+		return f"{self.user.username} - stats"
 
 
 
@@ -252,3 +363,30 @@ class Interest(models.Model):
 
     def __str__(self):
         return f"{self.user.username} -> {self.startup.title}"
+
+
+class StartupTrendingScore(models.Model):
+    """Materialized trending rank of a startup (see api.trending).
+
+    `score` is log2 of the startup's time-decayed engagement measured against a
+    fixed epoch, so scores stay comparable as time passes and only startups
+    with new activity need recomputing. Rows are written by refresh_trending.
+    """
+    startup = models.OneToOneField(Startup, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField(null=True, blank=True)
+    view_score = models.FloatField(null=True, blank=True)
+    views_seen = models.IntegerField(default=0)
+    favorites = models.IntegerField(default=0)
+    interests = models.IntegerField(default=0)
+    dirty = models.BooleanField(default=False)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'startup_trending_scores'
+        indexes = [
+            models.Index(fields=['-score'], name='trending_score'),
+            models.Index(fields=['dirty'], condition=Q(dirty=True), name='trending_dirty'),
+        ]
+
+    def __str__(self):
+        return f"{self.startup.title} - {self.score}"
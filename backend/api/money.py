@@ -0,0 +1,131 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+DEFAULT_CURRENCY = 'USD'
+
+CURRENCY_SYMBOLS = {
+	'$': 'USD',
+	'US$': 'USD',
+	'€': 'EUR',
+	'£': 'GBP',
+	'₹': 'INR',
+	'RS': 'PKR',
+	'RS.': 'PKR',
+}
+
+MULTIPLIERS = {
+	'': 1,
+	'K': 1_000,
+	'M': 1_000_000,
+	'MN': 1_000_000,
+	'MIL': 1_000_000,
+	'B': 1_000_000_000,
+	'BN': 1_000_000_000,
+}
+
+_MONEY_RE = re.compile(
+	r'^\s*(?P<lead>[+-]?)\s*(?P<prefix>[^\d\s.,+-]*\.?)\s*(?P<sign>[+-]?)\s*(?P<number>\d[\d,]*(?:\.\d+)?|\.\d+)\s*'
+	r'(?P<suffix>[A-Za-z]*\.?)\+?\s*(?P<code>[A-Za-z]{3})?\s*(?:/\s*\w+)?\s*$'
+)
+
+# Range of the BigIntegerField shadow columns, in minor units
+MIN_AMOUNT = -2 ** 63
+MAX_AMOUNT = 2 ** 63 - 1
+
+# Financial CharFields on Startup and the shadow column holding each in minor units
+AMOUNT_FIELDS = {
+	'revenue': 'revenue_amount',
+	'profit': 'profit_amount',
+	'asking_price': 'asking_price_amount',
+	'ttm_revenue': 'ttm_revenue_amount',
+	'ttm_profit': 'ttm_profit_amount',
+	'last_month_revenue': 'last_month_revenue_amount',
+	'last_month_profit': 'last_month_profit_amount',
+}
+
+# Every column fill_amounts() sets
+SHADOW_FIELDS = ('currency', 'revenue_currency', *AMOUNT_FIELDS.values())
+
+
+def parse_money(text):
+	"""Parse strings like '$12k', '1.5M', 'PKR 50,000' or '€3,200/mo'.
+
+	Returns (amount in minor units, ISO currency code), or (None, None) when
+	the text is empty, not a money amount, or too large for the shadow columns.
+	"""
+	match = _MONEY_RE.match(text or '')
+	if not match:
+		return None, None
+	raw_prefix = match.group('prefix')
+	prefix = raw_prefix.upper()
+	suffix = match.group('suffix').upper().rstrip('.')
+	code = (match.group('code') or '').upper()
+
+	currency = None
+	if prefix:
+		currency = CURRENCY_SYMBOLS.get(prefix) or (prefix if len(prefix) == 3 and raw_prefix.isalpha() and raw_prefix.isupper() else None)
+		if currency is None:
+			return None, None
+	if suffix not in MULTIPLIERS:
+		# A trailing currency code ('50000 PKR') lands in suffix
+		if len(suffix) == 3 and not code:
+			suffix, code = '', suffix
+		else:
+			return None, None
+	if code:
+		currency = currency or code
+
+	try:
+		amount = Decimal(match.group('number').replace(',', '')) * MULTIPLIERS[suffix] * 100
+	except InvalidOperation:
+		return None, None
+	if '-' in (match.group('lead'), match.group('sign')):
+		amount = -amount
+	if not MIN_AMOUNT <= amount <= MAX_AMOUNT:
+		return None, None
+	return int(amount), currency or DEFAULT_CURRENCY
+
+
+def parse_amount_param(value):
+	"""(minor units, currency) for a min/max query parameter, or (None, None) if it is not an amount"""
+	return parse_money(value)
+
+
+def fill_amounts(startup):
+	"""Set a startup's numeric shadow columns from its financial CharFields.
+
+	`currency` is the asking price's (or the first parsed field's) currency;
+	`revenue_currency` is the revenue's, which listings may quote differently.
+	"""
+	currency = None
+	for field, amount_field in AMOUNT_FIELDS.items():
+		amount, field_currency = parse_money(getattr(startup, field))
+		setattr(startup, amount_field, amount)
+		if field == 'asking_price' or currency is None:
+			currency = field_currency or currency
+		if field == 'revenue':
+			startup.revenue_currency = field_currency or ''
+	startup.currency = currency or ''
+
+
+def backfill_amounts(model, batch_size=500):
+	"""Recompute the shadow columns of every startup in primary-key batches.
+
+	`model` is passed in so migrations can use their historical Startup;
+	shadow columns it does not have yet are skipped. Returns the number of
+	rows updated.
+	"""
+	columns = {field.name for field in model._meta.concrete_fields}
+	fields = [name for name in SHADOW_FIELDS if name in columns]
+	rows = model.objects.order_by('pk').only('pk', *AMOUNT_FIELDS)
+	updated = 0
+	last_pk = None
+	while True:
+		batch = list((rows if last_pk is None else rows.filter(pk__gt=last_pk))[:batch_size])
+		if not batch:
+			return updated
+		for startup in batch:
+			fill_amounts(startup)
+		model.objects.bulk_update(batch, fields)
+		updated += len(batch)
+		last_pk = batch[-1].pk
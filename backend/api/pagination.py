@@ -0,0 +1,186 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from django.core.exceptions import ValidationError
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+class KeysetPagination(BasePagination):
+	"""Cursor pagination that seeks on the queryset's ordering columns.
+
+	The queryset must be ordered by field names ending in a unique one (e.g.
+	``('-created_at', '-id')`` or ``('team_size', '-created_at', '-id')``).
+	Nullable columns must be ordered with an explicit NULL placement, e.g.
+	``F('asking_price_amount').asc(nulls_last=True)``.
+	The opaque cursor holds the ordering values of the last row served, so each
+	page is one indexed range read however deep the client scrolls, instead of
+	an OFFSET that grows with the page number. Totals are only counted when the
+	client asks for them with ``?count=true``.
+	"""
+	cursor_query_param = 'cursor'
+	page_size_query_param = 'limit'
+	count_query_param = 'count'
+	max_page_size = 100
+
+	def get_page_size(self, request):
+		page_size = api_settings.PAGE_SIZE or 12
+		try:
+			requested = int(request.query_params.get(self.page_size_query_param, page_size))
+		except ValueError:
+			return page_size
+		return max(1, min(requested, self.max_page_size))
+
+	def paginate_queryset(self, queryset, request, view=None):
+		self.request = request
+		self.ordering = [self._parse_ordering(field) for field in queryset.query.order_by]
+		self.ordering_fields = [self._model_field(queryset, name) for name, _, _ in self.ordering]
+		self.page_size = self.get_page_size(request)
+		self.count = None
+		if request.query_params.get(self.count_query_param) in ('1', 'true'):
+			self.count = queryset.count()
+
+		values, reverse = self.decode_cursor(request)
+		if reverse:
+			queryset = queryset.order_by(*[self._order_by(*self._flip(column)) for column in self.ordering])
+		if values is not None:
+			queryset = queryset.filter(self._seek(values, reverse))
+
+		# One extra row tells us whether there is another page
+		rows = list(queryset[:self.page_size + 1])
+		has_more = len(rows) > self.page_size
+		rows = rows[:self.page_size]
+		if reverse:
+			rows.reverse()
+
+		self.has_next = has_more if not reverse else values is not None
+		self.has_previous = values is not None if not reverse else has_more
+		self.first_row = rows[0] if rows else None
+		self.last_row = rows[-1] if rows else None
+		return rows
+
+	def get_paginated_response(self, data):
+		payload = {
+			'next': self.get_next_link(),
+			'previous': self.get_previous_link(),
+			'results': data,
+		}
+		if self.count is not None:
+			payload['count'] = self.count
+		return Response(payload)
+
+	def get_next_link(self):
+		if not self.has_next or self.last_row is None:
+			return None
+		return self._link(self.last_row, reverse=False)
+
+	def get_previous_link(self):
+		if not self.has_previous or self.first_row is None:
+			return None
+		return self._link(self.first_row, reverse=True)
+
+	def decode_cursor(self, request):
+		"""Return (ordering values, reverse) from the cursor, or (None, False)"""
+		encoded = request.query_params.get(self.cursor_query_param)
+		if not encoded:
+			return None, False
+		try:
+			cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+			values, reverse = cursor['v'], bool(cursor.get('r'))
+		except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+			raise NotFound('Invalid cursor')
+		if not isinstance(values, list) or len(values) != len(self.ordering):
+			raise NotFound('Invalid cursor')
+		# The cursor comes from the client: only values of each column's type reach the query
+		try:
+			values = [
+				None if value is None else field.to_python(value)
+				for field, value in zip(self.ordering_fields, values)
+			]
+		except (ValidationError, TypeError, ValueError):
+			raise NotFound('Invalid cursor')
+		return values, reverse
+
+	def _link(self, row, reverse):
+		# Rows are model instances, or dicts from a .values() queryset
+		values = [
+			self._cursor_value(row[name] if isinstance(row, dict) else getattr(row, name))
+			for name, _, _ in self.ordering
+		]
+		cursor = {'v': values}
+		if reverse:
+			cursor['r'] = 1
+		encoded = base64.urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode('ascii')
+		params = self.request.query_params.copy()
+		params[self.cursor_query_param] = encoded
+		return self.request.build_absolute_uri(f'{self.request.path}?{params.urlencode()}')
+
+	@staticmethod
+	def _cursor_value(value):
+		if isinstance(value, (datetime, date)):
+			return value.isoformat()
+		if value is None or isinstance(value, (bool, int, float, str)):
+			return value
+		return str(value)
+
+	@classmethod
+	def ordering_columns(cls, queryset):
+		"""Names of the columns a queryset's ordering seeks on"""
+		return [cls._parse_ordering(field)[0] for field in queryset.query.order_by]
+
+	@staticmethod
+	def _model_field(queryset, name):
+		"""The model field (or annotation output field) an ordering column reads"""
+		if name in queryset.query.annotations:
+			return queryset.query.annotations[name].output_field
+		model = queryset.model
+		for part in name.split('__'):
+			field = model._meta.get_field(part)
+			model = field.related_model
+		# Ordering on a foreign key seeks on the target's primary key
+		return field.target_field if field.is_relation else field
+
+	@staticmethod
+	def _parse_ordering(field):
+		"""(name, descending, nulls_last) for an order_by entry; nulls_last is None for NOT NULL columns"""
+		if isinstance(field, OrderBy) and isinstance(field.expression, F):
+			nulls_last = True if field.nulls_last else (False if field.nulls_first else None)
+			return field.expression.name, field.descending, nulls_last
+		if isinstance(field, str):
+			return field.lstrip('-'), field.startswith('-'), None
+		raise TypeError(f'KeysetPagination cannot seek on ordering {field!r}')
+
+	@staticmethod
+	def _flip(column):
+		name, descending, nulls_last = column
+		return name, not descending, None if nulls_last is None else not nulls_last
+
+	@staticmethod
+	def _order_by(name, descending, nulls_last):
+		if nulls_last is None:
+			return f'-{name}' if descending else name
+		placement = {'nulls_last': True} if nulls_last else {'nulls_first': True}
+		return F(name).desc(**placement) if descending else F(name).asc(**placement)
+
+	def _seek(self, values, reverse):
+		"""Rows strictly after `values` in the (possibly reversed) ordering"""
+		condition = Q()
+		equal = Q()
+		for column, value in zip(self.ordering, values):
+			name, descending, nulls_last = self._flip(column) if reverse else column
+			# Past the cursor on this column, equal on every earlier one
+			if value is None:
+				if not nulls_last:
+					condition |= equal & Q(**{f'{name}__isnull': False})
+				equal &= Q(**{f'{name}__isnull': True})
+			else:
+				after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+				if nulls_last:
+					after |= Q(**{f'{name}__isnull': True})
+				condition |= equal & after
+				equal &= Q(**{name: value})
+		return condition
@@ -0,0 +1,105 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from django.conf import settings
+
+
+class PasswordHasherBusy(Exception):
+	"""Raised when the password hashing queue is full"""
+
+
+class PasswordHasher:
+	"""Runs bcrypt on a bounded worker pool.
+
+	At most PASSWORD_HASH_WORKERS hashes run at once and at most
+	PASSWORD_HASH_QUEUE_LIMIT more wait for a worker; further calls are
+	rejected with PasswordHasherBusy instead of piling up on request threads.
+	"""
+
+	def __init__(self, workers, queue_limit):
+		self.workers = workers
+		self.queue_limit = queue_limit
+		self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+		self._slots = threading.BoundedSemaphore(workers + queue_limit)
+		self._lock = threading.Lock()
+		self._queued = 0
+		self._running = 0
+		self._completed = 0
+		self._rejected = 0
+
+	def _run(self, func, *args):
+		with self._lock:
+			self._queued -= 1
+			self._running += 1
+		try:
+			return func(*args)
+		finally:
+			with self._lock:
+				self._running -= 1
+				self._completed += 1
+			self._slots.release()
+
+	def submit(self, func, *args):
+		if not self._slots.acquire(blocking=False):
+			with self._lock:
+				self._rejected += 1
+			raise PasswordHasherBusy('Password hashing queue is full')
+		with self._lock:
+			self._queued += 1
+		return self._executor.submit(self._run, func, *args).result()
+
+	def stats(self):
+		"""Current queue depth and counters"""
+		with self._lock:
+			return {
+				'workers': self.workers,
+				'queued': self._queued,
+				'running': self._running,
+				'completed': self._completed,
+				'rejected': self._rejected,
+			}
+
+
+_hasher = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher():
+	"""Return the process-wide PasswordHasher, created on first use"""
+	global _hasher
+	if _hasher is None:
+		with _hasher_lock:
+			if _hasher is None:
+				_hasher = PasswordHasher(
+					settings.PASSWORD_HASH_WORKERS,
+					settings.PASSWORD_HASH_QUEUE_LIMIT
+				)
+	return _hasher
+
+
+def _hash(password, rounds):
+	return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(password, hashed):
+	return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def hash_password(password):
+	"""Hash a password with the configured bcrypt cost"""
+	return get_password_hasher().submit(_hash, password, settings.BCRYPT_ROUNDS)
+
+
+def check_password(password, hashed):
+	"""Verify a password against a bcrypt hash"""
+	return get_password_hasher().submit(_check, password, hashed)
+
+
+def needs_rehash(hashed):
+	"""True when a hash was made with a different cost than BCRYPT_ROUNDS"""
+	# bcrypt hashes look like $2b$12$<salt+hash>
+	try:
+		rounds = int(hashed.split('$')[2])
+	except (IndexError, ValueError):
+		return True
+	return rounds != settings.BCRYPT_ROUNDS
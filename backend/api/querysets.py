@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from .models import StartupTag
+from .money import parse_amount_param
+
+User = get_user_model()
+
+
+def with_user_stats(queryset):
+	"""Load users together with the counters UserSerializer.get_stats reports"""
+	return queryset.select_related('activity_stats')
+
+
+def startup_list_prefetches(prefix=''):
+	"""Prefetches that let StartupListSerializer render without per-row queries.
+
+	`prefix` is the lookup path to the startup, e.g. 'startup__' for favorites.
+	"""
+	return [
+		Prefetch(f'{prefix}owner', queryset=with_user_stats(User.objects.all())),
+		Prefetch(f'{prefix}tags', queryset=StartupTag.objects.order_by('pk')),
+	]
+
+
+# Query parameter: (amount lookup, column holding that amount's currency)
+AMOUNT_RANGE_PARAMS = {
+	'minPrice': ('asking_price_amount__gte', 'currency'),
+	'maxPrice': ('asking_price_amount__lte', 'currency'),
+	'minRevenue': ('revenue_amount__gte', 'revenue_currency'),
+	'maxRevenue': ('revenue_amount__lte', 'revenue_currency'),
+}
+
+
+def filter_amount_ranges(queryset, params):
+	"""Apply min/max price and revenue query parameters (e.g. '?minPrice=10k').
+
+	Amounts are only compared within one currency: '?minPrice=PKR 50,000'
+	matches PKR listings, and a bare number means DEFAULT_CURRENCY, as it does
+	for listings. A value that is not an amount is a 400, so a typo does not
+	silently return the unfiltered listing.
+	"""
+	for param, (lookup, currency_field) in AMOUNT_RANGE_PARAMS.items():
+		value = params.get(param)
+		if not value:
+			continue
+		amount, currency = parse_amount_param(value)
+		if amount is None:
+			raise ValidationError({param: f"Not an amount: {value!r}"})
+		queryset = queryset.filter(**{lookup: amount, currency_field: currency})
+	return queryset
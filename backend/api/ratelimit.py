@@ -0,0 +1,210 @@
+import functools
+import sqlite3
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.response import Response
+from .tracing import get_tracer
+
+trace = get_tracer('api.ratelimit')
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+	"""Parse '5/m' into (5, 60)"""
+	count, period = rate.split('/')
+	return int(count), RATE_PERIODS[period[-1]] * int(period[:-1] or 1)
+
+
+class CacheCounterBackend:
+	"""Counters in a shared Django cache; incr is atomic on Redis and Memcached"""
+
+	def __init__(self, alias):
+		self.cache = caches[alias]
+
+	def incr(self, key, ttl):
+		try:
+			return self.cache.incr(key)
+		except ValueError:
+			if self.cache.add(key, 1, ttl):
+				return 1
+			return self.cache.incr(key)
+
+	def get(self, key):
+		return self.cache.get(key, 0)
+
+	def clear(self):
+		self.cache.clear()
+
+
+class SQLiteCounterBackend:
+	"""Counters in a SQLite file shared by every worker process on one node"""
+	purge_interval = 60
+
+	def __init__(self, path):
+		self.path = str(path)
+		self._local = threading.local()
+		self._last_purge = 0
+
+	def _connection(self):
+		conn = getattr(self._local, 'conn', None)
+		if conn is None:
+			conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+			conn.execute('PRAGMA journal_mode=WAL')
+			conn.execute(
+				'CREATE TABLE IF NOT EXISTS ratelimit_counters '
+				'(key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)'
+			)
+			self._local.conn = conn
+		return conn
+
+	def incr(self, key, ttl):
+		now = time.time()
+		conn = self._connection()
+		# A single upsert statement is atomic across processes
+		count = conn.execute(
+			'INSERT INTO ratelimit_counters (key, count, expires_at) VALUES (?, 1, ?) '
+			'ON CONFLICT(key) DO UPDATE SET '
+			'count = CASE WHEN expires_at < ? THEN 1 ELSE count + 1 END, '
+			'expires_at = CASE WHEN expires_at < ? THEN excluded.expires_at ELSE expires_at END '
+			'RETURNING count',
+			(key, now + ttl, now, now)
+		).fetchone()[0]
+		if now - self._last_purge > self.purge_interval:
+			self._last_purge = now
+			conn.execute('DELETE FROM ratelimit_counters WHERE expires_at < ?', (now,))
+		return count
+
+	def get(self, key):
+		row = self._connection().execute(
+			'SELECT count FROM ratelimit_counters WHERE key = ? AND expires_at >= ?',
+			(key, time.time())
+		).fetchone()
+		return row[0] if row else 0
+
+	def clear(self):
+		self._connection().execute('DELETE FROM ratelimit_counters')
+
+
+class SlidingWindowLimiter:
+	"""Sliding-window rate limiter over two fixed-window counters.
+
+	The request count is estimated as the current window's counter plus the
+	previous window's counter weighted by how much of it still overlaps the
+	sliding window, so every decision costs one increment and one read.
+	"""
+
+	def __init__(self, backend):
+		self.backend = backend
+		self._lock = threading.Lock()
+		self._decisions = 0
+		self._blocked = 0
+		self._total_seconds = 0.0
+		self._max_seconds = 0.0
+
+	def hit(self, scope, ident, limit, period):
+		"""Count a request and return (allowed, retry_after_seconds)"""
+		started = time.perf_counter()
+		now = time.time()
+		window = int(now // period)
+		elapsed = (now % period) / period
+		current = self.backend.incr(f'rl:{scope}:{ident}:{window}', period * 2)
+		previous = self.backend.get(f'rl:{scope}:{ident}:{window - 1}')
+		allowed = previous * (1 - elapsed) + current <= limit
+		seconds = time.perf_counter() - started
+		with self._lock:
+			self._decisions += 1
+			self._blocked += not allowed
+			self._total_seconds += seconds
+			self._max_seconds = max(self._max_seconds, seconds)
+		return allowed, int(period * (1 - elapsed)) + 1
+
+	def stats(self):
+		"""Decision counts and latency"""
+		with self._lock:
+			return {
+				'decisions': self._decisions,
+				'blocked': self._blocked,
+				'avg_latency_ms': self._total_seconds * 1000 / self._decisions if self._decisions else 0.0,
+				'max_latency_ms': self._max_seconds * 1000,
+			}
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter():
+	"""Return the process-wide limiter for the configured RATELIMIT_BACKEND"""
+	global _limiter
+	if _limiter is None:
+		with _limiter_lock:
+			if _limiter is None:
+				if settings.RATELIMIT_BACKEND == 'sqlite':
+					backend = SQLiteCounterBackend(settings.RATELIMIT_SQLITE_PATH)
+				else:
+					backend = CacheCounterBackend(settings.RATELIMIT_USE_CACHE)
+				_limiter = SlidingWindowLimiter(backend)
+	return _limiter
+
+
+@receiver(setting_changed)
+def reset_limiter(setting, **kwargs):
+	"""Build a new limiter for new rate limit settings (override_settings)"""
+	global _limiter
+	if setting.startswith('RATELIMIT_'):
+		_limiter = None
+
+
+def client_ip(request):
+	return request.META.get('REMOTE_ADDR', '')
+
+
+def account_email(request):
+	"""The account a request targets, from the submitted email address"""
+	data = request.data if hasattr(request, 'data') else request.POST
+	# A JSON body can be any value; only an object names an account
+	email = data.get('email', '') if isinstance(data, dict) else ''
+	return str(email).strip().lower()
+
+
+RATE_KEYS = {
+	'ip': client_ip,
+	'account': account_email,
+}
+
+
+def ratelimit(key, rate, method='POST'):
+	"""Limit a view (or view method) to `rate` requests per `key`.
+
+	`key` is 'ip', 'account' or a callable taking the request. Requests over the
+	limit get a 429 response with a Retry-After header.
+	"""
+	limit, period = parse_rate(rate)
+	get_ident = RATE_KEYS[key] if isinstance(key, str) else key
+	scope_name = key if isinstance(key, str) else key.__name__
+
+	def decorator(view):
+		scope = f'{view.__module__}.{view.__qualname__}:{scope_name}'
+
+		@functools.wraps(view)
+		def wrapped(request, *args, **kwargs):
+			if settings.RATELIMIT_ENABLE and request.method == method:
+				ident = get_ident(request)
+				if ident:
+					allowed, retry_after = get_limiter().hit(scope, ident, limit, period)
+					if not allowed:
+						trace("ratelimit.blocked scope=%s", scope)
+						return Response(
+							{"error": "Too many requests", "message": "Rate limit exceeded, please retry later"},
+							status=status.HTTP_429_TOO_MANY_REQUESTS,
+							headers={'Retry-After': str(retry_after)}
+						)
+			return view(request, *args, **kwargs)
+		return wrapped
+	return decorator
@@ -0,0 +1,202 @@
+from operator import itemgetter
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.response import Response
+from .activity import count_user_stats
+from .fieldsets import sparse_field_names
+from .models import StartupTag
+from .pagination import KeysetPagination
+from .serializers import NotificationSerializer, PositionSerializer, StartupListSerializer, UserSerializer
+
+User = get_user_model()
+
+def datetime_formatter():
+	"""DRF's DateTimeField.to_representation, with the current time zone looked up once.
+
+	Using DRF's own field keeps the output exactly as the serializers format it.
+	"""
+	current = timezone.get_current_timezone() if settings.USE_TZ else None
+	return serializers.DateTimeField(default_timezone=current).to_representation
+
+
+def format_uuid(value):
+	return str(value)
+
+
+class ValuesSerializer:
+	"""Read-only serializer that renders .values() rows into plain dicts.
+
+	Each subclass stands in for a DRF serializer on a hot list endpoint and
+	must produce the same data: same keys in the same order, same value
+	formatting. ?fields= / ?exclude= work as with SparseFieldsMixin, and only
+	the columns the kept fields need are selected.
+
+	By default each field reads the column of the same name (or its entry in
+	`sources`), with ids and timestamps formatted as DRF does; subclasses
+	extend columns() and getters() for the fields that need more.
+	"""
+	fields = ()
+	# Columns of the fields that are not a column of the same name
+	sources = {}
+
+	def __init__(self, params=None):
+		kept = sparse_field_names(params, self.fields) if params is not None else None
+		self.kept = list(self.fields) if kept is None else kept
+
+	def columns(self):
+		"""Columns .values() selects for the kept fields"""
+		return ['id', *(self.sources.get(name, name) for name in self.kept)]
+
+	def getters(self, rows):
+		"""{field: function(row)} for the kept fields, loading related data for `rows` in bulk"""
+		format_datetime = datetime_formatter()
+		getters = {name: itemgetter(self.sources.get(name, name)) for name in self.fields}
+		getters['id'] = lambda row: format_uuid(row['id'])
+		if 'created_at' in self.fields:
+			getters['created_at'] = lambda row: format_datetime(row['created_at'])
+		return getters
+
+	def prepare(self, queryset):
+		"""The queryset as .values() rows, with the columns its ordering seeks on"""
+		columns = dict.fromkeys([*self.columns(), *KeysetPagination.ordering_columns(queryset)])
+		return queryset.prefetch_related(None).values(*columns)
+
+	def serialize(self, rows):
+		rows = list(rows)
+		getters = self.getters(rows)
+		fields = [(name, getters[name]) for name in self.kept]
+		return [{name: getter(row) for name, getter in fields} for row in rows]
+
+
+def users_by_id(user_ids):
+	"""UserSerializer data for each user id, from one query (plus counts for users without counters)"""
+	rows = list(User.objects.filter(pk__in=set(user_ids)).values(
+		'id', 'username', 'email', 'created_at', 'role', 'email_verified', 'activity_stats',
+		'activity_stats__startups_created', 'activity_stats__applications_submitted',
+		'activity_stats__collaborations',
+	))
+	counted = count_user_stats([row['id'] for row in rows if row['activity_stats'] is None])
+	format_datetime = datetime_formatter()
+	users = {}
+	for row in rows:
+		if row['activity_stats'] is None:
+			counts = counted[row['id']]
+		else:
+			counts = {
+				'startups_created': row['activity_stats__startups_created'],
+				'applications_submitted': row['activity_stats__applications_submitted'],
+				'collaborations': row['activity_stats__collaborations'],
+			}
+		data = {
+			'id': format_uuid(row['id']),
+			'username': row['username'],
+			'email': row['email'],
+			'created_at': format_datetime(row['created_at']),
+			'stats': {
+				'startupsCreated': counts['startups_created'],
+				'applicationsSubmitted': counts['applications_submitted'],
+				'collaborations': counts['collaborations'],
+			},
+			'role': row['role'],
+			'email_verified': row['email_verified'],
+		}
+		users[row['id']] = {name: data[name] for name in UserSerializer.Meta.fields}
+	return users
+
+
+def first_tags(startup_ids):
+	"""The first tag (by primary key) of each startup that has one"""
+	tags = {}
+	rows = StartupTag.objects.filter(startup_id__in=set(startup_ids)).order_by('pk').values_list('startup_id', 'tag')
+	for startup_id, tag in rows:
+		tags.setdefault(startup_id, tag)
+	return tags
+
+
+class StartupListValuesSerializer(ValuesSerializer):
+	"""Stands in for StartupListSerializer"""
+	fields = StartupListSerializer.Meta.fields
+	sources = {'name': 'title', 'tag': 'type', 'owner': 'owner_id'}
+
+	def getters(self, rows):
+		getters = super().getters(rows)
+		if 'tag' in self.kept:
+			tags = first_tags(row['id'] for row in rows)
+			getters['tag'] = lambda row: tags[row['id']] if row['id'] in tags else (
+				"Fund Raising" if row['type'] == 'marketplace' else "Open to Collaborate"
+			)
+		if 'owner' in self.kept:
+			owners = users_by_id(row['owner_id'] for row in rows)
+			getters['owner'] = lambda row: owners[row['owner_id']]
+		return getters
+
+
+class AllPositionsValuesSerializer(ValuesSerializer):
+	"""Stands in for PositionSerializer plus the startup dict AllPositionsView attaches"""
+	fields = PositionSerializer.Meta.fields
+	startup_columns = (
+		'startup_id', 'startup__title', 'startup__description', 'startup__category', 'startup__field',
+		'startup__phase', 'startup__team_size', 'startup__earn_through',
+		'startup__owner_id', 'startup__owner__username', 'startup__owner__email',
+	)
+
+	def columns(self):
+		columns = ['id']
+		for name in self.kept:
+			if name == 'startup':
+				columns.extend(self.startup_columns)
+			elif name != 'applications_count':
+				columns.append(name)
+		return columns
+
+	def prepare(self, queryset):
+		queryset = super().prepare(queryset)
+		if 'applications_count' in self.kept:
+			# Annotated after .values(), so rows are grouped by the selected columns only
+			queryset = queryset.annotate(applications_total=Count('applications'))
+		return queryset
+
+	def getters(self, rows):
+		getters = super().getters(rows)
+		getters.update({
+			'applications_count': itemgetter('applications_total'),
+			'startup': lambda row: {
+				'id': format_uuid(row['startup_id']),
+				'title': row['startup__title'],
+				'description': row['startup__description'],
+				'category': row['startup__category'],
+				'field': row['startup__field'],
+				'phase': row['startup__phase'],
+				'team_size': row['startup__team_size'],
+				'earn_through': row['startup__earn_through'],
+				'owner': {
+					'id': format_uuid(row['startup__owner_id']),
+					'username': row['startup__owner__username'],
+					'email': row['startup__owner__email'],
+				},
+			},
+		})
+		return getters
+
+
+class NotificationValuesSerializer(ValuesSerializer):
+	"""Stands in for NotificationSerializer"""
+	fields = NotificationSerializer.Meta.fields
+
+
+class ValuesListMixin:
+	"""List views served by `values_serializer_class` when FAST_READ_SERIALIZERS is on"""
+	values_serializer_class = None
+
+	def list(self, request, *args, **kwargs):
+		if not settings.FAST_READ_SERIALIZERS:
+			return super().list(request, *args, **kwargs)
+		serializer = self.values_serializer_class(request.query_params)
+		queryset = serializer.prepare(self.get_queryset())
+		page = self.paginate_queryset(queryset)
+		if page is not None:
+			return self.get_paginated_response(serializer.serialize(page))
+		return Response(serializer.serialize(queryset))
@@ -0,0 +1,66 @@
+import time
+from django.contrib.sessions.models import Session
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .authentication import JWT_TOKEN_TYPES, revoked_tokens
+from .models import UserSession, EmailVerificationCode
+
+
+def _expired_stores(now):
+	"""Expired or revoked rows per credential store, as (label, queryset) pairs"""
+	return [
+		('user_sessions', UserSession.objects.filter(Q(expires_at__lt=now) | ~Q(generation=F('user__session_generation')))),
+		('django_session', Session.objects.filter(expire_date__lt=now)),
+		('email_verification_codes', EmailVerificationCode.objects.filter(Q(expires_at__lt=now) | Q(is_used=True))),
+	]
+
+
+def _delete_batch(batch):
+	"""Delete a batch of rows, returning how many went"""
+	if batch.model is not UserSession:
+		return batch.delete()[0]
+	# The revoke_deleted_jwt receiver would make delete() load and revoke the
+	# rows one at a time. Only JWTs that have not expired yet need revoking:
+	# do those in one pass, then delete without signals.
+	revoked_tokens.revoke_many(
+		batch.filter(token_type__in=JWT_TOKEN_TYPES, expires_at__gt=timezone.now())
+		.values_list('token_hash', 'expires_at')
+	)
+	return batch._raw_delete(batch.db)
+
+
+def _reap_store(expired, batch_size):
+	"""Delete expired rows one primary-key range at a time"""
+	deleted = 0
+	last_pk = None
+	while True:
+		candidates = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+		pks = list(candidates.order_by('pk').values_list('pk', flat=True)[:batch_size])
+		if not pks:
+			return deleted
+		# Each batch is its own short transaction so locks are held briefly
+		with transaction.atomic():
+			deleted += _delete_batch(expired.filter(pk__gte=pks[0], pk__lte=pks[-1]))
+		last_pk = pks[-1]
+
+
+def reap_expired_credentials(batch_size=1000):
+	"""Remove expired sessions, tokens and verification codes from every store.
+
+	Returns a report per store with the rows deleted, the throughput and the
+	number of expired rows still left (rows that expired while reaping).
+	"""
+	report = {}
+	for label, expired in _expired_stores(timezone.now()):
+		started = time.monotonic()
+		deleted = _reap_store(expired, batch_size)
+		elapsed = time.monotonic() - started
+		report[label] = {
+			'deleted': deleted,
+			'seconds': elapsed,
+			'rows_per_second': deleted / elapsed if elapsed else 0.0,
+		}
+	for label, expired in _expired_stores(timezone.now()):
+		report[label]['backlog'] = expired.count()
+	return report
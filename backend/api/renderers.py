@@ -0,0 +1,33 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+	import orjson
+except ImportError:  # optional; JSONRenderer's own encoder is used instead
+	orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+	"""JSONRenderer that encodes with orjson when it is installed.
+
+	The bytes match JSONRenderer's compact, UTF-8 output: datetimes and other
+	types orjson would format differently go through DRF's JSONEncoder, and
+	U+2028/U+2029 are escaped the same way. Two differences remain: floats in
+	exponent notation lose the '+' and leading zero ('1e16', not '1e+16'),
+	and NaN/Infinity become null instead of raising. Indented output (the
+	browsable API, ?indent) and anything orjson cannot encode (integers above
+	64 bits, non-string keys) fall back to JSONRenderer.
+	"""
+
+	def render(self, data, accepted_media_type=None, renderer_context=None):
+		if (
+			orjson is None or data is None
+			or self.ensure_ascii or not self.compact
+			or self.get_indent(accepted_media_type, renderer_context or {})
+		):
+			return super().render(data, accepted_media_type, renderer_context)
+		try:
+			ret = orjson.dumps(data, default=self.encoder_class().default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+		except orjson.JSONEncodeError:
+			return super().render(data, accepted_media_type, renderer_context)
+		# Same escaping as JSONRenderer, for JavaScript that embeds the JSON
+		return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
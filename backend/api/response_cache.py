@@ -0,0 +1,123 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+from .tracing import get_tracer
+
+trace = get_tracer('api.response_cache')
+
+VERSION_PREFIX = 'listing-version:'
+
+
+def _cache():
+	return caches[settings.LISTING_CACHE_ALIAS]
+
+
+def get_versions(labels):
+	"""Current version of each model label, starting any that are missing"""
+	keys = [VERSION_PREFIX + label for label in labels]
+	found = _cache().get_many(keys)
+	versions = []
+	for key in keys:
+		if key not in found:
+			# Start from the clock so an evicted counter never repeats an old version
+			_cache().add(key, time.time_ns(), None)
+			found[key] = _cache().get(key)
+		versions.append(str(found[key]))
+	return versions
+
+
+def _bump(label):
+	key = VERSION_PREFIX + label
+	try:
+		_cache().incr(key)
+	except ValueError:
+		_cache().set(key, time.time_ns(), None)
+
+
+def bump_version(label):
+	"""Invalidate every cached response that depends on a model, in O(1).
+
+	The bump is repeated on commit, so a response cached from a reader that
+	ran while the write was still uncommitted is invalidated too.
+	"""
+	_bump(label)
+	transaction.on_commit(lambda: _bump(label))
+
+
+class ResponseCacheStats:
+	"""Hit and miss counters per cached view"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._counts = {}
+
+	def record(self, name, outcome):
+		with self._lock:
+			counts = self._counts.setdefault(name, {'hits': 0, 'misses': 0, 'bypassed': 0})
+			counts[outcome] += 1
+
+	def snapshot(self):
+		with self._lock:
+			return {name: dict(counts) for name, counts in self._counts.items()}
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+class CachedListMixin:
+	"""Cache anonymous GET responses of a public listing view.
+
+	Responses are keyed by the view, the canonical query string and the
+	versions of `cache_models` (model labels whose save/delete signals call
+	bump_version), so a write invalidates them without scanning keys.
+	Authenticated requests bypass the cache, since they may carry personalised
+	fields, unless `cache_authenticated` is set. Only `cache_params` (all when
+	None) take part in the key, so unrelated parameters share an entry. The
+	TTL comes from LISTING_CACHE_TTLS[cache_name], falling back to
+	LISTING_CACHE_TTL. The ETag header is cached with the body, so a
+	revalidation that hits the cache gets its 304 without any query.
+	"""
+	validator_headers = ('ETag',)
+	cache_name = None
+	cache_models = ()
+	cache_authenticated = False
+	cache_params = None
+
+	def get(self, request, *args, **kwargs):
+		if not settings.LISTING_CACHE_ENABLED or (request.user.is_authenticated and not self.cache_authenticated):
+			response_cache_stats.record(self.cache_name, 'bypassed')
+			return super().get(request, *args, **kwargs)
+
+		key = self.response_cache_key(request)
+		cached = _cache().get(key)
+		if cached is not None:
+			response_cache_stats.record(self.cache_name, 'hits')
+			trace("response_cache.hit view=%s", self.cache_name)
+			headers = cached['headers']
+			not_modified = get_conditional_response(request, etag=headers.get('ETag'))
+			if not_modified is not None:
+				return not_modified
+			return Response(cached['data'], headers={**headers, 'X-Cache': 'HIT'})
+
+		response_cache_stats.record(self.cache_name, 'misses')
+		response = super().get(request, *args, **kwargs)
+		if response.status_code == 200:
+			ttl = settings.LISTING_CACHE_TTLS.get(self.cache_name, settings.LISTING_CACHE_TTL)
+			headers = {name: response[name] for name in self.validator_headers if response.has_header(name)}
+			_cache().set(key, {'data': response.data, 'headers': headers}, ttl)
+			response['X-Cache'] = 'MISS'
+		return response
+
+	def response_cache_key(self, request):
+		params = sorted(
+			(name, request.query_params.getlist(name)) for name in request.query_params
+			if self.cache_params is None or name in self.cache_params
+		)
+		canonical = repr((request.scheme, request.get_host(), request.path, params)).encode()
+		versions = ':'.join(get_versions(self.cache_models))
+		return f'listing:{self.cache_name}:{versions}:{hashlib.sha1(canonical).hexdigest()}'
@@ -2,11 +2,14 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
-import bcrypt
-from .models import Startup, StartupTag, Position, Application, Notification, Favorite, Interest
+from .models import Startup, StartupTag, Position, Application, Notification, Favorite, Interest, UserActivityStats
 from .messaging_models import Conversation, Message, UserProfile, FileUpload
+from .fieldsets import SparseFieldsMixin
+from .passwords import hash_password
+from .tracing import get_tracer
 
 User = get_user_model()
+trace = get_tracer('api.serializers')
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -34,9 +37,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 	def create(self, validated_data):
 		password = validated_data.pop('password')
 		user = User(**validated_data)
-		# Hash password with bcrypt
-		hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-		user.password = hashed_password.decode('utf-8')
+		# Hash password with bcrypt (on the bounded hashing pool)
+		user.password = hash_password(password)
 		user.save()
 		return user
 
@@ -56,6 +58,17 @@ class UserSerializer(serializers.ModelSerializer):
 		fields = ('id', 'username', 'email', 'created_at', 'stats', 'role', 'email_verified')
 	
 	def get_stats(self, obj):
+		try:
+			# Denormalized counters, see api.activity
+			stats = obj.activity_stats
+		except UserActivityStats.DoesNotExist:
+			stats = None
+		if stats is not None:
+			return {
+				'startupsCreated': stats.startups_created,
+				'applicationsSubmitted': stats.applications_submitted,
+				'collaborations': stats.collaborations
+			}
 		return {
 			'startupsCreated': obj.startups.count(),
 			'applicationsSubmitted': obj.applications.count(),
@@ -70,16 +83,19 @@ class StartupTagSerializer(serializers.ModelSerializer):
 		fields = ('tag',)
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 	"""Serializer for positions"""
 	applications_count = serializers.SerializerMethodField()
 	startup = serializers.SerializerMethodField()
+	sparse_sources = {'applications_count': ('applications',), 'startup': ('startup',)}
 
 	class Meta:
 		model = Position
 		fields = ('id', 'title', 'description', 'requirements', 'is_active', 'applications_count', 'created_at', 'startup')
 
 	def get_applications_count(self, obj):
+		if hasattr(obj, 'applications_total'):
+			return obj.applications_total
 		return obj.applications.count()
 
 	def get_startup(self, obj):
@@ -94,11 +110,12 @@ class PositionSerializer(serializers.ModelSerializer):
 		}
 
 
-class StartupListSerializer(serializers.ModelSerializer):
+class StartupListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 	"""Serializer for startup list view"""
 	owner = UserSerializer(read_only=True)
 	tag = serializers.SerializerMethodField()
 	name = serializers.CharField(source='title', read_only=True)
+	sparse_sources = {'tag': ('tags', 'type')}
 	
 	class Meta:
 		model = Startup
@@ -110,7 +127,11 @@ class StartupListSerializer(serializers.ModelSerializer):
 	
 	def get_tag(self, obj):
 		# Return first tag or a default based on type
-		first_tag = obj.tags.first()
+		if 'tags' in getattr(obj, '_prefetched_objects_cache', {}):
+			tags = obj.tags.all()
+			first_tag = tags[0] if tags else None
+		else:
+			first_tag = obj.tags.first()
 		if first_tag:
 			return first_tag.tag
 		return "Fund Raising" if obj.type == 'marketplace' else "Open to Collaborate"
@@ -130,7 +151,7 @@ class StartupDetailSerializer(serializers.ModelSerializer):
 			'id', 'name', 'title', 'description', 'tags', 'performance', 
 			'positions', 'owner', 'type', 'field', 'category', 
 			'ttm_revenue', 'ttm_profit', 'last_month_revenue', 'last_month_profit',
-			'created_at', 'updated_at'
+			'views', 'created_at', 'updated_at'
 		)
 	
 	def get_tags(self, obj):
@@ -159,13 +180,11 @@ class StartupCreateSerializer(serializers.ModelSerializer):
 		)
 	
 	def validate(self, data):
-		print(f"📋 StartupCreateSerializer: Received data:")
-		for key, value in data.items():
-			print(f"- {key}: {value} (type: {type(value).__name__})")
+		if trace.enabled():
+			trace("startup_create.validate fields=%s", sorted(data))
 		return data
 	
 	def create(self, validated_data):
-		print(f"✅ StartupCreateSerializer: Creating startup with validated data")
 		# Respect owner provided by the view (serializer.save(owner=user))
 		owner = validated_data.get('owner')
 		if owner is None:
@@ -178,7 +197,7 @@ class StartupCreateSerializer(serializers.ModelSerializer):
 		return super().create(validated_data)
 
 
-class ApplicationSerializer(serializers.ModelSerializer):
+class ApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 	"""Serializer for applications"""
 	startup = StartupListSerializer(read_only=True)
 	position = PositionSerializer(read_only=True)
@@ -250,7 +269,7 @@ class UserMiniSerializer(serializers.ModelSerializer):
         fields = ('id', 'username', 'email')
 
 
-class FavoriteSerializer(serializers.ModelSerializer):
+class FavoriteSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for saved startups (favorites)"""
     startup = StartupListSerializer(read_only=True)
 
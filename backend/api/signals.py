@@ -0,0 +1,141 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .activity import adjust_user_stats
+from .authentication import JWT_TOKEN_TYPES, forget_cached_user, revoked_tokens
+from .models import (
+	Application, Favorite, Interest, Position, Startup, StartupTag, StartupTrendingScore,
+	UserActivityStats, UserSession,
+)
+from .response_cache import bump_version
+
+User = get_user_model()
+
+
+@receiver(post_delete, sender=UserSession)
+def revoke_deleted_jwt(sender, instance, **kwargs):
+	"""Deleting a JWT session (logout, rotation, invalidation) revokes the token"""
+	if instance.token_type in JWT_TOKEN_TYPES:
+		revoked_tokens.revoke(instance.token_hash, instance.expires_at)
+
+
+@receiver(post_save, sender=User)
+def forget_saved_user(sender, instance, created, **kwargs):
+	"""Keep the JWT user cache from serving stale user attributes"""
+	forget_cached_user(instance.id)
+	if created and not kwargs.get('raw'):
+		UserActivityStats.objects.get_or_create(user=instance)
+
+
+# User fields that no cached listing renders; saving only these keeps cached listings
+UNLISTED_USER_FIELDS = {'last_login', 'password', 'session_generation', 'updated_at'}
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_user_version(sender, instance, **kwargs):
+	"""Listings embed their owners (username, email, role, counters)"""
+	update_fields = kwargs.get('update_fields')
+	if update_fields and set(update_fields) <= UNLISTED_USER_FIELDS:
+		return
+	bump_version('user')
+
+
+@receiver(post_init, sender=Startup)
+def remember_startup_owner(sender, instance, **kwargs):
+	# Deferred loads leave owner_id out of __dict__
+	instance._saved_owner_id = instance.__dict__.get('owner_id')
+
+
+@receiver(post_save, sender=Startup)
+def count_saved_startup(sender, instance, created, **kwargs):
+	if kwargs.get('raw'):
+		return
+	update_fields = kwargs.get('update_fields')
+	if update_fields is not None and not {'owner', 'owner_id'} & set(update_fields):
+		return
+	if created:
+		adjust_user_stats(instance.owner_id, startups_created=1)
+	elif instance._saved_owner_id is not None and instance._saved_owner_id != instance.owner_id:
+		# Handed over to another user (e.g. in the admin): move the count
+		adjust_user_stats(instance._saved_owner_id, create_missing=False, startups_created=-1)
+		adjust_user_stats(instance.owner_id, startups_created=1)
+	instance._saved_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender=Startup)
+def count_deleted_startup(sender, instance, **kwargs):
+	adjust_user_stats(instance.owner_id, create_missing=False, startups_created=-1)
+
+
+@receiver(post_init, sender=Application)
+def remember_application_status(sender, instance, **kwargs):
+	# Deferred loads leave status out of __dict__
+	instance._saved_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=Application)
+def count_saved_application(sender, instance, created, **kwargs):
+	if kwargs.get('raw'):
+		return
+	update_fields = kwargs.get('update_fields')
+	if update_fields is not None and 'status' not in update_fields:
+		status_changed = False
+	else:
+		status_changed = created or instance._saved_status != instance.status
+	was_approved = not created and instance._saved_status == 'approved'
+	is_approved = instance.status == 'approved'
+	adjust_user_stats(
+		instance.applicant_id,
+		applications_submitted=1 if created else 0,
+		collaborations=int(is_approved) - int(was_approved) if status_changed else 0
+	)
+	if status_changed:
+		instance._saved_status = instance.status
+
+
+@receiver(post_delete, sender=Application)
+def count_deleted_application(sender, instance, **kwargs):
+	adjust_user_stats(
+		instance.applicant_id,
+		create_missing=False,
+		applications_submitted=-1,
+		collaborations=-1 if instance.status == 'approved' else 0
+	)
+
+
+# Fields that no cached listing renders; saving only these keeps cached listings
+UNLISTED_STARTUP_FIELDS = {'views'}
+
+
+@receiver(post_save, sender=Startup)
+@receiver(post_delete, sender=Startup)
+def bump_startup_version(sender, instance, **kwargs):
+	update_fields = kwargs.get('update_fields')
+	if update_fields and set(update_fields) <= UNLISTED_STARTUP_FIELDS:
+		return
+	bump_version('startup')
+
+
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Position)
+def bump_position_version(sender, instance, **kwargs):
+	bump_version('position')
+
+
+@receiver(post_save, sender=StartupTag)
+@receiver(post_delete, sender=StartupTag)
+def bump_startup_tag_version(sender, instance, **kwargs):
+	bump_version('startuptag')
+	# Tags have no timestamp of their own; the startup's updated_at feeds the ETags
+	Startup.objects.filter(pk=instance.startup_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_delete, sender=Favorite)
+@receiver(post_save, sender=Interest)
+@receiver(post_delete, sender=Interest)
+def mark_trending_stale(sender, instance, **kwargs):
+	"""Have the next refresh_trending run rescore the startup"""
+	StartupTrendingScore.objects.filter(startup_id=instance.startup_id, dirty=False).update(dirty=True)
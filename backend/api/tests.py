@@ -1,15 +1,32 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
 from django.urls import reverse
 import json
+import os
+import tempfile
+import uuid
 import bcrypt
-from .models import Startup, StartupTag, Position, Application
+from .models import Startup, StartupTag, Position, Application, Favorite, Interest, StartupTrendingScore
 from .messaging_models import Conversation
 
 User = get_user_model()
 
+# Rate limit counters go to a throwaway file, so test runs do not count against each other
+_ratelimit_dir = tempfile.TemporaryDirectory()
+_ratelimit_settings = override_settings(RATELIMIT_SQLITE_PATH=os.path.join(_ratelimit_dir.name, 'ratelimit.sqlite3'))
+
+
+def setUpModule():
+    _ratelimit_settings.enable()
+
+
+def tearDownModule():
+    _ratelimit_settings.disable()
+    _ratelimit_dir.cleanup()
+
 
 class BcryptUserMixin:
     """Test helper mixin to create users with bcrypt-hashed passwords"""
@@ -340,3 +357,1493 @@ class MessagingAPITestCase(BcryptUserMixin, APITestCase):
         self.assertEqual(len(messages_response.data), 1)
         self.assertEqual(messages_response.data[0]['content'], 'Hello from user one!')
         self.assertEqual(messages_response.data[0]['sender']['id'], str(self.user_one.id))
+
+
+class AuthTokenStoreTestCase(BcryptUserMixin, APITestCase):
+    """Auth tokens issued on login resolve through the token store"""
+
+    def setUp(self):
+        self.password = 'securepassword123'
+        self.user = self.create_bcrypt_user(
+            username='token-user',
+            email='token-user@example.com',
+            password=self.password
+        )
+
+    def login(self):
+        response = self.client.post(reverse('login'), {
+            'email': self.user.email,
+            'password': self.password
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['auth_token']
+
+    def test_token_lookup_is_single_query(self):
+        from django.test import RequestFactory
+        from .views import get_session_user
+        token = self.login()
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        with self.assertNumQueries(1):
+            self.assertEqual(get_session_user(request), self.user)
+
+    def test_logout_revokes_token(self):
+        from .models import UserSession
+        token = self.login()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertTrue(client.get(reverse('auth_test')).data['authenticated'])
+        client.post(reverse('logout'))
+        self.assertFalse(UserSession.objects.filter(user=self.user, token_type='auth').exists())
+        self.assertFalse(client.get(reverse('auth_test')).data['authenticated'])
+
+
+class RequestUserResolutionTestCase(BcryptUserMixin, APITestCase):
+    """The session user is resolved once per request and exposed as request.user"""
+
+    def setUp(self):
+        self.password = 'securepassword123'
+        self.user = self.create_bcrypt_user(
+            username='resolve-user',
+            email='resolve-user@example.com',
+            password=self.password
+        )
+        self.other_user = self.create_bcrypt_user(
+            username='resolve-other',
+            email='resolve-other@example.com',
+            password=self.password
+        )
+        response = self.client.post(reverse('login'), {
+            'email': self.user.email,
+            'password': self.password
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['auth_token']}")
+
+    def test_user_resolved_once_per_request(self):
+        from unittest import mock
+        from . import authentication
+        with mock.patch.object(
+            authentication, '_resolve_session_user', wraps=authentication._resolve_session_user
+        ) as resolve:
+            response = self.client.get(reverse('conversations_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_unread_count_uses_authenticated_user(self):
+        from .messaging_models import Message
+        conversation = Conversation.objects.create(title='Unread Chat')
+        conversation.participants.set([self.user, self.other_user])
+        Message.objects.create(conversation=conversation, sender=self.other_user, content='Hi')
+        Message.objects.create(conversation=conversation, sender=self.user, content='Hello')
+        response = self.client.get(reverse('conversations_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['unread_count'], 1)
+
+
+class StatelessJWTTestCase(BcryptUserMixin, APITestCase):
+    """Stateless JWT mode authenticates without DB round trips and honours revocation"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = self.create_bcrypt_user(
+            username='jwt-user',
+            email='jwt-user@example.com',
+            password='securepassword123'
+        )
+
+    def authenticate(self, token):
+        from django.test import RequestFactory
+        from .authentication import JWTAuthentication
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        return JWTAuthentication().authenticate(request)
+
+    def test_stateless_authentication_skips_database(self):
+        from django.test import override_settings
+        from .authentication import create_token_pair
+        token = create_token_pair(self.user)['access_token']
+        with override_settings(JWT_STATELESS=True):
+            self.authenticate(token)
+            with self.assertNumQueries(0):
+                user, _ = self.authenticate(token)
+        self.assertEqual(user, self.user)
+
+    def test_deleted_session_revokes_token(self):
+        from django.test import override_settings
+        from rest_framework.exceptions import AuthenticationFailed
+        from .authentication import create_token_pair, invalidate_user_sessions
+        token = create_token_pair(self.user)['access_token']
+        invalidate_user_sessions(self.user)
+        with override_settings(JWT_STATELESS=True):
+            with self.assertRaises(AuthenticationFailed):
+                self.authenticate(token)
+
+    def test_revocation_reaches_other_workers_through_shared_cache(self):
+        import hashlib
+        from django.core.cache.backends.db import DatabaseCache
+        from django.core.exceptions import ImproperlyConfigured
+        from django.core.management import call_command
+        from .authentication import TokenRevocationSet, create_token_pair
+        from .caches import check_cache_settings
+        from .models import UserSession
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'api_cache'}}
+        with override_settings(CACHES=shared, JWT_STATELESS=True):
+            call_command('createcachetable', verbosity=0)
+            check_cache_settings()
+            token = create_token_pair(self.user)['access_token']
+            token_hash = hashlib.sha256(token.encode()).hexdigest()
+            UserSession.objects.filter(token_hash=token_hash).delete()
+            # Another worker: its own revocation set and its own cache connection
+            other_worker = TokenRevocationSet()
+            other_cache = DatabaseCache('api_cache', {})
+            self.assertTrue(other_worker.is_revoked(token_hash))
+            self.assertTrue(other_cache.get(TokenRevocationSet.cache_prefix + token_hash))
+
+        # A per-process cache would keep the revocation in this worker only
+        with override_settings(JWT_STATELESS=True):
+            with self.assertRaises(ImproperlyConfigured):
+                check_cache_settings()
+
+
+class SessionWriteTestCase(BcryptUserMixin, APITestCase):
+    """Read-only requests do not rewrite the session"""
+
+    def setUp(self):
+        self.user = self.create_bcrypt_user(
+            username='session-user',
+            email='session-user@example.com',
+            password='securepassword123'
+        )
+        self.client.force_login(self.user)
+
+    def session_writes(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [
+            q['sql'] for q in queries.captured_queries
+            if 'django_session' in q['sql'] and q['sql'].startswith(('INSERT', 'UPDATE'))
+        ]
+
+    def test_reads_skip_session_save(self):
+        url = reverse('user_profile')
+        self.session_writes(url)
+        self.assertEqual(self.session_writes(url), [])
+
+    def test_session_near_expiry_is_refreshed(self):
+        from django.test import override_settings
+        from django.conf import settings
+        url = reverse('user_profile')
+        self.session_writes(url)
+        with override_settings(SESSION_REFRESH_WINDOW=settings.SESSION_COOKIE_AGE + 1):
+            self.assertEqual(len(self.session_writes(url)), 1)
+
+
+class PasswordHasherTestCase(BcryptUserMixin, APITestCase):
+    """bcrypt work runs on a bounded pool and hashes follow BCRYPT_ROUNDS"""
+
+    def test_login_rehashes_outdated_cost(self):
+        from django.test import override_settings
+        from .passwords import needs_rehash
+        user = self.create_bcrypt_user(password='securepassword123')
+        with override_settings(BCRYPT_ROUNDS=4):
+            self.assertTrue(needs_rehash(user.password))
+            response = self.client.post(reverse('login'), {
+                'email': user.email,
+                'password': 'securepassword123'
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('$2b$04$'))
+            self.assertFalse(needs_rehash(user.password))
+
+    def test_full_queue_rejects_work(self):
+        import threading
+        from .passwords import PasswordHasher, PasswordHasherBusy
+        hasher = PasswordHasher(workers=1, queue_limit=0)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=hasher.submit, args=(block,))
+        worker.start()
+        started.wait(5)
+        with self.assertRaises(PasswordHasherBusy):
+            hasher.submit(lambda: None)
+        self.assertEqual(hasher.stats()['running'], 1)
+        self.assertEqual(hasher.stats()['rejected'], 1)
+        release.set()
+        worker.join(5)
+        self.assertEqual(hasher.stats()['completed'], 1)
+
+    def test_stats_are_staff_only(self):
+        from .passwords import check_password
+        url = reverse('password_stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        user = self.create_bcrypt_user()
+        # force_login: the suite's logins would soon hit the per-IP login limit
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+        self.assertTrue(check_password('testpassword123', user.password))
+        stats = self.client.get(url).data
+        self.assertGreaterEqual(stats['completed'], 1)
+        self.assertEqual(stats['rejected'], 0)
+        self.assertIn('queue_limit', stats)
+
+
+class CredentialReaperTestCase(BcryptUserMixin, APITestCase):
+    """Expired credentials are removed from every store in batches"""
+
+    def test_reaps_all_stores(self):
+        from datetime import timedelta
+        from django.contrib.sessions.backends.db import SessionStore
+        from django.contrib.sessions.models import Session
+        from django.utils import timezone
+        from .models import UserSession, EmailVerificationCode
+        from .reaper import reap_expired_credentials
+        user = self.create_bcrypt_user()
+        past = timezone.now() - timedelta(hours=1)
+        future = timezone.now() + timedelta(hours=1)
+        for i in range(5):
+            UserSession.objects.create(user=user, token_hash=f'expired-{i}', token_type='auth', expires_at=past)
+        live = UserSession.objects.create(user=user, token_hash='live', token_type='auth', expires_at=future)
+        EmailVerificationCode.objects.create(user=user, code='123456', expires_at=past)
+        store = SessionStore()
+        store['user_id'] = str(user.id)
+        store.create()
+        Session.objects.filter(session_key=store.session_key).update(expire_date=past)
+
+        report = reap_expired_credentials(batch_size=2)
+
+        self.assertEqual(report['user_sessions']['deleted'], 5)
+        self.assertEqual(report['django_session']['deleted'], 1)
+        self.assertEqual(report['email_verification_codes']['deleted'], 1)
+        self.assertTrue(all(stats['backlog'] == 0 for stats in report.values()))
+        self.assertEqual(list(UserSession.objects.all()), [live])
+
+    def test_superseded_jwts_are_revoked_in_bulk(self):
+        from datetime import timedelta
+        from django.utils import timezone
+        from .authentication import TokenRevocationSet
+        from .models import UserSession
+        from .reaper import reap_expired_credentials
+        user = self.create_bcrypt_user()
+        past = timezone.now() - timedelta(hours=1)
+        future = timezone.now() + timedelta(hours=1)
+        for i in range(3):
+            UserSession.objects.create(user=user, token_hash=f'expired-{i}', token_type='access', expires_at=past)
+            UserSession.objects.create(user=user, token_hash=f'superseded-{i}', token_type='refresh', expires_at=future)
+        User.objects.filter(pk=user.pk).update(session_generation=1)
+
+        # Per batch of two: the key range, a savepoint around the revocation
+        # read and one DELETE, never a query per row. Then the empty range,
+        # the two other stores and the three backlog counts.
+        with self.assertNumQueries(5 * 3 + 1 + 2 + 3):
+            report = reap_expired_credentials(batch_size=2)
+        self.assertEqual(report['user_sessions']['deleted'], 6)
+        # Another worker sees the revocations through the cache
+        other_worker = TokenRevocationSet()
+        self.assertTrue(all(other_worker.is_revoked(f'superseded-{i}') for i in range(3)))
+        self.assertFalse(other_worker.is_revoked('expired-0'))
+
+
+class TracingTestCase(BcryptUserMixin, APITestCase):
+    """Hot-path tracing produces no log records unless it is turned on"""
+
+    def setUp(self):
+        self.password = 'securepassword123'
+        self.user = self.create_bcrypt_user(password=self.password)
+
+    def api_records(self, **headers):
+        import logging
+        from unittest import mock
+        records = []
+
+        def handle(logger, record):
+            if record.name.startswith('api'):
+                records.append(record)
+
+        with mock.patch.object(logging.Logger, 'handle', handle):
+            response = self.client.post(reverse('login'), {
+                'email': self.user.email,
+                'password': self.password
+            }, format='json', **headers)
+            self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['auth_token']}")
+            self.client.get(reverse('user_profile'), **headers)
+        return records
+
+    def test_no_records_when_tracing_off(self):
+        from django.test import override_settings
+        self.assertEqual(self.api_records(), [])
+        with override_settings(API_TRACE_HEADER_ENABLED=False):
+            self.assertEqual(self.api_records(HTTP_X_DEBUG_TRACE='1'), [])
+
+    def test_trace_header_enables_request_tracing(self):
+        from django.test import override_settings
+        with override_settings(API_TRACE_HEADER_ENABLED=True):
+            records = self.api_records(HTTP_X_DEBUG_TRACE='1')
+        messages = [record.getMessage() for record in records]
+        self.assertTrue(any(m.startswith('login.ok') for m in messages))
+        self.assertTrue(any(m.startswith('session_user') for m in messages))
+
+
+class RateLimitTestCase(BcryptUserMixin, APITestCase):
+    """Auth endpoints are limited per client IP and per account"""
+
+    def setUp(self):
+        from .ratelimit import get_limiter
+        self.limiter = get_limiter()
+        self.limiter.backend.clear()
+        self.addCleanup(self.limiter.backend.clear)
+
+    def login(self, email, ip):
+        return self.client.post(reverse('login'), {
+            'email': email,
+            'password': 'wrongpassword'
+        }, format='json', REMOTE_ADDR=ip)
+
+    def test_account_limit_blocks_across_ips(self):
+        statuses = [self.login('victim@example.com', f'10.0.0.{i}').status_code for i in range(6)]
+        self.assertNotIn(status.HTTP_429_TOO_MANY_REQUESTS, statuses[:5])
+        self.assertEqual(statuses[5], status.HTTP_429_TOO_MANY_REQUESTS)
+
+        response = self.login('other@example.com', '10.0.0.99')
+        self.assertNotEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_ip_limit_blocks_across_accounts(self):
+        for i in range(10):
+            self.assertNotEqual(self.login(f'user{i}@example.com', '10.0.1.1').status_code, 429)
+        response = self.login('fresh@example.com', '10.0.1.1')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertGreater(self.limiter.stats()['blocked'], 0)
+
+    def test_sqlite_backend_shares_counts_between_limiters(self):
+        import tempfile
+        import os
+        from .ratelimit import SlidingWindowLimiter, SQLiteCounterBackend
+        path = os.path.join(tempfile.mkdtemp(), 'ratelimit.sqlite3')
+        # Two limiters on one file stand in for two worker processes
+        first = SlidingWindowLimiter(SQLiteCounterBackend(path))
+        second = SlidingWindowLimiter(SQLiteCounterBackend(path))
+
+        self.assertTrue(first.hit('login', '1.2.3.4', 2, 60)[0])
+        self.assertTrue(second.hit('login', '1.2.3.4', 2, 60)[0])
+        self.assertFalse(first.hit('login', '1.2.3.4', 2, 60)[0])
+        self.assertTrue(second.hit('login', '5.6.7.8', 2, 60)[0])
+
+    def test_non_object_body_and_cache_backend_check(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from .caches import check_cache_settings
+        response = self.client.post(reverse('login'), [], format='json')
+        self.assertLess(response.status_code, 500)
+
+        # Counters in a per-process cache would allow the limit once per worker
+        with override_settings(RATELIMIT_BACKEND='cache'):
+            with self.assertRaises(ImproperlyConfigured):
+                check_cache_settings()
+        with override_settings(RATELIMIT_BACKEND='sqlite'):
+            check_cache_settings()
+
+    def test_stats_are_staff_only(self):
+        url = reverse('ratelimit_stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        user = self.create_bcrypt_user()
+        self.client.post(reverse('login'), {'email': user.email, 'password': 'testpassword123'}, format='json')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        User.objects.filter(pk=user.pk).update(is_staff=True)
+        stats = self.client.get(url).data
+        self.assertGreaterEqual(stats['decisions'], 2)
+        self.assertIn('avg_latency_ms', stats)
+        self.assertIn('max_latency_ms', stats)
+
+
+class SessionGenerationTestCase(BcryptUserMixin, APITestCase):
+    """Bumping the user's session generation revokes every token at once"""
+
+    def setUp(self):
+        self.user = self.create_bcrypt_user()
+
+    def test_revoke_all_is_single_write_and_rejects_old_tokens(self):
+        from django.test import RequestFactory
+        from rest_framework.exceptions import AuthenticationFailed
+        from .authentication import (
+            JWTAuthentication, create_auth_token, create_token_pair,
+            get_auth_token_user, invalidate_user_sessions, verify_refresh_token
+        )
+        from .models import UserSession
+        auth_token = create_auth_token(self.user)
+        tokens = create_token_pair(self.user)
+        request = RequestFactory().get('/', HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+
+        with self.assertNumQueries(1):
+            user, _ = JWTAuthentication().authenticate(request)
+        self.assertEqual(user, self.user)
+
+        # One update plus re-reading the counter, however many sessions exist
+        with self.assertNumQueries(2):
+            invalidate_user_sessions(self.user)
+        self.assertIsNone(get_auth_token_user(auth_token))
+        with self.assertRaises(AuthenticationFailed):
+            JWTAuthentication().authenticate(request)
+        with self.assertRaises(AuthenticationFailed):
+            verify_refresh_token(tokens['refresh_token'])
+        self.assertEqual(UserSession.objects.filter(user=self.user).count(), 3)
+
+        fresh_token = create_auth_token(self.user)
+        self.assertEqual(get_auth_token_user(fresh_token), self.user)
+
+    def test_reaper_removes_revoked_sessions(self):
+        from .authentication import create_auth_token, get_auth_token_user, invalidate_user_sessions
+        from .models import UserSession
+        from .reaper import reap_expired_credentials
+        create_auth_token(self.user)
+        invalidate_user_sessions(self.user)
+        live = create_auth_token(self.user)
+
+        report = reap_expired_credentials()
+
+        self.assertEqual(report['user_sessions']['deleted'], 1)
+        self.assertEqual(get_auth_token_user(live), self.user)
+        self.assertEqual(UserSession.objects.filter(user=self.user).count(), 1)
+
+
+class ListingQueryCountTestCase(BcryptUserMixin, APITestCase):
+    """Listing endpoints run a fixed number of queries whatever the page size"""
+
+    def setUp(self):
+        self.user = self.create_bcrypt_user()
+        self.client.force_login(self.user)
+        self.owned = Startup.objects.create(
+            owner=self.user, title='Owned', description='Owned startup', field='Technology', type='marketplace'
+        )
+
+    def add_rows(self, count):
+        from .models import Favorite, Interest
+        for _ in range(count):
+            n = Startup.objects.count()
+            owner = self.create_bcrypt_user(username=f'owner{n}', email=f'owner{n}@example.com')
+            for startup_type in ('marketplace', 'collaboration'):
+                startup = Startup.objects.create(
+                    owner=owner, title=f'Startup {n}', description='Description', field='Technology', type=startup_type
+                )
+                StartupTag.objects.create(startup=startup, tag='AI')
+                Favorite.objects.create(user=self.user, startup=startup)
+                Interest.objects.create(user=self.user, startup=startup)
+            Interest.objects.create(user=owner, startup=self.owned)
+
+    def query_counts(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        urls = [
+            reverse('marketplace_list'),
+            reverse('collaboration_list'),
+            reverse('user_favorites'),
+            reverse('user_interests'),
+            reverse('startup_interests', kwargs={'pk': self.owned.id}),
+        ]
+        counts = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(1)
+        # The first request after login stamps the session; keep it out of the counts
+        self.client.get(reverse('marketplace_list'))
+        baseline = self.query_counts()
+        self.add_rows(4)
+        self.assertEqual(self.query_counts(), baseline)
+
+    def test_annotated_stats_match_counts(self):
+        self.add_rows(1)
+        response = self.client.get(reverse('marketplace_list'))
+        owners = {row['owner']['username']: row['owner']['stats'] for row in response.data['results']}
+        self.assertEqual(owners['testuser'], {'startupsCreated': 1, 'applicationsSubmitted': 0, 'collaborations': 0})
+        self.assertEqual(owners['owner1']['startupsCreated'], 2)
+        tags = {row['title']: row['tag'] for row in response.data['results']}
+        self.assertEqual(tags['Startup 1'], 'AI')
+        self.assertEqual(tags['Owned'], 'Fund Raising')
+
+
+class UserActivityStatsTestCase(BcryptUserMixin, APITestCase):
+    """Activity counters follow startup and application writes"""
+
+    def setUp(self):
+        self.owner = self.create_bcrypt_user(username='owner', email='owner@example.com')
+        self.applicant = self.create_bcrypt_user(username='applicant', email='applicant@example.com')
+        self.startup = Startup.objects.create(
+            owner=self.owner, title='Startup', description='Description', field='Technology', type='collaboration'
+        )
+        self.position = Position.objects.create(startup=self.startup, title='Engineer', description='Build things')
+
+    def stats(self, user):
+        from .serializers import UserSerializer
+        user = User.objects.select_related('activity_stats').get(pk=user.pk)
+        with self.assertNumQueries(0):
+            return UserSerializer(user).data['stats']
+
+    def test_counters_follow_writes(self):
+        application = Application.objects.create(
+            startup=self.startup, position=self.position, applicant=self.applicant
+        )
+        self.assertEqual(self.stats(self.owner)['startupsCreated'], 1)
+        self.assertEqual(self.stats(self.applicant), {
+            'startupsCreated': 0, 'applicationsSubmitted': 1, 'collaborations': 0
+        })
+
+        application.status = 'approved'
+        application.save()
+        application.save()
+        self.assertEqual(self.stats(self.applicant)['collaborations'], 1)
+
+        self.startup.delete()
+        self.assertEqual(self.stats(self.owner)['startupsCreated'], 0)
+        self.assertEqual(self.stats(self.applicant), {
+            'startupsCreated': 0, 'applicationsSubmitted': 0, 'collaborations': 0
+        })
+
+    def test_reconcile_repairs_drift(self):
+        from django.core.management import call_command
+        from io import StringIO
+        from .models import UserActivityStats
+        Application.objects.create(startup=self.startup, position=self.position, applicant=self.applicant)
+        # Queryset updates bypass the signals
+        Application.objects.update(status='approved')
+        UserActivityStats.objects.filter(user=self.owner).delete()
+
+        out = StringIO()
+        call_command('reconcile_user_stats', batch_size=1, stdout=out)
+
+        self.assertIn('created 1 counter rows, repaired 1', out.getvalue())
+        self.assertEqual(self.stats(self.owner)['startupsCreated'], 1)
+        self.assertEqual(self.stats(self.applicant)['collaborations'], 1)
+
+    def test_owner_change_moves_the_count(self):
+        startup = Startup.objects.get(pk=self.startup.pk)
+        startup.owner = self.applicant
+        startup.save()
+        startup.save()
+        self.assertEqual(self.stats(self.owner)['startupsCreated'], 0)
+        self.assertEqual(self.stats(self.applicant)['startupsCreated'], 1)
+
+    def test_migration_backfills_existing_users(self):
+        import importlib
+        from django.db import connection
+        from django.db.migrations.loader import MigrationLoader
+        from .models import UserActivityStats
+        UserActivityStats.objects.all().delete()
+        migration = importlib.import_module('api.migrations.0016_backfill_user_activity_stats')
+        state = MigrationLoader(connection).project_state(('api', '0016_backfill_user_activity_stats'))
+        migration.backfill_user_activity_stats(state.apps, None)
+        self.assertEqual(self.stats(self.owner)['startupsCreated'], 1)
+        self.assertEqual(UserActivityStats.objects.count(), User.objects.count())
+
+
+class KeysetPaginationTestCase(BcryptUserMixin, APITestCase):
+    """Listings page through every sort mode by cursor without gaps or repeats"""
+
+    def setUp(self):
+        from django.utils import timezone
+        self.user = self.create_bcrypt_user()
+        same_time = timezone.now()
+        for i in range(7):
+            for startup_type in ('marketplace', 'collaboration'):
+                Startup.objects.create(
+                    owner=self.user, title=f'Startup {i}', description='Description', field='Technology',
+                    type=startup_type, asking_price=f'${i % 3}k', team_size=str(i % 2)
+                )
+        # Ties on created_at must be broken by id
+        Startup.objects.filter(title__in=['Startup 1', 'Startup 2', 'Startup 3']).update(created_at=same_time)
+
+    def walk(self, url, params, backwards=False):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(row['id'] for row in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        if backwards:
+            pages = []
+            while response.data['previous']:
+                response = self.client.get(response.data['previous'])
+                pages.insert(0, [row['id'] for row in response.data['results']])
+            return ids, [row_id for page in pages for row_id in page]
+        return ids
+
+    def test_every_sort_mode_pages_through_all_rows(self):
+        cases = [
+            ('marketplace_list', 'marketplace', {}),
+            ('marketplace_list', 'marketplace', {'sortBy': 'price', 'order': 'asc'}),
+            ('marketplace_list', 'marketplace', {'sortBy': 'price', 'order': 'desc'}),
+            ('collaboration_list', 'collaboration', {'sortBy': 'team', 'order': 'asc'}),
+            ('collaboration_list', 'collaboration', {'order': 'asc'}),
+        ]
+        for name, startup_type, params in cases:
+            with self.subTest(name=name, params=params):
+                ids = self.walk(reverse(name), {**params, 'limit': 3})
+                self.assertEqual(len(ids), 7)
+                self.assertEqual(len(set(ids)), 7)
+                self.assertEqual(set(ids), {
+                    str(pk) for pk in Startup.objects.filter(type=startup_type).values_list('id', flat=True)
+                })
+
+    def test_previous_links_walk_back(self):
+        forward, backward = self.walk(reverse('marketplace_list'), {'limit': 3}, backwards=True)
+        # Walking back from the last page yields everything before it, in order
+        self.assertEqual(backward, forward[:len(backward)])
+        self.assertEqual(len(backward), 6)
+
+    def test_count_is_optional_and_bad_cursor_is_rejected(self):
+        url = reverse('marketplace_list')
+        self.assertNotIn('count', self.client.get(url).data)
+        self.assertEqual(self.client.get(url, {'count': 'true'}).data['count'], 7)
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_tampered_cursor_values_are_rejected(self):
+        import base64
+
+        def encode(cursor):
+            return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode('ascii')
+
+        url = reverse('marketplace_list')
+        next_link = self.client.get(url, {'limit': 3}).data['next']
+        self.assertEqual(self.client.get(next_link).status_code, status.HTTP_200_OK)
+        tampered = [
+            ({}, {'v': ['garbage', 'x']}),
+            ({}, {'v': [{'a': 1}, [1]]}),
+            ({}, {'v': [None, '2025-01-01']}),
+            ({'sortBy': 'price'}, {'v': ['cheap', '2025-01-01T00:00:00+00:00', str(Startup.objects.first().id)]}),
+            ({'sortBy': 'trending'}, {'v': ['hot', '2025-01-01T00:00:00+00:00', 'x'], 'r': 1}),
+        ]
+        for params, cursor in tampered:
+            with self.subTest(params=params, cursor=cursor):
+                response = self.client.get(url, {**params, 'cursor': encode(cursor)})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # An out-of-range number of the right type still makes a valid query
+        cursor = {'v': [2 ** 70, '2025-01-01T00:00:00+00:00', str(Startup.objects.first().id)]}
+        response = self.client.get(url, {'sortBy': 'price', 'cursor': encode(cursor)})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class StartupAmountTestCase(BcryptUserMixin, APITestCase):
+    """Financial strings get numeric shadow columns used for sorting and ranges"""
+
+    def setUp(self):
+        self.user = self.create_bcrypt_user()
+        for title, price, revenue in [
+            ('Price 900', '$900', '$50k'), ('Price 12k', '$12k', '$1.5M'),
+            ('Price 2.5k', '$2,500', ''), ('Unpriced', 'Negotiable', '$5k'), ('Price 1M', '1M USD', '$200k'),
+        ]:
+            Startup.objects.create(
+                owner=self.user, title=title, description='Description', field='Technology',
+                type='marketplace', asking_price=price, revenue=revenue
+            )
+
+    def titles(self, **params):
+        url = reverse('marketplace_list')
+        titles = []
+        response = self.client.get(url, {**params, 'limit': 2})
+        while True:
+            titles.extend(row['title'] for row in response.data['results'])
+            if not response.data['next']:
+                return titles
+            response = self.client.get(response.data['next'])
+
+    def test_parse_money(self):
+        from .money import parse_money
+        self.assertEqual(parse_money('$12k'), (1200000, 'USD'))
+        self.assertEqual(parse_money('PKR 50,000'), (5000000, 'PKR'))
+        self.assertEqual(parse_money('€3,200/mo'), (320000, 'EUR'))
+        self.assertEqual(parse_money('-$1.5M'), (-150000000, 'USD'))
+        self.assertEqual(parse_money('Negotiable'), (None, None))
+        self.assertEqual(parse_money(''), (None, None))
+
+    def test_price_sort_is_numeric_with_unpriced_last(self):
+        self.assertEqual(
+            self.titles(sortBy='price', order='asc'),
+            ['Price 900', 'Price 2.5k', 'Price 12k', 'Price 1M', 'Unpriced']
+        )
+        self.assertEqual(
+            self.titles(sortBy='price', order='desc'),
+            ['Price 1M', 'Price 12k', 'Price 2.5k', 'Price 900', 'Unpriced']
+        )
+
+    def test_range_filters(self):
+        self.assertEqual(
+            set(self.titles(minPrice='1000', maxPrice='$20k')), {'Price 2.5k', 'Price 12k'}
+        )
+        self.assertEqual(
+            set(self.titles(minRevenue='100k')), {'Price 12k', 'Price 1M'}
+        )
+
+    def test_out_of_range_amounts_are_not_amounts(self):
+        from .money import parse_money
+        self.assertEqual(parse_money('$99999999999B'), (None, None))
+        self.assertEqual(parse_money('-$99999999999B'), (None, None))
+        self.assertEqual(parse_money('$92233720368547758.07'), (2 ** 63 - 1, 'USD'))
+        startup = Startup.objects.create(
+            owner=self.user, title='Huge', description='Description', field='Technology',
+            type='marketplace', asking_price='$99999999999B'
+        )
+        self.assertIsNone(startup.asking_price_amount)
+
+    def test_malformed_bounds_are_rejected(self):
+        url = reverse('marketplace_list')
+        for value in ['abc', '99999999999999999999999']:
+            with self.subTest(value=value):
+                response = self.client.get(url, {'minPrice': value})
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('minPrice', response.data)
+        # An empty parameter is no bound
+        self.assertEqual(self.client.get(url, {'maxRevenue': ''}).status_code, status.HTTP_200_OK)
+
+    def test_range_filters_compare_within_one_currency(self):
+        Startup.objects.create(
+            owner=self.user, title='Price PKR 50k', description='Description', field='Technology',
+            type='marketplace', asking_price='PKR 50,000'
+        )
+        self.assertNotIn('Price PKR 50k', self.titles(minPrice='$40k'))
+        self.assertEqual(self.titles(minPrice='PKR 40,000'), ['Price PKR 50k'])
+
+        # Revenue bounds use the revenue's own currency, not the asking price's
+        Startup.objects.create(
+            owner=self.user, title='Mixed Currencies', description='Description', field='Technology',
+            type='marketplace', asking_price='PKR 9,000,000', revenue='$500k'
+        )
+        self.assertIn('Mixed Currencies', self.titles(minRevenue='$400k'))
+        self.assertNotIn('Mixed Currencies', self.titles(minRevenue='PKR 1'))
+
+    def test_update_and_backfill_keep_amounts_current(self):
+        from django.core.management import call_command
+        from io import StringIO
+        startup = Startup.objects.get(title='Unpriced')
+        startup.asking_price = '£7k'
+        startup.save(update_fields=['asking_price'])
+        startup.refresh_from_db()
+        self.assertEqual((startup.asking_price_amount, startup.currency), (700000, 'GBP'))
+
+        Startup.objects.update(asking_price_amount=None)
+        call_command('backfill_startup_amounts', batch_size=2, stdout=StringIO())
+        self.assertFalse(Startup.objects.exclude(title='Unpriced').filter(asking_price_amount=None).exists())
+        self.assertEqual(Startup.objects.get(title='Price 900').asking_price_amount, 90000)
+
+
+class ListingIndexTestCase(TestCase):
+    """The canonical listing queries are answered from indexes"""
+
+    def test_explain_listing_queries_finds_no_full_scans(self):
+        from django.core.management import call_command
+        from io import StringIO
+        out = StringIO()
+        call_command('explain_listing_queries', strict=True, stdout=out)
+        self.assertIn('ok         marketplace\n', out.getvalue())
+        self.assertIn('ok         collaborations phase\n', out.getvalue())
+
+
+# Tests run in one process, so the per-process cache stands in for a shared one
+@override_settings(LISTING_CACHE_ENABLED=True)
+class ListingResponseCacheTestCase(BcryptUserMixin, APITestCase):
+    """Anonymous listing responses are cached until a listed model changes"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = self.create_bcrypt_user()
+        self.startup = Startup.objects.create(
+            owner=self.user, title='Cached Startup', description='Description', field='Technology', type='marketplace'
+        )
+        self.url = reverse('marketplace_list')
+
+    def test_hit_until_write_bumps_version(self):
+        from .response_cache import response_cache_stats
+        hits_before = response_cache_stats.snapshot().get('marketplace', {}).get('hits', 0)
+        self.assertEqual(self.client.get(self.url, {'order': 'desc', 'limit': 5})['X-Cache'], 'MISS')
+        # Parameter order does not matter
+        with self.assertNumQueries(0):
+            response = self.client.get(f'{self.url}?limit=5&order=desc')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response_cache_stats.snapshot()['marketplace']['hits'], hits_before + 1)
+
+        # View-count updates are not rendered in listings and keep the cache
+        self.startup.views += 1
+        self.startup.save(update_fields=['views'])
+        self.assertEqual(self.client.get(self.url, {'order': 'desc', 'limit': 5})['X-Cache'], 'HIT')
+
+        StartupTag.objects.create(startup=self.startup, tag='Retail')
+        response = self.client.get(self.url, {'order': 'desc', 'limit': 5})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['tag'], 'Retail')
+
+    def test_stats_are_staff_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        url = reverse('cache_stats')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        User.objects.filter(pk=self.user.pk).update(is_staff=True)
+        stats = self.client.get(url).data
+        self.assertTrue(stats['enabled'])
+        self.assertGreaterEqual(stats['views']['marketplace']['hits'], 1)
+        self.assertGreaterEqual(stats['views']['marketplace']['misses'], 1)
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.get(self.url)
+        self.client.force_login(self.user)
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Cache', response)
+
+    def test_owner_changes_bump_version(self):
+        from django.core.exceptions import ImproperlyConfigured
+        from .caches import check_cache_settings
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+        # Another listing by the same owner changes the owner's embedded counters
+        Startup.objects.create(
+            owner=self.user, title='Second', description='Description', field='Technology', type='collaboration'
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['owner']['stats']['startupsCreated'], 2)
+
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).data['results'][0]['owner']['username'], 'renamed')
+        self.user.save(update_fields=['last_login'])
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+        # Versions in a per-process cache would only be bumped in one worker
+        with self.assertRaises(ImproperlyConfigured):
+            check_cache_settings()
+
+
+class ConditionalGetTestCase(BcryptUserMixin, APITestCase):
+    """Unchanged startups, positions and listings are answered with 304"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.user = self.create_bcrypt_user()
+        self.startup = Startup.objects.create(
+            owner=self.user, title='Conditional Startup', description='Description', field='Technology'
+        )
+        self.position = Position.objects.create(startup=self.startup, title='Engineer', description='Build')
+
+    def test_detail_revalidates_without_serializing(self):
+        url = reverse('startup_detail', kwargs={'pk': self.startup.id})
+        etag = self.client.get(url)['ETag']
+
+        # One aggregate for the validators; the view is counted in memory
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        from .view_counter import view_counter
+        view_counter.flush()
+        self.startup.refresh_from_db()
+        self.assertEqual(self.startup.views, 2)
+
+        self.position.title = 'Senior Engineer'
+        self.position.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_positions_and_listings_revalidate(self):
+        positions_url = reverse('startup_positions', kwargs={'pk': self.startup.id})
+        etag = self.client.get(positions_url)['ETag']
+        for url in [
+            reverse('startup_positions', kwargs={'pk': self.startup.id}),
+            reverse('all_positions'),
+        ]:
+            with self.subTest(url=url):
+                first = self.client.get(url)
+                self.assertEqual(first.status_code, status.HTTP_200_OK)
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertNotIn('Last-Modified', first)
+
+        Position.objects.create(startup=self.startup, title='Designer', description='Design')
+        response = self.client.get(positions_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def use_shared_cache(self):
+        from django.core.management import call_command
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'api_cache'}}
+        override = override_settings(CACHES=shared)
+        override.enable()
+        self.addCleanup(override.disable)
+        call_command('createcachetable', verbosity=0)
+
+    def test_listing_etags_follow_cache_versions(self):
+        # Per-process versions would miss writes made by other workers
+        self.assertFalse(self.client.get(reverse('marketplace_list')).has_header('ETag'))
+
+        self.use_shared_cache()
+        other = Startup.objects.create(
+            owner=self.user, title='Older Startup', description='Description', field='Technology'
+        )
+        Startup.objects.create(
+            owner=self.user, title='Team Startup', type='collaboration', description='Description', field='Technology'
+        )
+        url = reverse('marketplace_list')
+        for listing in [url, reverse('collaboration_list')]:
+            with self.subTest(url=listing):
+                first = self.client.get(listing, {'limit': 1})
+                self.assertEqual(first.status_code, status.HTTP_200_OK)
+                # Only the versions are read: no aggregate over the listing
+                with self.assertNumQueries(1):
+                    response = self.client.get(listing, {'limit': 1}, HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Leaving the listing moves the startup version, whatever the timestamps
+        etag = self.client.get(url)['ETag']
+        other.status = 'inactive'
+        other.save(update_fields=['status'])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_changes_when_tags_change(self):
+        detail_url = reverse('startup_detail', kwargs={'pk': self.startup.id})
+        tag = StartupTag.objects.create(startup=self.startup, tag='Retail')
+        etag = self.client.get(detail_url)['ETag']
+        # Same number of tags, different tag
+        tag.delete()
+        StartupTag.objects.create(startup=self.startup, tag='Fintech')
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_missing_startup_is_not_found_even_for_any_etag(self):
+        from .view_counter import view_counter
+        missing = uuid.uuid4()
+        for name in ['startup_detail', 'startup_positions']:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name, kwargs={'pk': missing}), HTTP_IF_NONE_MATCH='*')
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(view_counter.pending(missing), 0)
+
+
+class ViewCounterTestCase(BcryptUserMixin, APITestCase):
+    """Startup views are buffered and written in batched updates"""
+
+    def setUp(self):
+        from .view_counter import ViewCounter
+        self.counter = ViewCounter()
+        self.user = self.create_bcrypt_user()
+        self.startups = [
+            Startup.objects.create(owner=self.user, title=f'Viewed {i}', description='Description', field='Technology')
+            for i in range(3)
+        ]
+
+    def test_flush_writes_buffered_counts_in_batches(self):
+        from django.test import override_settings
+        with override_settings(VIEW_COUNT_FLUSH_INTERVAL=3600), self.assertNumQueries(0):
+            for startup in self.startups:
+                self.counter.record(startup.pk)
+            self.counter.record(self.startups[0].pk, 4)
+        self.assertEqual(self.counter.pending(self.startups[0].pk), 5)
+
+        # Startups with equal counts share one UPDATE
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 3)
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('UPDATE')]), 2)
+        views = dict(Startup.objects.values_list('title', 'views'))
+        self.assertEqual(views, {'Viewed 0': 5, 'Viewed 1': 1, 'Viewed 2': 1})
+        self.assertEqual(self.counter.pending(self.startups[0].pk), 0)
+
+    def test_failed_flush_keeps_counts(self):
+        from unittest import mock
+        from django.db import DatabaseError
+        from django.db.models.query import QuerySet
+        self.counter.record(self.startups[0].pk, 2)
+        with mock.patch.object(QuerySet, 'update', side_effect=DatabaseError), self.assertLogs('api.view_counter'):
+            self.assertEqual(self.counter.flush(), 0)
+        self.assertEqual(self.counter.pending(self.startups[0].pk), 2)
+        self.counter.flush()
+        self.assertEqual(Startup.objects.get(pk=self.startups[0].pk).views, 2)
+
+
+class StartupDetailQueryTestCase(BcryptUserMixin, APITestCase):
+    """The startup detail endpoint runs a fixed number of queries"""
+
+    def setUp(self):
+        self.user = self.create_bcrypt_user()
+        self.startup = Startup.objects.create(
+            owner=self.user, title='Detailed Startup', description='Description', field='Technology'
+        )
+        StartupTag.objects.create(startup=self.startup, tag='AI')
+        self.url = reverse('startup_detail', kwargs={'pk': self.startup.id})
+        # Write out views buffered by earlier tests so no flush lands mid-test
+        from .view_counter import view_counter
+        view_counter.flush()
+
+    def add_positions(self, count):
+        for i in range(count):
+            position = Position.objects.create(startup=self.startup, title=f'Role {i}', description='Work')
+            applicant = self.create_bcrypt_user(
+                username=f'applicant{position.pk.hex[:8]}', email=f'{position.pk.hex[:8]}@example.com'
+            )
+            Application.objects.create(startup=self.startup, position=position, applicant=applicant)
+
+    def test_query_count_is_fixed_and_views_are_returned(self):
+        self.add_positions(1)
+        # Validators, startup with owner and counters, tags, positions
+        with self.assertNumQueries(4):
+            first = self.client.get(self.url)
+        self.add_positions(4)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.data['views'], first.data['views'] + 1)
+        self.assertEqual(len(response.data['positions']), 5)
+        self.assertTrue(all(p['applications_count'] == 1 for p in response.data['positions']))
+        self.assertEqual(response.data['tags'], ['AI'])
+        self.assertEqual(response.data['owner']['stats']['startupsCreated'], 1)
+
+
+class TrendingRankingTestCase(BcryptUserMixin, APITestCase):
+    """Trending ranking table, its incremental refresh and the featured carousel"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.owner = self.create_bcrypt_user()
+        self.investor = self.create_bcrypt_user(username='investor', email='investor@example.com')
+        self.quiet, self.viewed, self.loved = [
+            Startup.objects.create(
+                owner=self.owner, title=title, description='Description', field='Technology', type='marketplace'
+            )
+            for title in ('Quiet', 'Viewed', 'Loved')
+        ]
+        Startup.objects.filter(pk=self.viewed.pk).update(views=3)
+        Favorite.objects.create(user=self.investor, startup=self.loved)
+        Interest.objects.create(user=self.investor, startup=self.loved)
+
+    def test_marketplace_sorts_by_trending_score(self):
+        from .trending import refresh_trending
+        self.assertEqual(refresh_trending(), 3)
+
+        response = self.client.get(reverse('marketplace_list'), {'sortBy': 'trending'})
+        self.assertEqual(
+            [row['title'] for row in response.data['results']], ['Loved', 'Viewed', 'Quiet']
+        )
+        # Keyset cursors seek on the score like any other column
+        response = self.client.get(reverse('marketplace_list'), {'sortBy': 'trending', 'limit': 1})
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['title'] for row in response.data['results']], ['Viewed'])
+
+    def test_refresh_only_rescores_startups_with_new_activity(self):
+        from .trending import refresh_trending
+        refresh_trending()
+        self.assertEqual(refresh_trending(), 0)
+
+        Favorite.objects.create(user=self.owner, startup=self.quiet)
+        Startup.objects.filter(pk=self.viewed.pk).update(views=F('views') + 1)
+        self.assertEqual(refresh_trending(), 2)
+        self.assertEqual(StartupTrendingScore.objects.get(pk=self.quiet.pk).favorites, 1)
+
+        Favorite.objects.filter(startup=self.quiet).delete()
+        self.assertEqual(refresh_trending(), 1)
+        self.assertIsNone(StartupTrendingScore.objects.get(pk=self.quiet.pk).score)
+
+    def test_featured_carousel_puts_featured_startups_first(self):
+        from .trending import refresh_trending
+        refresh_trending()
+        Startup.objects.filter(pk=self.quiet.pk).update(featured=True)
+
+        response = self.client.get(reverse('featured_startups'))
+        self.assertEqual([row['title'] for row in response.data], ['Quiet', 'Loved', 'Viewed'])
+
+
+@override_settings(LISTING_CACHE_ENABLED=True)
+class StartupFacetsTestCase(BcryptUserMixin, APITestCase):
+    """Facet counts come from one grouped query and are cached per filter set"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.owner = self.create_bcrypt_user()
+        for category, phase in (('saas', 'MVP'), ('saas', 'Launched'), ('ecommerce', 'MVP')):
+            Startup.objects.create(
+                owner=self.owner, title=f'{category} {phase}', description='Description',
+                field='Technology', type='collaboration', category=category, phase=phase
+            )
+        self.url = reverse('startup_facets')
+
+    @staticmethod
+    def counts(data, facet):
+        return {item['value']: item['count'] for item in data['facets'][facet]}
+
+    def test_each_facet_ignores_its_own_filter(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'category': 'saas'})
+        self.assertEqual(response.data['total'], 2)
+        # The category panel still shows the other categories
+        self.assertEqual(self.counts(response.data, 'category'), {'saas': 2, 'ecommerce': 1})
+        self.assertEqual(self.counts(response.data, 'phase'), {'MVP': 1, 'Launched': 1})
+        self.assertEqual(self.counts(response.data, 'type'), {'collaboration': 2})
+
+    def test_counts_are_cached_until_a_startup_changes(self):
+        self.client.get(self.url, {'phase': 'MVP', 'sortBy': 'date'})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'phase': 'MVP'})
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        Startup.objects.create(
+            owner=self.owner, title='Another', description='Description',
+            field='Technology', type='collaboration', category='fintech', phase='MVP'
+        )
+        response = self.client.get(self.url, {'phase': 'MVP'})
+        self.assertEqual(response.data['total'], 3)
+
+
+class StartupBulkImportExportTestCase(BcryptUserMixin, APITestCase):
+    """import_startups / export_startups commands"""
+
+    def setUp(self):
+        import tempfile
+        self.owner = self.create_bcrypt_user()
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def write_file(self, name, lines):
+        import os
+        path = os.path.join(self.tempdir.name, name)
+        with open(path, 'w', encoding='utf-8') as stream:
+            stream.write('\n'.join(lines) + '\n')
+        return path
+
+    def test_import_validates_and_writes_in_batches(self):
+        from io import StringIO
+        from django.core.management import call_command
+        valid = {
+            'title': 'Imported Startup', 'description': 'A startup loaded from a partner feed',
+            'field': 'Technology', 'asking_price': '$12k', 'tags': ['AI', 'AI', 'SaaS'],
+            'positions': [{'title': 'Engineer', 'description': 'Build it'}],
+        }
+        path = self.write_file('feed.jsonl', [
+            json.dumps(valid),
+            json.dumps({**valid, 'title': 'Second Import', 'owner': self.owner.username, 'tags': []}),
+            json.dumps({'title': 'Bad'}),
+            'not json',
+        ])
+        stderr = StringIO()
+        # One owner lookup, then one transaction (a savepoint here) inserting
+        # startups, tags and positions and updating the owner's counters
+        with self.assertNumQueries(7):
+            call_command(
+                'import_startups', path, owner=self.owner.email, batch_size=10,
+                stdout=StringIO(), stderr=stderr
+            )
+
+        self.assertIn('Line 3:', stderr.getvalue())
+        self.assertIn('Line 4: invalid JSON', stderr.getvalue())
+        startup = Startup.objects.get(title='Imported Startup')
+        self.assertEqual(startup.asking_price_amount, 1_200_000)
+        self.assertEqual(sorted(startup.tags.values_list('tag', flat=True)), ['AI', 'SaaS'])
+        self.assertEqual(startup.positions.get().title, 'Engineer')
+        self.assertEqual(
+            list(Startup.objects.get(title='Second Import').tags.values_list('tag', flat=True)), ['Fund Raising']
+        )
+        self.owner.activity_stats.refresh_from_db()
+        self.assertEqual(self.owner.activity_stats.startups_created, 2)
+
+    def test_only_the_first_errors_are_kept(self):
+        from .bulk import StartupImporter, read_records
+        lines = ['not json'] * 50
+        importer = StartupImporter(default_owner=self.owner.email, max_errors=3)
+        report = importer.run(read_records(lines, 'jsonl'))
+        self.assertEqual(report['errors'], 50)
+        self.assertEqual([line for line, _ in importer.errors], [1, 2, 3])
+
+    def test_malformed_status_is_a_line_error(self):
+        from .bulk import StartupImporter, read_records
+        record = {'title': 'Odd Status', 'description': 'Status is not a string', 'field': 'Technology'}
+        lines = [json.dumps({**record, 'status': ['active']}), json.dumps({**record, 'status': {'a': 1}}), json.dumps(record)]
+        importer = StartupImporter(default_owner=self.owner.email)
+        report = importer.run(read_records(lines, 'jsonl'))
+        self.assertEqual((report['errors'], report['created']), (2, 1))
+        self.assertEqual([line for line, _ in importer.errors], [1, 2])
+
+    def test_csv_export_round_trips_through_import(self):
+        from io import StringIO
+        from django.core.management import call_command
+        startup = Startup.objects.create(
+            owner=self.owner, title='Exported Startup', description='A startup that goes to analytics',
+            field='Technology', stages=['Idea', 'MVP'], type='collaboration'
+        )
+        StartupTag.objects.create(startup=startup, tag='Remote')
+        Position.objects.create(startup=startup, title='Designer', description='Design it')
+        path = self.write_file('export.csv', [])
+
+        call_command('export_startups', path, chunk_size=1, stdout=StringIO())
+        call_command('import_startups', path, stdout=StringIO(), stderr=StringIO())
+
+        copy = Startup.objects.exclude(pk=startup.pk).get()
+        self.assertEqual((copy.title, copy.stages, copy.type), ('Exported Startup', ['Idea', 'MVP'], 'collaboration'))
+        self.assertEqual(list(copy.tags.values_list('tag', flat=True)), ['Remote'])
+        self.assertEqual(copy.positions.get().title, 'Designer')
+
+
+class StreamingExportTestCase(BcryptUserMixin, APITestCase):
+    """JSON-lines/CSV downloads are streamed from a chunked iterator"""
+
+    def setUp(self):
+        self.owner = self.create_bcrypt_user()
+        self.applicant = self.create_bcrypt_user(username='applicant', email='applicant@example.com')
+        self.startups = [
+            Startup.objects.create(
+                owner=self.owner, title=f'Listing {i}', description='Description',
+                field='Technology', category='saas' if i % 2 else 'agency'
+            )
+            for i in range(5)
+        ]
+
+    @staticmethod
+    def content(response):
+        return b''.join(response.streaming_content).decode()
+
+    @override_settings(STREAMING_EXPORT_CHUNK_SIZE=2)
+    def test_marketplace_export_streams_filtered_rows(self):
+        url = reverse('marketplace_export')
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        # The rows, then owners (with counters) and tags once per chunk of two
+        with self.assertNumQueries(1 + 3 * 2):
+            rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(len(rows), 5)
+
+        response = self.client.get(url, {'category': 'saas'})
+        rows = [json.loads(line) for line in self.content(response).splitlines()]
+        self.assertEqual(sorted(row['title'] for row in rows), ['Listing 1', 'Listing 3'])
+
+        response = self.client.get(url, {'output': 'csv'})
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="marketplace.csv"')
+        lines = self.content(response).splitlines()
+        self.assertIn('owner.username', lines[0].split(','))
+        self.assertEqual(len(lines), 6)
+
+        self.assertEqual(self.client.get(url, {'output': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_application_export_is_owner_only(self):
+        startup = self.startups[0]
+        position = Position.objects.create(startup=startup, title='Engineer', description='Build it')
+        Application.objects.create(startup=startup, position=position, applicant=self.applicant)
+        url = reverse('startup_applications_export', kwargs={'pk': startup.id})
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.post(reverse('login'), {'email': self.applicant.email, 'password': 'testpassword123'}, format='json')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        missing = reverse('startup_applications_export', kwargs={'pk': uuid.uuid4()})
+        self.assertEqual(self.client.get(missing).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.post(reverse('login'), {'email': self.owner.email, 'password': 'testpassword123'}, format='json')
+        rows = [json.loads(line) for line in self.content(self.client.get(url)).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['position']['applications_count'], 1)
+        self.assertEqual(rows[0]['applicant']['username'], 'applicant')
+
+
+class SparseFieldsetTestCase(BcryptUserMixin, APITestCase):
+    """?fields= / ?exclude= trim list responses and the queries behind them"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.owner = self.create_bcrypt_user()
+        self.startup = Startup.objects.create(
+            owner=self.owner, title='Sparse Startup', description='A long description ' * 50,
+            field='Technology'
+        )
+        StartupTag.objects.create(startup=self.startup, tag='AI')
+        Position.objects.create(startup=self.startup, title='Engineer', description='Build it', requirements='Python')
+
+    def test_fields_trim_the_response_and_the_query(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        # Only the page; the owner and tag prefetches are skipped
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('marketplace_list'), {'fields': 'id,name'})
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(response.data['results'], [{'id': str(self.startup.id), 'name': 'Sparse Startup'}])
+        self.assertNotIn('"description"', queries[-1]['sql'])
+
+        response = self.client.get(reverse('featured_startups'), {'exclude': 'description,owner'})
+        self.assertNotIn('owner', response.data[0])
+        self.assertEqual(response.data[0]['tag'], 'AI')
+
+    def test_exclude_on_positions_and_unknown_fields(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('all_positions'), {'exclude': 'description,requirements,startup'})
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'id', 'title', 'is_active', 'applications_count', 'created_at'})
+        self.assertFalse(any('"requirements"' in query['sql'] for query in queries))
+
+        response = self.client.get(reverse('marketplace_list'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(LISTING_CACHE_ENABLED=False)
+class FastReadSerializerTestCase(BcryptUserMixin, APITestCase):
+    """The .values() read serializers and the orjson renderer match the DRF output byte for byte"""
+
+    def setUp(self):
+        from .models import Notification, UserActivityStats
+        self.owner = self.create_bcrypt_user()
+        self.other = self.create_bcrypt_user(username='other', email='other@example.com')
+        for i, (owner, startup_type) in enumerate([
+            (self.owner, 'marketplace'), (self.other, 'marketplace'), (self.owner, 'collaboration'),
+        ]):
+            startup = Startup.objects.create(
+                owner=owner, title=f'Startup {i} é\u2028', description='Line one\nline "two" \u2029',
+                field='Technology', type=startup_type, asking_price=f'${i}0k', phase='MVP'
+            )
+            if i:
+                StartupTag.objects.create(startup=startup, tag=f'Tag {i}')
+            position = Position.objects.create(startup=startup, title=f'Role {i}', description='Work')
+            Application.objects.create(startup=startup, position=position, applicant=self.other)
+        Notification.objects.create(
+            user=self.owner, type='general', title='Hello', data={'nested': [1, 2.5, None, True], 'text': '\u2028'}
+        )
+        # An owner without a counter row falls back to counting
+        UserActivityStats.objects.filter(user=self.other).delete()
+
+    def assert_same_output(self, url, params=None):
+        from rest_framework.renderers import JSONRenderer
+        with self.settings(FAST_READ_SERIALIZERS=False):
+            slow = self.client.get(url, params)
+        fast = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, JSONRenderer().render(slow.data))
+
+    def test_list_endpoints_render_identically(self):
+        self.assert_same_output(reverse('marketplace_list'))
+        self.assert_same_output(reverse('marketplace_list'), {'sortBy': 'price', 'limit': 1})
+        self.assert_same_output(reverse('marketplace_list'), {'fields': 'id,tag,owner'})
+        self.assert_same_output(reverse('collaboration_list'), {'sortBy': 'team'})
+        self.assert_same_output(reverse('all_positions'))
+        self.assert_same_output(reverse('all_positions'), {'exclude': 'startup'})
+
+        self.client.post(reverse('login'), {'email': self.owner.email, 'password': 'testpassword123'}, format='json')
+        self.assert_same_output(reverse('notifications_list'))
+
+    def test_listing_page_query_count(self):
+        # The page, first tags and owners with counters, plus the two
+        # counting queries for the owner without counters
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('marketplace_list'))
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        import datetime
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from .renderers import ORJSONRenderer
+        data = {
+            'uuid': uuid.uuid4(),
+            'when': datetime.datetime(2025, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2025, 1, 2),
+            'text': 'quote " backslash \\ control \x01 separators \u2028\u2029 é',
+            'lazy': gettext_lazy('Not found.'),
+            'numbers': (1, -2, 0.5, 2 ** 63 - 1),
+            'empty': [],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        # orjson cannot encode these; the stock encoder handles them
+        self.assertEqual(ORJSONRenderer().render({1: 2 ** 70}), JSONRenderer().render({1: 2 ** 70}))
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+@override_settings(LISTING_CACHE_ENABLED=False, COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTestCase(BcryptUserMixin, APITestCase):
+    """Large JSON and streamed downloads are compressed for clients that accept it"""
+
+    def setUp(self):
+        self.owner = self.create_bcrypt_user()
+        for i in range(20):
+            Startup.objects.create(
+                owner=self.owner, title=f'Listing {i}', description='Description ' * 10, field='Technology'
+            )
+
+    def test_large_json_is_gzipped_small_and_media_are_not(self):
+        import gzip
+        url = reverse('marketplace_list')
+        plain = self.client.get(url)
+        self.assertNotIn('Content-Encoding', plain)
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+        # gzip;q=0 refuses it; one small listing stays under the threshold
+        self.assertNotIn('Content-Encoding', self.client.get(url, HTTP_ACCEPT_ENCODING='gzip;q=0, identity'))
+        small = self.client.get(url, {'limit': 1}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+        from django.http import HttpResponse
+        from .compression import CompressionMiddleware
+        middleware = CompressionMiddleware(lambda request: HttpResponse(b'x' * 4096, content_type='text/plain'))
+        request = self.client.get(url).wsgi_request
+        request.META['HTTP_ACCEPT_ENCODING'] = 'gzip'
+        self.assertEqual(middleware(request)['Content-Encoding'], 'gzip')
+        request.path = '/media/documents/pitch.txt'
+        self.assertNotIn('Content-Encoding', middleware(request))
+
+    @override_settings(COMPRESSION_MIN_SIZE=0)
+    def test_responses_with_credentials_are_not_compressed(self):
+        import gzip
+        from .compression import GzipEncoder
+        response = self.client.post(reverse('login'), {
+            'email': self.owner.email, 'password': 'testpassword123'
+        }, format='json', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Content-Encoding', response)
+
+        # Everything else gzipped carries a random-length file name (BREACH padding)
+        body = b'{"startups": []}' * 100
+        compressed = [GzipEncoder().compress(body) for _ in range(20)]
+        self.assertTrue(all(data[3] & 0x08 for data in compressed))
+        self.assertGreater(len({len(data) for data in compressed}), 1)
+        self.assertEqual(gzip.decompress(compressed[0]), body)
+
+    def test_brotli_is_preferred_and_streams_are_compressed(self):
+        import gzip
+        from . import compression
+        url = reverse('marketplace_export')
+        plain = b''.join(self.client.get(url).streaming_content)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+        self.assertEqual(compression.negotiate('br;q=0.5, gzip', [compression.GzipEncoder()]).name, 'gzip')
+        self.assertIsNone(compression.negotiate('deflate, *;q=0', [compression.GzipEncoder()]))
+        if compression.brotli is None:
+            return
+        encoders = compression.available_encoders()
+        self.assertEqual(compression.negotiate('gzip, br', encoders).name, 'br')
+        self.assertEqual(compression.negotiate('gzip, br;q=0.5', encoders).name, 'gzip')
+        plain = self.client.get(reverse('marketplace_list')).content
+        response = self.client.get(reverse('marketplace_list'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.content), plain)
@@ -0,0 +1,102 @@
+import math
+from collections import Counter, defaultdict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from .models import Favorite, Interest, Startup, StartupTrendingScore
+from .response_cache import bump_version
+from .tracing import get_tracer
+
+trace = get_tracer('api.trending')
+
+# Scores are measured against a fixed instant. Every contribution decays at the
+# same rate, so relative order never changes with the clock and a startup only
+# needs rescoring when it gets new activity.
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def event_score(weight, when):
+	"""log2 of `weight` worth of engagement at `when`, or None for no weight"""
+	if weight <= 0:
+		return None
+	half_lives = (when - EPOCH).total_seconds() / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+	return math.log2(weight) + half_lives
+
+
+def log_sum(*scores):
+	"""log2(2**a + 2**b + ...) without overflow; None entries count as zero"""
+	scores = [score for score in scores if score is not None]
+	if not scores:
+		return None
+	top = max(scores)
+	return top + math.log2(sum(2 ** (score - top) for score in scores))
+
+
+def stale_startup_ids(full=False):
+	"""Startups with no ranking row, new favorites/interests or new views"""
+	queryset = Startup.objects.all()
+	if not full:
+		queryset = queryset.filter(
+			Q(trending__isnull=True) | Q(trending__dirty=True) | ~Q(views=F('trending__views_seen'))
+		)
+	return list(queryset.order_by('pk').values_list('pk', flat=True))
+
+
+def refresh_batch(startup_ids, now):
+	"""Recompute the ranking rows of a batch of startups"""
+	weights = settings.TRENDING_WEIGHTS
+	with transaction.atomic():
+		# Clear the flag before reading, so activity during the refresh marks the row again
+		StartupTrendingScore.objects.filter(startup_id__in=startup_ids, dirty=True).update(dirty=False)
+		existing = StartupTrendingScore.objects.in_bulk(startup_ids)
+
+		engagement = defaultdict(list)
+		counts = defaultdict(Counter)
+		for model, kind in ((Favorite, 'favorites'), (Interest, 'interests')):
+			for startup_id, created_at in model.objects.filter(startup_id__in=startup_ids).values_list('startup_id', 'created_at'):
+				engagement[startup_id].append(event_score(weights[kind], created_at))
+				counts[startup_id][kind] += 1
+
+		rows = []
+		for startup in Startup.objects.filter(pk__in=startup_ids).only('pk', 'views', 'created_at'):
+			row = existing.get(startup.pk)
+			if row is None:
+				# Views from before the first refresh are dated to the listing's creation
+				view_score = event_score(weights['views'] * startup.views, startup.created_at)
+			else:
+				# Views are only counted in total, so new ones are dated to this refresh
+				new_views = startup.views - row.views_seen
+				view_score = log_sum(row.view_score, event_score(weights['views'] * new_views, now))
+			rows.append(StartupTrendingScore(
+				startup=startup,
+				score=log_sum(view_score, *engagement[startup.pk]),
+				view_score=view_score,
+				views_seen=startup.views,
+				favorites=counts[startup.pk]['favorites'],
+				interests=counts[startup.pk]['interests'],
+			))
+		StartupTrendingScore.objects.bulk_create(
+			rows,
+			update_conflicts=True,
+			unique_fields=['startup'],
+			update_fields=['score', 'view_score', 'views_seen', 'favorites', 'interests', 'refreshed_at'],
+		)
+	return len(rows)
+
+
+def refresh_trending(full=False, batch_size=500, now=None):
+	"""Bring the ranking table up to date; returns the number of startups rescored.
+
+	Only startups with activity since the last run are read, unless `full`.
+	"""
+	now = now or timezone.now()
+	startup_ids = stale_startup_ids(full)
+	refreshed = 0
+	for start in range(0, len(startup_ids), batch_size):
+		refreshed += refresh_batch(startup_ids[start:start + batch_size], now)
+	if refreshed:
+		bump_version('trending')
+	trace("trending.refresh startups=%d full=%s", refreshed, full)
+	return refreshed
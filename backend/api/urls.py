@@ -22,13 +22,17 @@ urlpatterns = [
 	path('api/startups', views.StartupCreateView.as_view(), name='startup_create'),
 	path('api/startups/<uuid:pk>', views.StartupDetailView.as_view(), name='startup_detail'),
 	path('api/marketplace', views.MarketplaceListView.as_view(), name='marketplace_list'),
+	path('api/marketplace/export', views.MarketplaceExportView.as_view(), name='marketplace_export'),
 	path('api/collaborations', views.CollaborationListView.as_view(), name='collaboration_list'),
+	path('api/featured', views.FeaturedStartupsView.as_view(), name='featured_startups'),
+	path('api/facets', views.StartupFacetsView.as_view(), name='startup_facets'),
 	
 	# Collaboration endpoints
 	path('api/collaborations/<uuid:pk>/apply', views.ApplyForCollaborationView.as_view(), name='apply_collaboration'),
 	path('api/users/applications', views.UserApplicationsView.as_view(), name='user_applications'),
 	# Entrepreneur application management
 	path('api/startups/<uuid:pk>/applications', views.StartupApplicationsView.as_view(), name='startup_applications'),
+	path('api/startups/<uuid:pk>/applications/export', views.StartupApplicationsExportView.as_view(), name='startup_applications_export'),
 	path('api/applications/<uuid:pk>/approve', views.ApproveApplicationView.as_view(), name='approve_application'),
 	path('api/applications/<uuid:pk>/decline', views.DeclineApplicationView.as_view(), name='decline_application'),
 
@@ -56,6 +60,9 @@ urlpatterns = [
 	
 	# Statistics endpoints
 	path('api/stats', views.platform_stats, name='platform_stats'),
+	path('api/stats/ratelimit', views.ratelimit_stats, name='ratelimit_stats'),
+	path('api/stats/passwords', views.password_stats, name='password_stats'),
+	path('api/stats/cache', views.cache_stats, name='cache_stats'),
 	
 	# Search endpoints
 	path('api/search', views.SearchView.as_view(), name='search'),
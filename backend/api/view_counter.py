@@ -0,0 +1,84 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import F
+
+logger = logging.getLogger('api.view_counter')
+
+
+class ViewCounter:
+	"""Write-behind counter for Startup.views.
+
+	Views are added up in memory and written as batched
+	``UPDATE ... SET views = views + n`` statements, at most once per
+	VIEW_COUNT_FLUSH_INTERVAL seconds (piggybacked on the request that crosses
+	the interval) or as soon as VIEW_COUNT_MAX_PENDING startups are waiting.
+	Whatever is still pending is flushed when the process exits normally, and
+	counts from a failed flush are kept for the next one.
+	"""
+	batch_size = 500
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._flush_lock = threading.Lock()
+		self._pending = defaultdict(int)
+		self._last_flush = time.monotonic()
+
+	def record(self, startup_id, count=1):
+		"""Count views of a startup; returns the views not yet written for it"""
+		with self._lock:
+			self._pending[startup_id] += count
+			pending = self._pending[startup_id]
+			due = (
+				time.monotonic() - self._last_flush >= settings.VIEW_COUNT_FLUSH_INTERVAL
+				or len(self._pending) >= settings.VIEW_COUNT_MAX_PENDING
+			)
+		if due:
+			self.flush()
+		return pending
+
+	def pending(self, startup_id):
+		"""Views of a startup that are buffered but not yet written"""
+		with self._lock:
+			return self._pending.get(startup_id, 0)
+
+	def flush(self):
+		"""Write all buffered counts; returns the number of startups updated"""
+		from .models import Startup
+		# Only one flush at a time; a concurrent caller just skips
+		if not self._flush_lock.acquire(blocking=False):
+			return 0
+		try:
+			with self._lock:
+				pending, self._pending = self._pending, defaultdict(int)
+				self._last_flush = time.monotonic()
+			if not pending:
+				return 0
+			# Startups with the same count share one UPDATE
+			by_count = defaultdict(list)
+			for startup_id, count in pending.items():
+				by_count[count].append(startup_id)
+			try:
+				with transaction.atomic():
+					for count, startup_ids in by_count.items():
+						for start in range(0, len(startup_ids), self.batch_size):
+							Startup.objects.filter(pk__in=startup_ids[start:start + self.batch_size]).update(
+								views=F('views') + count
+							)
+			except DatabaseError:
+				logger.exception("view_counter.flush_failed startups=%d", len(pending))
+				with self._lock:
+					for startup_id, count in pending.items():
+						self._pending[startup_id] += count
+				return 0
+			return len(pending)
+		finally:
+			self._flush_lock.release()
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
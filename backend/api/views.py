@@ -5,13 +5,27 @@ from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, AllowAny
+import logging
 import rest_framework.parsers
-from django_ratelimit.decorators import ratelimit
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import JsonResponse
-from django.db.models import Q
-import bcrypt
+from django.db.models import Count, F, Prefetch, Q
+from .authentication import create_auth_token, get_session_user, revoke_auth_token
+from .tracing import get_tracer
+from .ratelimit import get_limiter, ratelimit
+from .querysets import AMOUNT_RANGE_PARAMS, filter_amount_ranges, startup_list_prefetches
+from .pagination import KeysetPagination
+from .response_cache import CachedListMixin, response_cache_stats
+from .conditional import ConditionalGetMixin, aggregate_validators, version_validators
+from .view_counter import view_counter
+from .facets import FACETS, facet_counts
+from .fieldsets import SparseQuerysetMixin
+from .read_serializers import (
+	AllPositionsValuesSerializer, NotificationValuesSerializer, StartupListValuesSerializer, ValuesListMixin,
+)
+from .streaming import streaming_export
+from .passwords import PasswordHasherBusy, check_password, get_password_hasher, hash_password, needs_rehash
 from .models import Startup, StartupTag, Position, Application, Notification, Favorite, Interest
 from .messaging_models import Conversation, Message, UserProfile, FileUpload
 from .serializers import (
@@ -24,61 +38,8 @@ from .serializers import (
 )
 
 User = get_user_model()
-
-
-# Helper function to get authenticated user from session or token
-def get_session_user(request):
-	"""Get authenticated user from session or auth token"""
-	print(f"🔍 get_session_user called for path: {getattr(request, 'path', 'unknown')}")
-	print(f"🔍 Request headers: Authorization={request.META.get('HTTP_AUTHORIZATION', 'None')}, Cookie={request.META.get('HTTP_COOKIE', 'None')}")
-	
-	# First, check for auth token in Authorization header
-	auth_header = request.META.get('HTTP_AUTHORIZATION')
-	if auth_header and auth_header.startswith('Bearer '):
-		auth_token = auth_header.split(' ')[1]
-		print(f"🔑 Found auth token in header: {auth_token[:10]}...")
-		
-		# Validate token by checking all active sessions
-		from django.contrib.sessions.models import Session
-		for session in Session.objects.all():
-			try:
-				session_data = session.get_decoded()
-				if session_data.get('auth_token') == auth_token and 'user_id' in session_data:
-					user_id = session_data['user_id']
-					user = User.objects.get(id=user_id, is_active=True)
-					print(f"✅ Found user from auth token: {user.username}")
-					return user
-			except:
-				continue
-		
-		print(f"❌ Invalid or expired auth token")
-	
-	# Check if user is authenticated via Django auth middleware
-	if hasattr(request, 'user') and request.user.is_authenticated and hasattr(request.user, 'id'):
-		print(f"✅ Found authenticated user via Django auth: {request.user.username}")
-		return request.user
-	
-	# Check session data (fallback)
-	if hasattr(request, 'session'):
-		print(f"📝 Session key: {request.session.session_key}")
-		print(f"📝 Session data: {dict(request.session)}")
-		
-		# Check if session has authentication flag and user_id
-		if request.session.get('is_authenticated') and 'user_id' in request.session:
-			try:
-				user_id = request.session['user_id']
-				user = User.objects.get(id=user_id, is_active=True)
-				print(f"✅ Found user from session data: {user.username}")
-				return user
-			except (User.DoesNotExist, ValueError) as e:
-				print(f"❌ Error getting user from session: {e}")
-				pass
-		else:
-			print(f"❌ Session missing authentication data: is_authenticated={request.session.get('is_authenticated')}, has_user_id={'user_id' in request.session}")
-	else:
-		print(f"❌ No session available on request")
-	
-	return None
+logger = logging.getLogger('api.views')
+trace = get_tracer('api.views')
 
 
 # Home route
@@ -123,6 +84,7 @@ def home(request):
 
 # Authentication Views
 @method_decorator(ratelimit(key='ip', rate='5/m', method='POST'), name='post')
+@method_decorator(ratelimit(key='account', rate='3/m', method='POST'), name='post')
 @method_decorator(csrf_exempt, name='dispatch')
 class SignupView(generics.CreateAPIView):
 	"""User registration endpoint"""
@@ -137,41 +99,24 @@ class SignupView(generics.CreateAPIView):
 				user = serializer.save()
 				
 				# Auto-login after successful signup (like login flow)
-				print(f"\n🔐=== SIGNUP AUTO-LOGIN ===")
-				print(f"Auto-login user after signup: {user.username} (ID: {user.id})")
-				
-				# Ensure session exists and is saved
-				if not request.session.session_key:
-					print(f"🔑 Creating new session key")
-					request.session.create()
-				print(f"🔑 Session key: {request.session.session_key}")
+				trace("signup.login user_id=%s", user.id)
 				
 				# Use Django's login to create session
 				from django.contrib.auth import login
-				print(f"🔑 Calling Django login() for user")
 				login(request, user)
-				print(f"🔑 Django login completed. User authenticated: {request.user.is_authenticated}")
 				
 				# Store user ID in session for easy access
 				request.session['user_id'] = str(user.id)
 				request.session['user_email'] = user.email
 				request.session['user_role'] = user.role
 				request.session['is_authenticated'] = True
-				print(f"📝 Session data stored: {dict(request.session)}")
-				
-				# Force session save
-				request.session.save()
-				print(f"💾 Session saved. Final session key: {request.session.session_key}")
 				
-				# Create a simple auth token for the frontend to use (same as login)
-				import hashlib
-				import time
-				auth_token = hashlib.sha256(f"{user.id}{user.email}{time.time()}".encode()).hexdigest()[:32]
+				# Create an auth token for the frontend to use (same as login)
+				auth_token = create_auth_token(user)
 				
-				# Store the auth token in session for validation
+				# Keep the token in session so logout can revoke it
 				request.session['auth_token'] = auth_token
-				request.session.save()
-				print(f"🔑 Auth token created and stored: {auth_token[:10]}...")
+				# SessionMiddleware persists the session once, on the way out
 				
 				response_data = {
 					"message": "Account created successfully",
@@ -199,11 +144,14 @@ class SignupView(generics.CreateAPIView):
 						secure=False,
 						domain=None
 					)
-					print(f"🍪 Session cookie + auth token set for signup")
-				print(f"🎉 Signup with auto-login successful!")
-				print("🔐=== END SIGNUP AUTO-LOGIN ===\n")
+				trace("signup.ok user_id=%s session=%s", user.id, bool(request.session.session_key))
 				
 				return response
+			except PasswordHasherBusy:
+				return Response(
+					{"message": "Too many signups in progress, please retry"},
+					status=status.HTTP_503_SERVICE_UNAVAILABLE
+				)
 			except Exception as e:
 				if "User already exists" in str(e):
 					return Response(
@@ -226,6 +174,7 @@ class SignupView(generics.CreateAPIView):
 
 
 @method_decorator(ratelimit(key='ip', rate='10/m', method='POST'), name='post')
+@method_decorator(ratelimit(key='account', rate='5/m', method='POST'), name='post')
 @method_decorator(csrf_exempt, name='dispatch')
 class LoginView(generics.GenericAPIView):
 	"""User login endpoint with session authentication"""
@@ -233,10 +182,7 @@ class LoginView(generics.GenericAPIView):
 	permission_classes = [AllowAny]
 	
 	def post(self, request):
-		print("\n🔐=== LOGIN DEBUG ===")
-		print(f"Login request from: {request.META.get('REMOTE_ADDR')}")
-		print(f"Request cookies: {dict(request.COOKIES)}")
-		print(f"Session before login: {request.session.session_key}")
+		trace("login.start remote_addr=%s has_session=%s", request.META.get('REMOTE_ADDR'), bool(request.session.session_key))
 		
 		serializer = self.get_serializer(data=request.data)
 		if serializer.is_valid():
@@ -245,43 +191,32 @@ class LoginView(generics.GenericAPIView):
 			
 			try:
 				user = User.objects.get(email=email, is_active=True)
-				print(f"Found user: {user.username} (ID: {user.id})")
 				
 				# Verify password with bcrypt
-				if bcrypt.checkpw(password.encode('utf-8'), user.password.encode('utf-8')):
-					print(f"✅ Password verified for user: {user.username}")
+				if check_password(password, user.password):
+					trace("login.password_ok user_id=%s", user.id)
 					
-					# Ensure session exists and is saved
-					if not request.session.session_key:
-						print(f"🔑 Creating new session key")
-						request.session.create()
-					print(f"🔑 Session key: {request.session.session_key}")
+					# Upgrade hashes made with an outdated cost factor
+					if needs_rehash(user.password):
+						user.password = hash_password(password)
+						user.save(update_fields=['password'])
 					
 					# Use Django's login to create session
 					from django.contrib.auth import login
-					print(f"🔑 Calling Django login() for user")
 					login(request, user)
-					print(f"🔑 Django login completed. User authenticated: {request.user.is_authenticated}")
 					
 					# Store user ID in session for easy access
 					request.session['user_id'] = str(user.id)
 					request.session['user_email'] = user.email
 					request.session['user_role'] = user.role
 					request.session['is_authenticated'] = True
-					print(f"📝 Session data stored: {dict(request.session)}")
-					
-					# Force session save
-					request.session.save()
-					print(f"💾 Session saved. Final session key: {request.session.session_key}")
 					
-					# Create a simple auth token for the frontend to use
-					import hashlib
-					import time
-					auth_token = hashlib.sha256(f"{user.id}{user.email}{time.time()}".encode()).hexdigest()[:32]
+					# Create an auth token for the frontend to use
+					auth_token = create_auth_token(user)
 					
-					# Store the auth token in session for validation
+					# Keep the token in session so logout can revoke it
 					request.session['auth_token'] = auth_token
-					request.session.save()
+					# SessionMiddleware persists the session once, on the way out
 					
 					response_data = {
 						"message": "Login successful",
@@ -309,9 +244,7 @@ class LoginView(generics.GenericAPIView):
 							secure=False,
 							domain=None
 						)
-						print(f"🍪 Session cookie + auth token set: {auth_token[:10]}...")
-					print(f"🎉 Login successful! Returning response with session cookie")
-					print("🔐=== END LOGIN DEBUG ===\n")
+					trace("login.ok user_id=%s session=%s", user.id, bool(request.session.session_key))
 					return response
 				else:
 					return Response(
@@ -323,6 +256,11 @@ class LoginView(generics.GenericAPIView):
 					{"error": "Wrong credentials"},
 					status=status.HTTP_401_UNAUTHORIZED
 				)
+			except PasswordHasherBusy:
+				return Response(
+					{"error": "Too many login attempts in progress, please retry"},
+					status=status.HTTP_503_SERVICE_UNAVAILABLE
+				)
 		
 		return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -341,6 +279,7 @@ class VerifyEmailView(generics.GenericAPIView):
 
 
 @method_decorator(ratelimit(key='ip', rate='3/m', method='POST'), name='post')
+@method_decorator(ratelimit(key='account', rate='3/m', method='POST'), name='post')
 @method_decorator(csrf_exempt, name='dispatch')
 class SendVerificationCodeView(generics.GenericAPIView):
 	"""Send verification code endpoint (simplified)"""
@@ -357,6 +296,7 @@ class SendVerificationCodeView(generics.GenericAPIView):
 @api_view(['POST'])
 @permission_classes([AllowAny])
 @ratelimit(key='ip', rate='3/m', method='POST')
+@ratelimit(key='account', rate='3/m', method='POST')
 def forget_password(request):
 	"""Password reset endpoint (placeholder)"""
 	# This is a placeholder - implement actual password reset logic
@@ -384,6 +324,13 @@ class RefreshTokenView(generics.GenericAPIView):
 def logout(request):
 	"""Logout endpoint with session cleanup"""
 	try:
+		# Revoke the auth token from the header and/or the session
+		auth_header = request.META.get('HTTP_AUTHORIZATION')
+		if auth_header and auth_header.startswith('Bearer '):
+			revoke_auth_token(auth_header.split(' ')[1])
+		if hasattr(request, 'session') and request.session.get('auth_token'):
+			revoke_auth_token(request.session['auth_token'])
+		
 		# Use Django's logout to clear session
 		from django.contrib.auth import logout as django_logout
 		django_logout(request)
@@ -413,9 +360,7 @@ class StartupCreateView(generics.CreateAPIView):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        print(f"\n🚀=== STARTUP CREATION ===")
-        print(f"👤 Authenticated user: {user.username} (ID: {user.id})")
-        print(f"📊 Request data keys: {list(request.data.keys())}")
+        trace("startup.create user_id=%s fields=%s", user.id, len(request.data))
         
         return super().create(request, *args, **kwargs)
 
@@ -425,82 +370,89 @@ class StartupCreateView(generics.CreateAPIView):
         if not user:
             raise PermissionDenied("Authentication required")
         
-        print(f"💾 Creating startup with owner: {user.username}")
-        
         # Save startup with authenticated user as owner
         startup = serializer.save(owner=user)
         
-        print(f"✅ Startup created: {startup.title} (ID: {startup.id})")
+        trace("startup.created startup_id=%s type=%s", startup.id, startup.type)
         
         # Add default tags based on type
         if startup.type == 'marketplace':
             StartupTag.objects.create(startup=startup, tag="Fund Raising")
-            print(f"🏷️ Added 'Fund Raising' tag")
         else:
             StartupTag.objects.create(startup=startup, tag="Open to Collaborate")
-            print(f"🏷️ Added 'Open to Collaborate' tag")
         
-        print(f"🚀=== END STARTUP CREATION ===\n")
 
 
-class MarketplaceListView(generics.ListAPIView):
+class MarketplaceListView(CachedListMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListAPIView):
     """Get all marketplace listings"""
     serializer_class = StartupListSerializer
+    values_serializer_class = StartupListValuesSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    cache_name = 'marketplace'
+    cache_models = ('startup', 'startuptag', 'trending', 'user')
+    
+    def get_validators(self, request, *args, **kwargs):
+        # The request parameters (filters, cursor) are already in the ETag
+        return version_validators(self.cache_models)
     
     def get_queryset(self):
-        queryset = Startup.objects.filter(type='marketplace', status='active')
+        queryset = Startup.objects.filter(type='marketplace', status='active').prefetch_related(*startup_list_prefetches())
         
         # Apply filters
         sort_by = self.request.query_params.get('sortBy', 'date')
         order = self.request.query_params.get('order', 'desc')
         startup_type = self.request.query_params.get('type')
         category = self.request.query_params.get('category')
-        limit = self.request.query_params.get('limit')
         
         if startup_type:
             queryset = queryset.filter(category=startup_type)
         if category:
             queryset = queryset.filter(category=category)
+        queryset = filter_amount_ranges(queryset, self.request.query_params)
         
-        # Simple ordering
-        if sort_by == 'date':
-            order_field = 'created_at'
-        elif sort_by == 'price':
-            order_field = 'asking_price'
-        else:
-            order_field = 'created_at'
-        
+        # Ordering always ends in (created_at, id) so KeysetPagination can seek on it
+        order_fields = ['created_at', 'id']
         if order == 'desc':
-            order_field = f'-{order_field}'
+            order_fields = [f'-{field}' for field in order_fields]
+        if sort_by == 'price':
+            # Sort numerically; listings without a parseable price come last
+            price = F('asking_price_amount')
+            order_fields.insert(0, price.desc(nulls_last=True) if order == 'desc' else price.asc(nulls_last=True))
+        elif sort_by == 'trending':
+            # Read the precomputed rank (api.trending); unranked listings come last
+            queryset = queryset.annotate(trending_score=F('trending__score'))
+            score = F('trending_score')
+            order_fields.insert(0, score.desc(nulls_last=True) if order == 'desc' else score.asc(nulls_last=True))
         
-        queryset = queryset.order_by(order_field)
-        
-        if limit:
-            try:
-                limit = int(limit)
-                queryset = queryset[:limit]
-            except ValueError:
-                pass
-        
-        return queryset
-    
-    def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
-            "results": serializer.data,
-            "count": queryset.count()
-        })
+        return queryset.order_by(*order_fields)
+
+
+class MarketplaceExportView(MarketplaceListView):
+	"""Download every marketplace listing matching the listing filters"""
+	
+	def get(self, request, *args, **kwargs):
+		# Not cached or paginated: rows are streamed as they are read
+		return streaming_export(
+			request, self.filter_queryset(self.get_queryset()), self.get_serializer_class(), 'marketplace',
+			self.get_serializer_context()
+		)
 
 
-class CollaborationListView(generics.ListAPIView):
+class CollaborationListView(CachedListMixin, ConditionalGetMixin, SparseQuerysetMixin, ValuesListMixin, generics.ListAPIView):
 	"""Get collaboration listings"""
 	serializer_class = StartupListSerializer
+	values_serializer_class = StartupListValuesSerializer
 	permission_classes = [AllowAny]
+	pagination_class = KeysetPagination
+	cache_name = 'collaborations'
+	cache_models = ('startup', 'startuptag', 'user')
+	
+	def get_validators(self, request, *args, **kwargs):
+		return version_validators(self.cache_models)
 	
 	def get_queryset(self):
-		queryset = Startup.objects.filter(type='collaboration', status='active')
+		queryset = Startup.objects.filter(type='collaboration', status='active').prefetch_related(*startup_list_prefetches())
 		
 		# Apply filters
 		sort_by = self.request.query_params.get('sortBy', 'date')
@@ -512,33 +464,92 @@ class CollaborationListView(generics.ListAPIView):
 			queryset = queryset.filter(phase=phase)
 		if earnthrough:
 			queryset = queryset.filter(earn_through=earnthrough)
+		queryset = filter_amount_ranges(queryset, self.request.query_params)
 		
-		# Simple ordering
-		if sort_by == 'date':
-			order_field = 'created_at'
-		elif sort_by == 'team':
-			order_field = 'team_size'
+		# Ordering always ends in (created_at, id) so KeysetPagination can seek on it
+		if sort_by == 'team':
+			order_fields = ['team_size', 'created_at', 'id']
 		else:
-			order_field = 'created_at'
+			order_fields = ['created_at', 'id']
 		
 		if order == 'desc':
-			order_field = f'-{order_field}'
+			order_fields = [f'-{field}' for field in order_fields]
 		
-		return queryset.order_by(order_field)
+		return queryset.order_by(*order_fields)
+
+
+class StartupFacetsView(CachedListMixin, generics.ListAPIView):
+	"""Per-value counts for the listing filter panels (see api.facets)"""
+	permission_classes = [AllowAny]
+	cache_name = 'facets'
+	cache_models = ('startup',)
+	# Counts are the same for everyone and depend only on the filters
+	cache_authenticated = True
+	cache_params = (*FACETS, *AMOUNT_RANGE_PARAMS)
+	
+	def get_queryset(self):
+		return filter_amount_ranges(Startup.objects.filter(status='active'), self.request.query_params)
+	
+	def list(self, request, *args, **kwargs):
+		return Response(facet_counts(self.get_queryset(), request.query_params))
 
 
-class StartupDetailView(generics.RetrieveAPIView):
+class FeaturedStartupsView(CachedListMixin, SparseQuerysetMixin, generics.ListAPIView):
+	"""Featured carousel: startups flagged as featured, then the top trending"""
+	serializer_class = StartupListSerializer
+	permission_classes = [AllowAny]
+	pagination_class = None
+	cache_name = 'featured'
+	cache_models = ('startup', 'startuptag', 'trending', 'user')
+	
+	def get_queryset(self):
+		queryset = Startup.objects.filter(status='active').prefetch_related(*startup_list_prefetches())
+		startup_type = self.request.query_params.get('type')
+		if startup_type in ('marketplace', 'collaboration'):
+			queryset = queryset.filter(type=startup_type)
+		return queryset.order_by(
+			'-featured', F('trending__score').desc(nulls_last=True), '-created_at', '-id'
+		)[:settings.FEATURED_CAROUSEL_SIZE]
+
+
+class StartupDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
 	"""Get startup details"""
-	queryset = Startup.objects.all()
 	serializer_class = StartupDetailSerializer
 	permission_classes = [AllowAny]
 	
+	def get_queryset(self):
+		# Owner and counters joined, tags and positions (with application
+		# counts) prefetched: three queries whatever the number of positions
+		return Startup.objects.select_related('owner', 'owner__activity_stats').prefetch_related(
+			Prefetch('tags', queryset=StartupTag.objects.order_by('pk')),
+			Prefetch('positions', queryset=Position.objects.annotate(applications_total=Count('applications'))),
+		)
+	
+	def get_validators(self, request, *args, **kwargs):
+		# The view count changes on every visit; leaving it out keeps revalidation
+		# useful at the cost of a slightly stale count in cached copies
+		validators = aggregate_validators(
+			Startup.objects.filter(pk=kwargs['pk']),
+			'updated_at', 'positions__updated_at', 'owner__activity_stats__updated_at',
+			position_count=Count('positions', distinct=True), tag_count=Count('tags', distinct=True)
+		)
+		# updated_at is never null, so no stamp means no such startup: skip
+		# revalidation and let get_object() answer 404
+		if validators[0] is None:
+			return None
+		return validators
+	
+	def not_modified(self, request, *args, **kwargs):
+		# A revalidated visit is still a visit
+		view_counter.record(kwargs['pk'])
+	
 	def retrieve(self, request, *args, **kwargs):
 		instance = self.get_object()
-		# Increment view count
-		instance.views += 1
-		instance.save(update_fields=['views'])
-		return super().retrieve(request, *args, **kwargs)
+		# Count the view; it is written in batches (see api.view_counter), so
+		# add the buffered views instead of reading the row back
+		instance.views += view_counter.record(instance.pk)
+		serializer = self.get_serializer(instance)
+		return Response(serializer.data)
 
 
 # Collaboration Views
@@ -588,7 +599,7 @@ class ApplyForCollaborationView(generics.CreateAPIView):
 			)
 
 
-class UserApplicationsView(generics.ListAPIView):
+class UserApplicationsView(SparseQuerysetMixin, generics.ListAPIView):
 	"""Get user applications"""
 	serializer_class = ApplicationSerializer
 	permission_classes = [AllowAny]
@@ -601,7 +612,7 @@ class UserApplicationsView(generics.ListAPIView):
 
 
 # Entrepreneur Application Management
-class StartupApplicationsView(generics.ListAPIView):
+class StartupApplicationsView(SparseQuerysetMixin, generics.ListAPIView):
 	"""List applications for a given startup (entrepreneur owner only)"""
 	serializer_class = ApplicationSerializer
 	permission_classes = [AllowAny]
@@ -615,7 +626,31 @@ class StartupApplicationsView(generics.ListAPIView):
 		return Application.objects.filter(
 			startup_id=startup_id,
 			startup__owner=user,
-		).select_related('startup', 'position', 'applicant')
+		).select_related('startup', 'applicant', 'applicant__activity_stats').prefetch_related(
+			*startup_list_prefetches('startup__'),
+			Prefetch('position', queryset=Position.objects.select_related('startup').annotate(
+				applications_total=Count('applications')
+			)),
+		).order_by('-created_at')
+
+
+class StartupApplicationsExportView(StartupApplicationsView):
+	"""Download every application for a startup (entrepreneur owner only)"""
+	
+	def get(self, request, *args, **kwargs):
+		# Refuse before the stream opens; an empty 200 download would hide the error
+		user = get_session_user(request)
+		if not user:
+			return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+		owner_id = Startup.objects.filter(pk=self.kwargs['pk']).values_list('owner_id', flat=True).first()
+		if owner_id is None:
+			return Response({"error": "Startup not found"}, status=status.HTTP_404_NOT_FOUND)
+		if owner_id != user.pk:
+			return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+		return streaming_export(
+			request, self.filter_queryset(self.get_queryset()), self.get_serializer_class(),
+			f"applications-{self.kwargs['pk']}", self.get_serializer_context()
+		)
 
 
 class ApproveApplicationView(generics.UpdateAPIView):
@@ -649,10 +684,19 @@ class ApproveApplicationView(generics.UpdateAPIView):
 
 
 # UC5: Positions Management (Entrepreneur Only)
-class AllPositionsView(generics.ListAPIView):
+class AllPositionsView(CachedListMixin, ConditionalGetMixin, SparseQuerysetMixin, generics.ListAPIView):
     """List all available positions across all startups (for job seekers)"""
     serializer_class = PositionSerializer
     permission_classes = [permissions.AllowAny]
+    cache_name = 'positions'
+    cache_models = ('position', 'startup', 'user')
+    
+    def get_validators(self, request, *args, **kwargs):
+        # Computed over all open positions, a superset of any filtered page
+        return aggregate_validators(
+            self.get_queryset(), 'updated_at', 'startup__updated_at',
+            row_count=Count('pk', distinct=True), application_count=Count('applications', distinct=True)
+        )
     
     def get_queryset(self):
         # Return all active positions from active startups (both collaboration and marketplace)
@@ -662,7 +706,7 @@ class AllPositionsView(generics.ListAPIView):
         ).select_related('startup', 'startup__owner').order_by('-created_at')
     
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
+        queryset = self.filter_queryset(self.get_queryset())
         
         # Apply filters if provided
         category = request.query_params.get('category')
@@ -687,37 +731,57 @@ class AllPositionsView(generics.ListAPIView):
                 Q(startup__title__icontains=search_query)
             )
         
+        if settings.FAST_READ_SERIALIZERS:
+            values_serializer = AllPositionsValuesSerializer(request.query_params)
+            results = values_serializer.serialize(values_serializer.prepare(queryset))
+            return Response({
+                "results": results,
+                "count": len(results)
+            })
+        
         serializer = self.get_serializer(queryset, many=True)
         
-        # Add startup info to each position
-        for i, position_data in enumerate(serializer.data):
-            position = queryset[i]
-            position_data['startup'] = {
-                'id': str(position.startup.id),
-                'title': position.startup.title,
-                'description': position.startup.description,
-                'category': position.startup.category,
-                'field': position.startup.field,
-                'phase': position.startup.phase,
-                'team_size': position.startup.team_size,
-                'earn_through': position.startup.earn_through,
-                'owner': {
-                    'id': str(position.startup.owner.id),
-                    'username': position.startup.owner.username,
-                    'email': position.startup.owner.email
+        # Add startup info to each position, unless left out with ?fields= / ?exclude=
+        if 'startup' in serializer.child.fields:
+            for i, position_data in enumerate(serializer.data):
+                position = queryset[i]
+                position_data['startup'] = {
+                    'id': str(position.startup.id),
+                    'title': position.startup.title,
+                    'description': position.startup.description,
+                    'category': position.startup.category,
+                    'field': position.startup.field,
+                    'phase': position.startup.phase,
+                    'team_size': position.startup.team_size,
+                    'earn_through': position.startup.earn_through,
+                    'owner': {
+                        'id': str(position.startup.owner.id),
+                        'username': position.startup.owner.username,
+                        'email': position.startup.owner.email
+                    }
                 }
-            }
-        
+
         return Response({
             "results": serializer.data,
             "count": queryset.count()
         })
 
 
-class StartupPositionsView(generics.ListCreateAPIView):
+class StartupPositionsView(ConditionalGetMixin, SparseQuerysetMixin, generics.ListCreateAPIView):
     """List and create positions for a startup (owner only for create, public for list)"""
     serializer_class = PositionSerializer
     
+    def get_validators(self, request, *args, **kwargs):
+        validators = aggregate_validators(
+            Startup.objects.filter(pk=kwargs['pk']), 'updated_at', 'positions__updated_at',
+            position_count=Count('positions', filter=Q(positions__is_active=True), distinct=True),
+            application_count=Count('positions__applications', distinct=True)
+        )
+        # No such startup: let list() answer 404
+        if validators[0] is None:
+            return None
+        return validators
+    
     def get_permissions(self):
         if self.request.method == 'GET':
             return [permissions.AllowAny()]
@@ -742,7 +806,7 @@ class StartupPositionsView(generics.ListCreateAPIView):
         except Startup.DoesNotExist:
             return Response({"detail": "Startup not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        positions = self.get_queryset()
+        positions = self.filter_queryset(self.get_queryset())
         serializer = self.get_serializer(positions, many=True)
         
         return Response({
@@ -856,6 +920,9 @@ def notification_list_view(request):
         if not user:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         notifications = Notification.objects.filter(user=user).order_by('-created_at')
+        if settings.FAST_READ_SERIALIZERS:
+            values_serializer = NotificationValuesSerializer()
+            return Response(values_serializer.serialize(values_serializer.prepare(notifications)))
         serializer = NotificationSerializer(notifications, many=True)
         return Response(serializer.data)
     
@@ -925,7 +992,7 @@ def mark_all_notifications_read(request):
 
 
 # UC7: Investor engagement
-class UserFavoritesView(generics.ListAPIView):
+class UserFavoritesView(SparseQuerysetMixin, generics.ListAPIView):
     """List current user's saved startups"""
     serializer_class = FavoriteSerializer
     permission_classes = [AllowAny]
@@ -934,13 +1001,15 @@ class UserFavoritesView(generics.ListAPIView):
         user = get_session_user(self.request)
         if not user:
             return Favorite.objects.none()
-        return Favorite.objects.filter(user=user).select_related('startup', 'startup__owner').order_by('-created_at')
+        return (
+            Favorite.objects.filter(user=user)
+            .select_related('startup')
+            .prefetch_related(*startup_list_prefetches('startup__'))
+            .order_by('-created_at')
+        )
     
     def list(self, request, *args, **kwargs):
-        # Add debugging info
         user = get_session_user(request)
-        print(f"🔍 UserFavoritesView: User {user} requesting favorites")
-        print(f"🔍 User authenticated: {user is not None}")
         if not user:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         return super().list(request, *args, **kwargs)
@@ -983,13 +1052,15 @@ class UserInterestsView(generics.ListAPIView):
         user = get_session_user(self.request)
         if not user:
             return Interest.objects.none()
-        return Interest.objects.filter(user=user).select_related('startup', 'startup__owner').order_by('-created_at')
+        return (
+            Interest.objects.filter(user=user)
+            .select_related('startup', 'user')
+            .prefetch_related(*startup_list_prefetches('startup__'))
+            .order_by('-created_at')
+        )
     
     def list(self, request, *args, **kwargs):
-        # Add debugging info
         user = get_session_user(request)
-        print(f"🔍 UserInterestsView: User {user} requesting interests")
-        print(f"🔍 User authenticated: {user is not None}")
         if not user:
             return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
         return super().list(request, *args, **kwargs)
@@ -1005,7 +1076,12 @@ class StartupInterestsView(generics.ListAPIView):
         user = get_session_user(self.request)
         if not user:
             return Interest.objects.none()
-        return Interest.objects.filter(startup_id=startup_id, startup__owner=user).select_related('startup', 'user')
+        return (
+            Interest.objects.filter(startup_id=startup_id, startup__owner=user)
+            .select_related('startup', 'user')
+            .prefetch_related(*startup_list_prefetches('startup__'))
+            .order_by('-created_at')
+        )
 
 
 class ExpressInterestView(generics.CreateAPIView):
@@ -1071,7 +1147,7 @@ class ExpressInterestView(generics.CreateAPIView):
                 )
         except Exception as e:
             # Don't fail the interest API if messaging setup fails; log to console
-            print(f"⚠️ Messaging setup failed for interest: {e}")
+            logger.warning("interest.messaging_failed startup_id=%s error=%r", startup.id, e)
 
         serializer = self.get_serializer(interest)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
@@ -1184,11 +1260,52 @@ def platform_stats(request):
 	})
 
 
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def ratelimit_stats(request):
+	"""Rate limiter decisions, blocks and decision latency in this worker (staff only)"""
+	user = get_session_user(request)
+	if not user:
+		return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+	if not user.is_staff:
+		return Response({"error": "Staff only"}, status=status.HTTP_403_FORBIDDEN)
+	return Response({"backend": settings.RATELIMIT_BACKEND, **get_limiter().stats()})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def password_stats(request):
+	"""bcrypt pool queue depth, completed and rejected hashes in this worker (staff only)"""
+	user = get_session_user(request)
+	if not user:
+		return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+	if not user.is_staff:
+		return Response({"error": "Staff only"}, status=status.HTTP_403_FORBIDDEN)
+	return Response({"queue_limit": settings.PASSWORD_HASH_QUEUE_LIMIT, **get_password_hasher().stats()})
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def cache_stats(request):
+	"""Listing response cache hits, misses and bypasses per view in this worker (staff only)"""
+	user = get_session_user(request)
+	if not user:
+		return Response({"error": "Authentication required"}, status=status.HTTP_401_UNAUTHORIZED)
+	if not user.is_staff:
+		return Response({"error": "Staff only"}, status=status.HTTP_403_FORBIDDEN)
+	return Response({"enabled": settings.LISTING_CACHE_ENABLED, "views": response_cache_stats.snapshot()})
+
+
 # Search Views
-class SearchView(generics.ListAPIView):
+class SearchView(CachedListMixin, ConditionalGetMixin, generics.ListAPIView):
 	"""Search startups"""
 	serializer_class = SearchResultSerializer
 	permission_classes = [AllowAny]
+	cache_name = 'search'
+	cache_models = ('startup',)
+	
+	def get_validators(self, request, *args, **kwargs):
+		return aggregate_validators(self.get_queryset(), 'updated_at', row_count=Count('pk'))
 	
 	def get_queryset(self):
 		# Get search parameters from frontend
@@ -1420,7 +1537,7 @@ def get_online_users(request):
 	"""Get list of online users for messaging"""
 	# This is a simplified version - in production you'd use WebSockets
 	# For now, return all active users
-	online_users = User.objects.filter(is_active=True)[:50]
+	online_users = User.objects.filter(is_active=True).select_related('activity_stats')[:50]
 	serializer = UserSerializer(online_users, many=True)
 	return Response(serializer.data)
 
@@ -34,7 +34,11 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Compresses what every middleware below has produced
+    'api.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'api.middleware.SessionRefreshMiddleware',
+    'api.tracing.DebugTraceMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -93,6 +97,12 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# bcrypt cost factor; stored hashes with a different cost are re-hashed on login
+BCRYPT_ROUNDS = config('BCRYPT_ROUNDS', default=12, cast=int)
+# Bounded pool for bcrypt work (see api.passwords)
+PASSWORD_HASH_WORKERS = config('PASSWORD_HASH_WORKERS', default=2, cast=int)
+PASSWORD_HASH_QUEUE_LIMIT = config('PASSWORD_HASH_QUEUE_LIMIT', default=32, cast=int)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -115,13 +125,17 @@ AUTH_USER_MODEL = 'api.User'
 
 # REST Framework settings
 REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'api.authentication.SessionUserAuthentication',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 12,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # JSONRenderer output, encoded with orjson when it is installed
+        'api.renderers.ORJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
@@ -197,28 +211,121 @@ SESSION_COOKIE_HTTPONLY = False  # Must be False so frontend can read it
 SESSION_COOKIE_SAMESITE = None  # Must be None for cross-origin requests
 SESSION_COOKIE_AGE = 86400  # 1 day
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
-SESSION_SAVE_EVERY_REQUEST = True
+# Sessions are written only when modified or within SESSION_REFRESH_WINDOW
+# seconds of expiry (see api.middleware.SessionRefreshMiddleware)
+SESSION_SAVE_EVERY_REQUEST = False
+SESSION_REFRESH_WINDOW = config('SESSION_REFRESH_WINDOW', default=SESSION_COOKIE_AGE // 4, cast=int)
+# Use 'django.contrib.sessions.backends.cached_db' (or '.cache') to keep
+# session reads off the database
+SESSION_ENGINE = config('SESSION_ENGINE', default='django.contrib.sessions.backends.db')
 SESSION_COOKIE_NAME = 'sessionid'
 SESSION_COOKIE_PATH = '/'
 SESSION_COOKIE_DOMAIN = None  # None allows cookies across localhost ports
 
+# Lifetime of the opaque auth tokens issued on login/signup (seconds)
+AUTH_TOKEN_AGE = config('AUTH_TOKEN_AGE', default=SESSION_COOKIE_AGE, cast=int)
+
+
+# JWT settings
+JWT_SECRET_KEY = config('JWT_SECRET_KEY', default=SECRET_KEY)
+JWT_ALGORITHM = 'HS256'
+JWT_ACCESS_TOKEN_DELTA = config('JWT_ACCESS_TOKEN_DELTA', default=900, cast=int)  # 15 minutes
+JWT_REFRESH_TOKEN_DELTA = config('JWT_REFRESH_TOKEN_DELTA', default=604800, cast=int)  # 7 days
+JWT_COOKIE_NAME = 'access_token'
+JWT_COOKIE_SECURE = config('JWT_COOKIE_SECURE', default=False, cast=bool)
+# Stateless mode trusts the token signature plus the revocation set instead of
+# querying users/user_sessions on every request. Revocations and cached users
+# live in the default cache, so it needs CACHE_URL
+JWT_STATELESS = config('JWT_STATELESS', default=False, cast=bool)
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=60, cast=int)
+
 
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
+# Cache settings
+# Set CACHE_URL (redis://host:6379/0) whenever more than one worker serves
+# requests. Without it each process has its own in-memory cache, and features
+# that must agree across workers (JWT_STATELESS, RATELIMIT_BACKEND='cache',
+# LISTING_CACHE_ENABLED) refuse to start (api.caches)
+CACHE_URL = config('CACHE_URL', default='')
+if CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+        }
+    }
+
 # Rate limiting settings
 RATELIMIT_ENABLE = True
+# 'cache' keeps counters in RATELIMIT_USE_CACHE, which must be shared by all
+# workers (CACHE_URL); 'sqlite' keeps them in a local file shared by every
+# worker on a single node, and is the default without CACHE_URL
+RATELIMIT_BACKEND = config('RATELIMIT_BACKEND', default='cache' if CACHE_URL else 'sqlite')
 RATELIMIT_USE_CACHE = 'default'
+RATELIMIT_SQLITE_PATH = config('RATELIMIT_SQLITE_PATH', default=str(BASE_DIR / 'ratelimit.sqlite3'))
+
+# Anonymous listing response cache (api.response_cache). Versions live in this
+# cache too, so every worker must share it: on by default only with CACHE_URL,
+# and it refuses to start on a per-process cache
+LISTING_CACHE_ENABLED = config('LISTING_CACHE_ENABLED', default=bool(CACHE_URL), cast=bool)
+LISTING_CACHE_ALIAS = 'default'
+LISTING_CACHE_TTL = config('LISTING_CACHE_TTL', default=60, cast=int)
+LISTING_CACHE_TTLS = {
+    'search': 30,
+}
 
-# Cache settings
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-    }
+# Startup view counts are buffered per process and written in batches
+# (api.view_counter) at most this often, or once this many startups are waiting
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=10, cast=int)
+VIEW_COUNT_MAX_PENDING = config('VIEW_COUNT_MAX_PENDING', default=1000, cast=int)
+
+# Trending ranking (api.trending, refreshed by the refresh_trending command):
+# engagement loses half its weight every TRENDING_HALF_LIFE_HOURS
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=72, cast=float)
+TRENDING_WEIGHTS = {
+    'views': 1,
+    'favorites': 5,
+    'interests': 10,
 }
+FEATURED_CAROUSEL_SIZE = config('FEATURED_CAROUSEL_SIZE', default=8, cast=int)
+
+# Rows per database round trip for the streaming download endpoints (api.streaming)
+STREAMING_EXPORT_CHUNK_SIZE = config('STREAMING_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Serve the hot list endpoints from .values() rows (api.read_serializers)
+# instead of the DRF serializers; the output is the same
+FAST_READ_SERIALIZERS = config('FAST_READ_SERIALIZERS', default=True, cast=bool)
+
+# Response compression (api.compression.CompressionMiddleware): brotli when the
+# brotli package is installed and the client accepts it, gzip otherwise.
+# Bodies under COMPRESSION_MIN_SIZE bytes are sent as they are; streaming
+# responses are always compressed
+COMPRESSION_ENABLED = config('COMPRESSION_ENABLED', default=True, cast=bool)
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+COMPRESSION_GZIP_LEVEL = config('COMPRESSION_GZIP_LEVEL', default=6, cast=int)
+COMPRESSION_BROTLI_QUALITY = config('COMPRESSION_BROTLI_QUALITY', default=5, cast=int)
+# Responses from these paths carry tokens and are never compressed (BREACH)
+COMPRESSION_EXCLUDED_PATHS = ['/auth/', '/signup', '/account/']
+# A trailing '/' matches the whole type (text/html, text/csv, ...)
+COMPRESSION_CONTENT_TYPES = [
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/',
+]
 
 # Email Configuration
 EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
@@ -233,18 +340,32 @@ DEFAULT_FROM_EMAIL = config('EMAIL_HOST_USER', default='noreply@startupplatform.
 SERVER_EMAIL = config('EMAIL_HOST_USER', default='noreply@startupplatform.com')
 
 # Logging
+# API_DEBUG_TRACE turns on debug tracing of the auth/startup hot paths for
+# every request; API_TRACE_HEADER_ENABLED lets a single request opt in with
+# an "X-Debug-Trace: 1" header.
+API_DEBUG_TRACE = config('API_DEBUG_TRACE', default=False, cast=bool)
+API_TRACE_HEADER_ENABLED = config('API_TRACE_HEADER_ENABLED', default=DEBUG, cast=bool)
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'structured': {
+            'format': '%(asctime)s %(levelname)s %(name)s %(message)s',
+        },
+    },
     'handlers': {
         'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
+            'level': 'DEBUG',
+            # Writes happen on a background thread, off the request path
+            'class': 'api.tracing.QueueFileHandler',
             'filename': BASE_DIR / 'django.log',
+            'formatter': 'structured',
         },
         'console': {
-            'level': 'INFO',
+            'level': 'DEBUG',
             'class': 'logging.StreamHandler',
+            'formatter': 'structured',
         },
     },
     'loggers': {
@@ -255,7 +376,7 @@ LOGGING = {
         },
         'api': {
             'handlers': ['file', 'console'],
-            'level': 'INFO',
+            'level': 'DEBUG' if API_DEBUG_TRACE else 'INFO',
             'propagate': True,
         },
     },